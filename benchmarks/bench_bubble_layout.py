@@ -0,0 +1,92 @@
+"""
+Benchmark : rafale de redimensionnements sur la vue Chrono.
+Mesure le coût de BubbleLayoutManager lors d'une "tempête" de resize
+(taille qui oscille, comme lors d'un redimensionnement à la souris),
+avec et sans la mémorisation de la disposition. La référence "sans cache"
+désactive aussi le cache de style : chaque resize recalcule la disposition
+et réapplique la feuille de style de toutes les bulles, comme avant la mémorisation.
+
+Usage :
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_bubble_layout.py [nb_resize]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtWidgets import QApplication
+
+from vues.chrono import NewChronoView, compute_bubble_layout
+
+
+def build_activities(nb_parents=8, nb_children=6):
+    """Jeu de données factice : nb_parents bulles avec nb_children enfants chacune."""
+    data = []
+    for p in range(nb_parents):
+        children = [{'id': 100 * p + c, 'label': f"E{p}.{c}", 'color': "#43e97b"} for c in range(nb_children)]
+        data.append({'id': p + 1, 'label': f"P{p}", 'color': "#4facfe", 'children': children})
+    return data
+
+
+def forget_styles(view):
+    """Oublie le style appliqué à chaque bulle : le prochain layout les restyle toutes."""
+    for item in view.bubbles:
+        item['btn'].bubble_style_key = None
+        for c_btn in item['children']:
+            c_btn.bubble_style_key = None
+
+
+def storm(app, view, sizes, repeat, uncached=False):
+    """
+    Applique successivement chaque taille `repeat` fois, retourne la durée en ms.
+    Avec uncached, disposition et styles sont recalculés à chaque resize.
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for w, h in sizes:
+            if uncached:
+                compute_bubble_layout.cache_clear()
+                forget_styles(view)
+            view.bubble_container.resize(w, h)
+            view.reposition_bubbles(force=uncached)
+    app.processEvents()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    nb_resize = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    view = NewChronoView()
+    view.resize(1100, 750)
+    view.show()
+    view.set_activities(build_activities(), lambda *args: None)
+    app.processEvents()
+
+    # Oscillation sur 20 tailles, comme un glisser de bord de fenêtre
+    sizes = [(700 + 10 * i, 600 + 5 * i) for i in range(20)]
+    repeat = max(1, nb_resize // len(sizes))
+
+    # 1. Cache froid : chaque taille est calculée une première fois
+    compute_bubble_layout.cache_clear()
+    cold = storm(app, view, sizes, 1)
+
+    # 2. Cache chaud : la rafale ne fait plus que des déplacements
+    warm = storm(app, view, sizes, repeat)
+    total = repeat * len(sizes)
+    info = compute_bubble_layout.cache_info()
+
+    # 3. Sans cache : référence (chaque resize recalcule la disposition et restyle toutes les bulles)
+    uncached = storm(app, view, sizes, repeat, uncached=True)
+
+    print(f"Resize storm ({total} resize, {len(view.bubbles)} bulles)")
+    print(f"  cache froid  : {cold / len(sizes):.3f} ms / resize")
+    print(f"  cache chaud  : {warm / total:.3f} ms / resize")
+    print(f"  sans cache   : {uncached / total:.3f} ms / resize (disposition + styles)")
+    print(f"  cache        : {info.hits} hits, {info.misses} misses")
+
+
+if __name__ == "__main__":
+    main()
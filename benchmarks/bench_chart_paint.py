@@ -0,0 +1,82 @@
+"""
+Benchmark : coût de peinture de l'histogramme empilé (GraphiqueHebdomadaireWidget).
+Jeu de données : 365 barres x 50 activités.
+Mesure séparément la reconstruction du rendu statique (données / taille modifiées)
+et les repeints dus au survol, qui ne doivent plus redessiner le graphique.
+
+Usage :
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_chart_paint.py [nb_barres] [nb_activites]
+"""
+
+import os
+import sys
+import time
+import random
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtWidgets import QApplication
+
+from vues.analyses import GraphiqueHebdomadaireWidget
+
+
+def build_data(nb_barres, nb_activites):
+    """{jour ISO: {id activité: secondes}}"""
+    rnd = random.Random(42)
+    start = date(2025, 1, 1)
+    data = {}
+    for d in range(nb_barres):
+        day = (start + timedelta(days=d)).isoformat()
+        data[day] = {a: rnd.randint(60, 1800) for a in range(nb_activites)}
+    return data
+
+
+def timed(app, fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    app.processEvents()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    nb_barres = int(sys.argv[1]) if len(sys.argv) > 1 else 365
+    nb_activites = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    chart = GraphiqueHebdomadaireWidget()
+    chart.resize(1200, 400)
+    chart.show()
+    data = build_data(nb_barres, nb_activites)
+    labels = {a: f"Activité {a}" for a in range(nb_activites)}
+    color_map = {a: f"#{(a * 5) % 256:02x}66{(a * 11) % 256:02x}" for a in range(nb_activites)}
+    chart.set_activity_info(labels, color_map)
+    app.processEvents()
+
+    # 1. Nouvelles données : préparation + rendu statique complet
+    def rebuild():
+        chart.set_data(data)
+        chart.repaint()
+    t_rebuild = timed(app, rebuild, 10)
+
+    # 2. Repeint sans changement (ex : infobulle, exposition) : simple copie du cache
+    t_cached = timed(app, chart.repaint, 200)
+
+    # 3. Survol : changement de segment + repeint de l'overlay
+    rects = chart.interactive_rects
+    state = {'i': 0}
+    def hover():
+        state['i'] = (state['i'] + 97) % len(rects)
+        chart.set_hovered(state['i'])
+        chart.repaint(rects[state['i']][0].toAlignedRect().adjusted(-3, -3, 3, 3))
+    t_hover = timed(app, hover, 200)
+
+    print(f"Histogramme {nb_barres} barres x {nb_activites} activités ({len(rects)} segments)")
+    print(f"  reconstruction (données)  : {t_rebuild:.2f} ms")
+    print(f"  repeint depuis le cache   : {t_cached:.3f} ms")
+    print(f"  repeint de survol         : {t_hover:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark : démarrages à froid de TaskTime, sans affichage (QT_QPA_PLATFORM=offscreen).
+Lance N fois main.py dans un nouveau processus avec --profile-startup --profile-quit,
+sur une base de 3000 sessions, puis agrège les profils JSON produits :
+lancement du processus -> première image, et durée de chaque phase (percentiles).
+
+Usage :
+    python benchmarks/bench_cold_start.py [nb_demarrages]
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+import subprocess
+from collections import defaultdict
+
+from bench_common import ROOT, seed_database
+
+PERCENTILES = (50, 90, 95)
+
+
+def percentile(values, pct):
+    """Percentile au rang le plus proche (valeurs triées)."""
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def cold_start(workdir, index):
+    """Un démarrage complet ; retourne (profil, ms entre le lancement et la première image)."""
+    output = os.path.join(workdir, f"profile_{index}.json")
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    spawn_ns = time.perf_counter_ns()
+    subprocess.run([sys.executable, os.path.join(ROOT, "main.py"),
+                    f"--profile-startup={output}", "--profile-quit"],
+                   cwd=workdir, env=env, check=True, timeout=60,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    with open(output, encoding="utf-8") as f:
+        profile = json.load(f)
+    # perf_counter_ns repose sur l'horloge monotone du système : comparable entre processus
+    spawn_to_paint = (profile["first_paint_ns"] - spawn_ns) / 1e6 if profile["first_paint_ns"] else None
+    return profile, spawn_to_paint
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+    workdir = tempfile.mkdtemp(prefix="tasktime_cold_")
+    os.chdir(workdir)
+    seed_database()
+
+    durations = defaultdict(list) # phase -> [ms]
+    for i in range(runs):
+        profile, spawn_to_paint = cold_start(workdir, i)
+        if spawn_to_paint is not None:
+            durations["lancement -> première image"].append(spawn_to_paint)
+            durations["profileur -> première image"].append(profile["first_paint_ms"])
+        for phase in profile["phases"]:
+            durations[phase["name"]].append(phase["duration_ms"])
+
+    header = "".join(f"{'p' + str(p):>10}" for p in PERCENTILES)
+    print(f"{runs} démarrages à froid")
+    print(f"{'phase':<32}{header}{'max':>10}")
+    for name, values in durations.items():
+        cols = "".join(f"{percentile(values, p):10.1f}" for p in PERCENTILES)
+        print(f"{name:<32}{cols}{max(values):10.1f}")
+
+
+if __name__ == "__main__":
+    main()
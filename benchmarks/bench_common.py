@@ -0,0 +1,63 @@
+"""
+Outils communs aux benchmarks : base de démonstration et chronométrage.
+La base compte 12 groupes x 3 sous-activités et un projet ; les sessions sont tirées
+(graine fixe) sur ~800 jours, une sur trois rattachée au projet.
+"""
+
+import os
+import sys
+import time
+import random
+import tempfile
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from models.database import DatabaseManager
+
+
+def seed_database(nb_sessions=3000):
+    """Crée tasktime.db dans le dossier courant."""
+    rnd = random.Random(42)
+    db = DatabaseManager()
+    for i in range(12):
+        db.add_activity(f"Groupe {i}")
+    for i in range(12):
+        for j in range(3):
+            db.add_activity(f"Activité {i}.{j}", i + 1)
+    db.create_project("Projet")
+    now = datetime.now()
+    rows = []
+    for k in range(nb_sessions):
+        d = now - timedelta(minutes=rnd.randint(0, 60 * 24 * 800))
+        rows.append((rnd.randint(1, 48), "", rnd.randint(60, 7200), d.strftime("%Y-%m-%d %H:%M"),
+                     1 if k % 3 == 0 else None))
+    db.conn.executemany("INSERT INTO sessions (id_act, nom_saisi, duree, date, id_projet) VALUES (?,?,?,?,?)", rows)
+    db.conn.commit()
+    db.conn.close()
+
+
+def seeded_database(prefix, nb_sessions, setup=True):
+    """Base de nb_sessions sessions dans un nouveau dossier temporaire (devenu le dossier courant)."""
+    os.chdir(tempfile.mkdtemp(prefix=prefix))
+    seed_database(nb_sessions)
+    return DatabaseManager(setup=setup)
+
+
+def arg_count(default):
+    """Premier argument de la ligne de commande (nombre de sessions, de répétitions...)."""
+    return int(sys.argv[1]) if len(sys.argv) > 1 else default
+
+
+def timed(fn, repeat=1):
+    """Durée moyenne d'un appel, en ms."""
+    return timed_result(fn, repeat)[0]
+
+
+def timed_result(fn, repeat=1):
+    """Durée moyenne d'un appel en ms, et résultat du dernier appel."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) * 1000 / repeat, result
@@ -0,0 +1,45 @@
+"""
+Benchmark : recentrage des analyses sur une famille d'activités (clic dans la hiérarchie).
+Compare, sur une base de N sessions, le recalcul par requêtes filtrées (pyramide de la famille
+relue depuis les sessions) et le recalcul depuis la pyramide complète déjà en mémoire.
+Dans les deux cas, la répartition (top-K et "Autres") est relue en SQL.
+
+Usage :
+    python benchmarks/bench_hierarchy_drill.py [nb_sessions]
+"""
+
+from bench_common import seeded_database, arg_count, timed
+
+
+def main():
+    nb_sessions = arg_count(50000)
+    db = seeded_database("tasktime_hierarchy_", nb_sessions, setup=False)
+    families = list(range(1, 13))
+
+    # Chargement de la page : une requête groupée pour toute la hiérarchie
+    t_hierarchy = timed(lambda: db.get_hierarchy_totals("Global"), 10)
+    db.get_progression_pyramid() # Pyramide complète, construite au chargement de la page
+
+    def by_query():
+        for act_id in families:
+            db.get_distribution_top_k("Global", activity_id=act_id)
+            db._progression_pyramids.pop((act_id, None, True), None)
+            db.get_progression_pyramid(act_id, rollup=True) # rollup : toujours relue depuis les sessions
+
+    def from_memory():
+        for act_id in families:
+            db.get_distribution_top_k("Global", activity_id=act_id)
+            db._progression_pyramids.pop((act_id, None, False), None)
+            db.get_progression_pyramid(act_id)
+
+    t_query = timed(by_query, 3) / len(families)
+    t_memory = timed(from_memory, 3) / len(families)
+
+    print(f"Hiérarchie de 48 activités, {nb_sessions} sessions")
+    print(f"  requête groupée (chargement)    : {t_hierarchy:.2f} ms")
+    print(f"  recentrage par requêtes         : {t_query:.2f} ms")
+    print(f"  recentrage depuis la mémoire    : {t_memory:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Benchmark : tableau croisé activités x semaines sur toute la base (mode Global).
+Compare, sur une base de N sessions, une requête groupée par semaine et par activité
+et la lecture des intervalles pré-agrégés de la pyramide de progression (déjà construite
+pour le graphique d'évolution), puis le regroupement par parent en mémoire.
+
+Usage :
+    python benchmarks/bench_pivot.py [nb_sessions]
+"""
+
+from bench_common import seeded_database, arg_count, timed
+
+from models.pivot import PivotTable
+
+
+def main():
+    nb_sessions = arg_count(50000)
+    db = seeded_database("tasktime_pivot_", nb_sessions, setup=False)
+
+    def by_query():
+        rows = db.conn.execute("""
+            SELECT strftime('%Y-W%W', s.date) AS t, s.id_act, SUM(s.duree)
+            FROM sessions s GROUP BY t, s.id_act
+        """).fetchall()
+        return PivotTable(rows, "week")
+
+    t_query = timed(by_query, 5)
+    db.get_progression_pyramid() # Construite au chargement de la page
+    t_pyramid = timed(lambda: db.get_pivot("Global", level="week"), 5)
+    table = db.get_pivot("Global", level="week")
+    assert table.cells == by_query().cells
+    parent_of = db.get_hierarchy_totals("Global").parent_of
+    t_rollup = timed(lambda: table.rolled_up(parent_of), 5)
+
+    print(f"Tableau croisé {len(table.activities)} activités x {len(table.periods)} semaines, {nb_sessions} sessions")
+    print(f"  requête groupée                 : {t_query:.2f} ms")
+    print(f"  depuis la pyramide              : {t_pyramid:.2f} ms")
+    print(f"  regroupement par parent         : {t_rollup:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
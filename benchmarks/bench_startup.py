@@ -0,0 +1,61 @@
+"""
+Benchmark : temps de construction de la fenêtre principale jusqu'à la première image.
+Base de données : 12 groupes x 3 sous-activités, 3000 sessions sur ~800 jours.
+Mesure le temps jusqu'à l'affichage de l'accueil, puis celui du préchauffage
+des pages différées (construites en arrière-plan après la première image).
+
+Usage :
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_startup.py [repetitions]
+"""
+
+import os
+import sys
+import time
+import tempfile
+import statistics
+
+from bench_common import seed_database
+
+from PySide6.QtWidgets import QApplication
+
+
+def measure(app, Application):
+    start = time.perf_counter()
+    window = Application()
+    window.show()
+    app.processEvents()
+    first_frame = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    dashboard = window.vue_dashboard
+    if hasattr(dashboard, "build_next_pending_page"):
+        while dashboard.build_next_pending_page():
+            app.processEvents()
+    warmup = (time.perf_counter() - start) * 1000
+
+    window.close()
+    window.deleteLater()
+    app.processEvents()
+    return first_frame, warmup
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+    os.chdir(tempfile.mkdtemp(prefix="tasktime_bench_"))
+    seed_database()
+
+    app = QApplication(sys.argv)
+    from main import Application
+
+    measure(app, Application) # Préchauffage (imports, caches Qt)
+    results = [measure(app, Application) for _ in range(repeat)]
+
+    first = [r[0] for r in results]
+    warm = [r[1] for r in results]
+    print(f"Première image   : médiane {statistics.median(first):7.1f} ms  (min {min(first):.1f})")
+    print(f"Pages différées  : médiane {statistics.median(warm):7.1f} ms  (min {min(warm):.1f})")
+
+
+if __name__ == "__main__":
+    main()
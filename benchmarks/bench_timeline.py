@@ -0,0 +1,64 @@
+"""
+Benchmark : chronologie des sessions sur quatre semaines.
+Compare, sur une base de N sessions, la lecture de toutes les sessions (filtrées ensuite en
+mémoire) et la requête sur la seule plage visible, puis la recherche du bloc survolé par
+parcours de tous les blocs et par IntervalHitIndex.
+
+Usage :
+    python benchmarks/bench_timeline.py [nb_sessions]
+"""
+
+import random
+from datetime import date, datetime, timedelta
+
+from bench_common import seeded_database, arg_count, timed
+
+from models.timeline import DayTimeline, DAY_SECONDS
+from vues.hit_test import IntervalHitIndex
+
+
+def main():
+    nb_sessions = arg_count(50000)
+    db = seeded_database("tasktime_timeline_", nb_sessions)
+    days = 28
+    first_day = date.today() - timedelta(days=days - 1)
+    start = datetime.combine(first_day, datetime.min.time())
+    end = start + timedelta(days=days)
+
+    def full_scan():
+        rows = db.conn.execute("SELECT id, id_act, nom_saisi, date, duree FROM sessions").fetchall()
+        return DayTimeline(first_day, days, rows)
+
+    def range_query():
+        return DayTimeline(first_day, days, db.get_sessions_between(start, end))
+
+    t_full = timed(full_scan, 5)
+    t_range = timed(range_query, 5)
+    timeline = range_query()
+
+    index = IntervalHitIndex()
+    for d, lanes in enumerate(timeline.lanes):
+        for l, lane in enumerate(lanes):
+            index.add_lane((d, l), [(b[0], b[1], (d, l, k)) for k, b in enumerate(lane)])
+    # Le jour et la ligne sont déduits de y : seule la recherche dans la ligne est comparée
+    lanes = [(d, l) for d, day_lanes in enumerate(timeline.lanes) for l in range(len(day_lanes))]
+    probes = [(random.choice(lanes), random.uniform(0, DAY_SECONDS)) for _ in range(10000)]
+
+    def linear():
+        for (d, l), t in probes:
+            next((b for b in timeline.lanes[d][l] if b[0] <= t < b[1]), None)
+
+    def indexed():
+        for key, t in probes:
+            index.find(key, t)
+
+    blocks = sum(len(b) for b in timeline.blocks)
+    print(f"Chronologie de {days} jours ({blocks} blocs), {nb_sessions} sessions")
+    print(f"  lecture de toutes les sessions  : {t_full:.2f} ms")
+    print(f"  requête sur la plage visible    : {t_range:.2f} ms")
+    print(f"  survol, parcours des blocs      : {timed(linear, 3) / len(probes) * 1000:.2f} µs")
+    print(f"  survol, IntervalHitIndex        : {timed(indexed, 3) / len(probes) * 1000:.2f} µs")
+
+
+if __name__ == "__main__":
+    main()
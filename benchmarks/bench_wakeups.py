@@ -0,0 +1,100 @@
+"""
+Benchmark : réveils de la boucle d'événements par minute pendant qu'un chrono tourne.
+Trois situations : page Chrono affichée, autre page affichée (Analyses), fenêtre réduite.
+Chaque mesure est faite dans un processus séparé, en comptant les réveils du dispatcher
+d'événements Qt (signal awake) pendant la durée demandée.
+
+Pour comparer avec une version précédente, extraire celle-ci dans un autre dossier puis
+passer ce dossier avec --root :
+    git worktree add /tmp/tasktime-avant HEAD~1
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_wakeups.py --root /tmp/tasktime-avant
+
+Usage :
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_wakeups.py [--root DOSSIER] [secondes]
+"""
+
+import os
+import sys
+import time
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = {
+    "chrono": "Page Chrono affichée",
+    "other_page": "Page Analyses affichée",
+    "minimized": "Fenêtre réduite",
+}
+SETTLE_S = 1.5 # Laisse passer le préchauffage des pages et les redimensionnements différés
+
+
+def run_child(root, scenario, seconds):
+    """Processus de mesure : lance un chrono, se place dans la situation demandée et compte les réveils."""
+    sys.path.insert(0, root)
+    os.chdir(tempfile.mkdtemp(prefix="tasktime_bench_"))
+
+    from PySide6.QtWidgets import QApplication
+    from PySide6.QtCore import QAbstractEventDispatcher, QTimer
+
+    from models.database import DatabaseManager
+
+    db = DatabaseManager()
+    db.add_activity("Bench")
+    db.conn.close()
+
+    app = QApplication(sys.argv)
+    from main import Application
+
+    window = Application()
+    window.show()
+    window.vue_dashboard.switch_page(1)
+    window.presenter_chrono.handle_bubble_click(1, "Bench", False)
+    if scenario == "other_page":
+        window.vue_dashboard.switch_page(3)
+    elif scenario == "minimized":
+        window.showMinimized()
+
+    wakeups = 0
+
+    def on_awake():
+        nonlocal wakeups
+        wakeups += 1
+
+    def start_counting():
+        QAbstractEventDispatcher.instance().awake.connect(on_awake)
+        QTimer.singleShot(int(seconds * 1000), app.quit)
+
+    QTimer.singleShot(int(SETTLE_S * 1000), start_counting)
+    app.exec()
+    print(wakeups * 60 / seconds)
+
+
+def measure(root, scenario, seconds):
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", root, scenario, str(seconds)],
+        capture_output=True, text=True, check=True).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def main():
+    args = sys.argv[1:]
+    if args and args[0] == "--child":
+        run_child(args[1], args[2], float(args[3]))
+        return
+
+    root = ROOT
+    if args and args[0] == "--root":
+        root = os.path.abspath(args[1])
+        args = args[2:]
+    seconds = float(args[0]) if args else 20
+
+    print(f"Version mesurée : {root} ({seconds:.0f} s par situation)")
+    for scenario, label in SCENARIOS.items():
+        start = time.perf_counter()
+        per_minute = measure(root, scenario, seconds)
+        print(f"{label:<24}: {per_minute:7.1f} réveils/min  ({time.perf_counter() - start:.1f} s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""
+Benchmark : semaine type (7 jours x 48 demi-heures) sur une plage "Global" de plusieurs années.
+Compare le découpage session par session en Python et l'agrégation des bornes de sessions
+en une requête groupée (WeekHeatmap), puis vérifie que les deux matrices sont identiques.
+
+Usage :
+    python benchmarks/bench_week_heatmap.py [nb_sessions]
+"""
+
+from bench_common import seeded_database, arg_count, timed_result
+from check_models import split_sessions
+
+
+def main():
+    nb_sessions = arg_count(100000)
+    db = seeded_database("tasktime_heatmap_", nb_sessions, setup=False)
+
+    t_split, reference = timed_result(lambda: split_sessions(db), 1)
+    t_query, heatmap = timed_result(lambda: db.get_week_heatmap("Global"), 5)
+    t_matrix, matrix = timed_result(heatmap.matrix, 20)
+
+    print(f"Semaine type, {nb_sessions} sessions sur 800 jours")
+    print(f"  découpage session par session : {t_split:.1f} ms")
+    print(f"  requête groupée (bornes)      : {t_query:.1f} ms")
+    print(f"  matrice depuis les bornes     : {t_matrix:.2f} ms")
+    print(f"  résultats identiques          : {matrix == reference}")
+
+
+if __name__ == "__main__":
+    main()
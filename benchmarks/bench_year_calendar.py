@@ -0,0 +1,49 @@
+"""
+Benchmark : calendrier annuel (temps suivi par jour).
+Compare, sur une base de N sessions, la lecture des totaux journaliers d'une année sans
+index (parcours de toutes les sessions) et avec l'index idx_sessions_date, puis le passage
+d'une année à l'autre depuis le cache (totaux et indicateurs recalculés en mémoire).
+
+Usage :
+    python benchmarks/bench_year_calendar.py [nb_sessions]
+"""
+
+from datetime import date
+
+from bench_common import seeded_database, arg_count, timed
+
+from models.year_calendar import YearCalendar, calendar_stats
+
+
+def main():
+    nb_sessions = arg_count(50000)
+    db = seeded_database("tasktime_calendar_", nb_sessions)
+    year = date.today().year
+    load = lambda: YearCalendar(year, db.get_daily_totals(date(year, 1, 1), date(year + 1, 1, 1)))
+
+    t_indexed = timed(load, 10)
+    db.conn.execute("DROP INDEX idx_sessions_date")
+    t_scan = timed(load, 10)
+    db.conn.execute("CREATE INDEX idx_sessions_date ON sessions(date, id_act, duree)")
+
+    calendars = {y: YearCalendar(y, db.get_daily_totals(date(y, 1, 1), date(y + 1, 1, 1)))
+                 for y in (year - 1, year)}
+    today = date.today()
+
+    def switch():
+        for y in (year - 1, year):
+            calendar = calendars[y]
+            calendar._totals.clear()
+            previous = calendars.get(y - 1)
+            calendar_stats(calendar.totals(), y, today, previous.totals() if previous else None)
+
+    t_switch = timed(switch, 10) / 2
+
+    print(f"Calendrier {year}, {nb_sessions} sessions")
+    print(f"  requête sans index              : {t_scan:.2f} ms")
+    print(f"  requête indexée                 : {t_indexed:.2f} ms")
+    print(f"  changement d'année (cache)      : {t_switch:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+"""
+Vérification des modèles (en mémoire ou en SQL) contre un calcul direct (requête SQL ou force brute)
+sur la base de démonstration des benchmarks. Une différence arrête le script (assert).
+Les vérifications "query_runner" (signaux Qt) et "shortcuts" (QKeySequence) demandent PySide6.
+
+Usage :
+    QT_QPA_PLATFORM=offscreen python benchmarks/check_models.py [vérification ...]
+"""
+
+import sys
+import random
+from itertools import groupby
+from datetime import date, datetime, timedelta
+
+from bench_common import seeded_database
+
+from models.heatmap import SLOTS_PER_DAY, SLOT_SECONDS
+from models.timeline import DayTimeline, DAY_SECONDS, pack_lanes
+from models.year_calendar import YearCalendar, calendar_stats
+
+# Filtres vérifiés : toute la base, puis une période limitée au projet
+FILTERS = (
+    ("Global", None, None),
+    ("Période", (date.today() - timedelta(days=200), date.today()), 1),
+)
+
+
+def brute_top_k(db, mode, dates, project_id, activity_id, rollup, top_k, offset):
+    """Référence : temps par activité additionné session par session, puis classé et tronqué en Python."""
+    where_clause, params = db._distribution_filters(mode, dates, activity_id, project_id)
+    totals = {}
+    for act_id, parent_id, duree in db.conn.execute(f"""
+        SELECT a.id, a.parent_id, s.duree FROM sessions s JOIN activites a ON s.id_act = a.id {where_clause}
+    """, params):
+        key = parent_id if rollup and parent_id is not None else act_id
+        totals[key] = totals.get(key, 0) + duree
+    ranked = sorted(totals.items(), key=lambda kv: (-kv[1], kv[0]))
+    limit = offset + top_k
+    if len(ranked) <= limit + 1:
+        return [(act_id, sec, 1, 0) for act_id, sec in ranked[offset:]]
+    others = ranked[limit:]
+    return [(act_id, sec, 1, 0) for act_id, sec in ranked[offset:limit]] + \
+        [(None, sum(sec for _, sec in others), len(others), 1)]
+
+
+def check_top_k(db):
+    """get_distribution_top_k (répartition du camembert, page "Autres" comprise) contre la force brute."""
+    for mode, dates, project_id in FILTERS:
+        for activity_id in (None, 1, 5, 13):
+            for rollup in (False, True):
+                for top_k, offset in ((8, 0), (8, 8), (3, 0), (3, 40)):
+                    expected = brute_top_k(db, mode, dates, project_id, activity_id, rollup, top_k, offset)
+                    rows = db.get_distribution_top_k(mode, dates, activity_id=activity_id, project_id=project_id,
+                                                     top_k=top_k, offset=offset, rollup=rollup)
+                    assert [tuple(r) for r in rows] == expected, (mode, activity_id, rollup, top_k, offset)
+
+
+def split_sessions(db, mode="Global", dates=None, project_id=None, act_ids=None):
+    """Référence : semaine type obtenue en découpant chaque session créneau par créneau."""
+    where_clause, params = db._distribution_filters(mode, dates, None, project_id)
+    matrix = [[0] * SLOTS_PER_DAY for _ in range(7)]
+    for act_id, date_str, duree in db.conn.execute(f"SELECT s.id_act, s.date, s.duree FROM sessions s {where_clause}",
+                                                   params):
+        if act_ids is not None and act_id not in act_ids:
+            continue
+        t = datetime.strptime(date_str, "%Y-%m-%d %H:%M")
+        end = t + timedelta(seconds=duree)
+        while t < end:
+            slot = (t.hour * 3600 + t.minute * 60 + t.second) // SLOT_SECONDS
+            slot_end = datetime(t.year, t.month, t.day) + timedelta(seconds=(slot + 1) * SLOT_SECONDS)
+            step_end = min(slot_end, end)
+            matrix[t.weekday()][slot] += int((step_end - t).total_seconds())
+            t = step_end
+    return matrix
+
+
+def check_week_heatmap(db):
+    """WeekHeatmap (bornes agrégées en SQL) contre le découpage session par session, par famille."""
+    for mode, dates, project_id in FILTERS:
+        heatmap = db.get_week_heatmap(mode, dates, project_id=project_id)
+        hierarchy = db.get_hierarchy_totals(mode, dates, project_id=project_id)
+        for act_ids in (None, hierarchy.family(1), hierarchy.family(13), {7, 30}):
+            assert heatmap.matrix(act_ids) == split_sessions(db, mode, dates, project_id, act_ids), (mode, act_ids)
+
+
+def brute_stats(totals, year, today, previous=None):
+    """Référence des indicateurs du calendrier : plages de jours actifs / inactifs énumérées une à une."""
+    first_day = date(year, 1, 1)
+    end = min(date(year, 12, 31), today)
+    flags = [bool(totals.get(first_day + timedelta(days=i))) for i in range((end - first_day).days + 1)]
+    longest = max((len(list(g)) for active, g in groupby(flags) if active), default=0)
+    started = flags[flags.index(True):] if True in flags else []
+    longest_gap = max((len(list(g)) for active, g in groupby(started) if not active), default=0)
+
+    active_days = {d for d, sec in totals.items() if sec}
+    active_days |= {d for d, sec in (previous or {}).items() if sec and d.year == year - 1}
+    current = 0
+    if today.year == year:
+        day = today if today in active_days else today - timedelta(days=1)
+        while day in active_days:
+            current += 1
+            day -= timedelta(days=1)
+    return current, longest, longest_gap, len(totals), sum(totals.values())
+
+
+def check_calendar(db):
+    """Totaux journaliers (YearCalendar) contre une requête groupée par jour, et indicateurs contre la force brute."""
+    year = date.today().year
+    for project_id in (None, 1):
+        for y in (year - 1, year):
+            calendar = YearCalendar(y, db.get_daily_totals(date(y, 1, 1), date(y + 1, 1, 1), project_id=project_id))
+            for act_ids in (None, {13}, {1, 13, 14, 15}):
+                where = "WHERE substr(date, 1, 4) = ?"
+                params = [str(y)]
+                if project_id:
+                    where += " AND id_projet = ?"
+                    params.append(project_id)
+                if act_ids is not None:
+                    where += f" AND id_act IN ({','.join('?' * len(act_ids))})"
+                    params.extend(act_ids)
+                expected = {date.fromisoformat(day): sec for day, sec in db.conn.execute(
+                    f"SELECT substr(date, 1, 10), SUM(duree) FROM sessions {where} GROUP BY 1", params)}
+                assert calendar.totals(act_ids) == expected, (project_id, y, act_ids)
+
+    # Indicateurs : années tirées au hasard plus ou moins remplies, séries à cheval sur le 1er janvier
+    rnd = random.Random(7)
+    for density in (0.05, 0.3, 0.7, 0.95, 1.0):
+        for _ in range(20):
+            years = {}
+            for y in (2024, 2025):
+                start = date(y, 1, 1)
+                years[y] = {start + timedelta(days=i): rnd.randint(60, 7200)
+                            for i in range((date(y + 1, 1, 1) - start).days) if rnd.random() < density}
+            for today in (date(2025, 1, 1), date(2025, 1, 2), date(2025, 6, 15), date(2025, 12, 31),
+                          date(2026, 3, 1)):
+                args = (years[2025], 2025, today, years[2024])
+                assert calendar_stats(*args) == brute_stats(*args), (density, today)
+
+
+def check_lanes(blocks, lanes):
+    """Chaque bloc dans une seule ligne, sans chevauchement, et autant de lignes que de blocs simultanés au maximum."""
+    assert sorted(b for lane in lanes for b in lane) == sorted(blocks)
+    for lane in lanes:
+        assert all(a[1] <= b[0] for a, b in zip(lane, lane[1:])), lane
+    depth = max((sum(1 for s, e, *_ in blocks if s <= t < e) for t, *_ in blocks), default=0)
+    assert len(lanes) == depth, (len(lanes), depth)
+
+
+def check_timeline(db):
+    """pack_lanes contre la profondeur de chevauchement, et DayTimeline contre le découpage des sessions par jour."""
+    rnd = random.Random(11)
+    for nb_blocks in (0, 1, 5, 30, 120):
+        for _ in range(30):
+            blocks = []
+            for k in range(nb_blocks):
+                start = rnd.randrange(0, DAY_SECONDS - 60)
+                blocks.append((start, min(DAY_SECONDS, start + rnd.randint(60, 4 * 3600)), k, 1, ""))
+            check_lanes(blocks, pack_lanes(blocks))
+
+    days = 28
+    first_day = date.today() - timedelta(days=days - 1)
+    origin = datetime.combine(first_day, datetime.min.time())
+    for project_id in (None, 1):
+        timeline = DayTimeline(first_day, days, db.get_sessions_between(origin, origin + timedelta(days=days),
+                                                                        project_id=project_id))
+        expected = [{} for _ in range(days)]
+        where, params = ("WHERE id_projet = ?", (project_id,)) if project_id else ("", ())
+        for act_id, date_str, duree in db.conn.execute(f"SELECT id_act, date, duree FROM sessions {where}", params):
+            start = (datetime.strptime(date_str, "%Y-%m-%d %H:%M") - origin).total_seconds()
+            for d in range(days):
+                covered = min(start + duree, (d + 1) * DAY_SECONDS) - max(start, d * DAY_SECONDS)
+                if covered > 0:
+                    expected[d][act_id] = expected[d].get(act_id, 0) + covered
+        for d in range(days):
+            found = {}
+            for start, end, _, act_id, _ in timeline.blocks[d]:
+                found[act_id] = found.get(act_id, 0) + end - start
+            assert found == expected[d], (project_id, timeline.day(d))
+            check_lanes(timeline.blocks[d], timeline.lanes[d])
+
+
+# Clé d'intervalle de chaque niveau du tableau croisé, calculée par SQLite (même format que bucket_key)
+PERIOD_SQL = {
+    "day": "substr(s.date, 1, 10)",
+    "week": "strftime('%Y-W%W', s.date)",
+    "month": "substr(s.date, 1, 7)",
+    "quarter": "strftime('%Y', s.date) || '-T' || ((CAST(strftime('%m', s.date) AS INTEGER) + 2) / 3)",
+    "year": "strftime('%Y', s.date)",
+}
+
+
+def sql_pivot(db, mode, dates, project_id, level, act_ids=None, rollup=False):
+    """Référence : {(intervalle, activité): secondes} groupés directement sur les sessions."""
+    where_clause, params = db._distribution_filters(mode, dates, None, project_id)
+    if act_ids is not None:
+        where_clause += f" AND s.id_act IN ({','.join('?' * len(act_ids))})"
+        params = params + list(act_ids)
+    return {(key, act_id): sec for key, act_id, sec in db.conn.execute(f"""
+        SELECT {PERIOD_SQL[level]} AS t, {db._activity_key(rollup)} AS act, SUM(s.duree)
+        FROM sessions s
+        JOIN activites a ON s.id_act = a.id
+        {where_clause}
+        GROUP BY t, act
+    """, params)}
+
+
+def check_pivot_table(table, expected):
+    """Cellules, ordre des lignes (total décroissant) et totaux d'un PivotTable contre les sommes de référence."""
+    cells = {(key, act_id): sec for act_id, line in zip(table.activities, table.cells)
+             for key, sec in zip(table.periods, line) if sec}
+    assert cells == expected
+    assert table.periods == sorted({key for key, _ in expected})
+    row_totals = {}
+    column_totals = {}
+    for (key, act_id), sec in expected.items():
+        row_totals[act_id] = row_totals.get(act_id, 0) + sec
+        column_totals[key] = column_totals.get(key, 0) + sec
+    assert table.activities == sorted(row_totals, key=lambda a: (-row_totals[a], a))
+    assert table.row_totals == [row_totals[a] for a in table.activities]
+    assert table.column_totals == [column_totals[key] for key in table.periods]
+    assert table.grand_total == sum(expected.values())
+
+
+def check_pivot(db):
+    """PivotTable (servi par la pyramide), filtré par famille ou regroupé par parent, contre des requêtes groupées."""
+    for mode, dates, project_id in FILTERS:
+        hierarchy = db.get_hierarchy_totals(mode, dates, project_id=project_id)
+        for level in PERIOD_SQL:
+            table = db.get_pivot(mode, dates, project_id=project_id, level=level)
+            check_pivot_table(table, sql_pivot(db, mode, dates, project_id, level))
+            check_pivot_table(table.rolled_up(hierarchy.parent_of),
+                              sql_pivot(db, mode, dates, project_id, level, rollup=True))
+            family = hierarchy.family(2)
+            check_pivot_table(table.for_activities(family), sql_pivot(db, mode, dates, project_id, level, family))
+
+
+# Séquences essayées : accords simples, séquences à plusieurs accords et débuts les unes des autres
+SHORTCUT_CANDIDATES = ("Ctrl+K", "Ctrl+K, Ctrl+S", "Ctrl+K, Ctrl+D", "Ctrl+K, Ctrl+S, Ctrl+A", "Alt+1",
+                       "Alt+1, Alt+2", "F2", "F2, F3", "Ctrl+1", "Ctrl+1, Ctrl+2", "Space", "Shift+Space", "")
+
+
+def brute_conflicts(sequences, code, combos):
+    """Référence : actions (autres que code) dont la séquence est égale à combos, ou l'une début de l'autre."""
+    n = len(combos)
+    return {other for other, seq in sequences.items()
+            if other != code and seq and combos and (seq[:n] == combos or combos[:len(seq)] == seq)}
+
+
+def check_shortcut_indexes(registry):
+    """Tables de recherche du registre contre un parcours de toutes les séquences."""
+    for code, seq in registry.sequences.items():
+        if seq:
+            assert registry.action_for(seq) == code, code
+    prefixes = {seq[:n] for seq in registry.sequences.values() for n in range(1, len(seq))}
+    assert set(registry.prefixes) == prefixes
+    for prefix in prefixes:
+        assert registry.is_prefix(prefix)
+
+
+def check_shortcuts(db):
+    """
+    Détection de conflits du ShortcutRegistry contre la force brute, au fil de réaffectations
+    faites comme la page Réglages (les actions en conflit sont vidées avant d'enregistrer).
+    """
+    from PySide6.QtGui import QGuiApplication
+    from presenters.preferences import SettingsStore
+    from presenters.shortcuts import ACTIONS, ShortcutRegistry
+    from vues.key_combos import parse_sequence
+
+    app = QGuiApplication.instance() or QGuiApplication(sys.argv) # Texte natif des séquences (QKeySequence)
+    registry = ShortcutRegistry(SettingsStore(db))
+    check_shortcut_indexes(registry)
+    rnd = random.Random(3)
+    codes = list(ACTIONS)
+    for _ in range(300):
+        code = rnd.choice(codes)
+        text = rnd.choice(SHORTCUT_CANDIDATES)
+        combos = parse_sequence(text)
+        for other in codes:
+            conflicts = brute_conflicts(registry.sequences, other, combos)
+            found = registry.conflict(other, combos)
+            assert (found is None) == (not conflicts) and (found is None or found in conflicts), (other, text)
+
+        conflict_code = registry.conflict(code, combos)
+        while conflict_code:
+            registry.set_sequence(conflict_code, "")
+            conflict_code = registry.conflict(code, combos)
+        registry.set_sequence(code, text)
+        check_shortcut_indexes(registry)
+
+    # Les séquences enregistrées en base sont relues à l'identique
+    assert ShortcutRegistry(SettingsStore(db)).sequences == registry.sequences
+
+
+def check_query_runner(db):
+    """
+    Une demande dont la fonction lève une exception est signalée par query_failed pour la génération
+    courante, sans résultat ; une demande remplacée entre-temps n'est pas signalée ; le canal reste utilisable.
+    """
+    from presenters.query_runner import QueryRunner
+    from models.database import DatabaseManager
+
+    runner = QueryRunner(DatabaseManager(":memory:")) # Exécution directe : signaux émis pendant submit
+    results, failures = [], []
+    runner.result_ready.connect(lambda channel, generation, result: results.append((channel, generation, result)))
+    runner.query_failed.connect(lambda channel, generation, message: failures.append((channel, generation)))
+
+    def failing(db):
+        raise KeyError("activité inconnue")
+
+    generation = runner.submit("charts", failing)
+    assert failures == [("charts", generation)] and not results
+
+    def replaced(db):
+        runner.cancel("charts") # Une nouvelle demande l'a rendue obsolète avant l'erreur
+        raise ValueError("obsolète")
+
+    runner.submit("charts", replaced)
+    assert len(failures) == 1 and not results
+
+    generation = runner.submit("charts", lambda db: db.conn.execute("SELECT 1").fetchone()[0])
+    assert results == [("charts", generation, 1)] and len(failures) == 1
+
+
+CHECKS = {
+    "top_k": check_top_k,
+    "week_heatmap": check_week_heatmap,
+    "calendar": check_calendar,
+    "timeline": check_timeline,
+    "pivot": check_pivot,
+    "query_runner": check_query_runner,
+    "shortcuts": check_shortcuts,
+}
+
+
+def main():
+    names = sys.argv[1:] or list(CHECKS)
+    db = seeded_database("tasktime_check_", 3000)
+    for name in names:
+        CHECKS[name](db)
+        print(f"  {name:<14}: ok")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,27 +5,42 @@ Fichier principal de l'application
 
 import sys
 import os
-from PySide6.QtWidgets import QApplication, QStackedWidget, QMainWindow, QWidget, QHBoxLayout, QLabel, QPushButton, QVBoxLayout
-from PySide6.QtCore import QTimer, Qt, QPropertyAnimation, QEasingCurve
-from PySide6.QtGui import QMouseEvent, QCursor
+
+# Profilage du démarrage (--profile-startup) : créé avant les imports pour les mesurer
+from startup_profiler import StartupProfiler
+PROFILER = StartupProfiler.from_argv(sys.argv)
+
+with PROFILER.phase("import PySide6"):
+    from PySide6.QtWidgets import QApplication, QStackedWidget, QMainWindow, QWidget, QHBoxLayout, QLabel, QPushButton, QVBoxLayout
+    from PySide6.QtCore import QTimer, Qt, QPropertyAnimation, QEasingCurve, QEvent
+    from PySide6.QtGui import QMouseEvent, QCursor
 
 # Imports des modèles
-from models.database import DatabaseManager
+with PROFILER.phase("import models"):
+    from models.database import DatabaseManager
 
 # Imports des vues
-from vues.dashboard import DashboardView
-from vues.accueil import AccueilView
-from vues.analyses import AnalysesView
-from vues.activites import ActivitesView
-from vues.chrono import NewChronoView
-from vues.settings import SettingsView
+with PROFILER.phase("import vues"):
+    from vues.dashboard import DashboardView
+    from vues.accueil import AccueilView
+    from vues.analyses import AnalysesView
+    from vues.activites import ActivitesView
+    from vues.chrono import NewChronoView
+    from vues.settings import SettingsView
+    from vues.visibility import finish_animations
 
 # Imports des présentateurs
-from presenters.accueil import AccueilPresenter
-from presenters.analyses import AnalysesPresenter
-from presenters.activites import ActivitesPresenter
-from presenters.chrono import ChronoPresenter
-from presenters.settings import SettingsPresenter
+with PROFILER.phase("import presenters"):
+    from presenters.accueil import AccueilPresenter
+    from presenters.analyses import AnalysesPresenter
+    from presenters.activites import ActivitesPresenter
+    from presenters.chrono import ChronoPresenter
+    from presenters.settings import SettingsPresenter
+    from presenters.refresh import PageRefresher
+    from presenters.shortcuts import ShortcutRegistry
+    from presenters.preferences import SettingsStore, SIDEBAR_COLLAPSED
+    from presenters.catalog import ActivityCatalog
+    from presenters.colors import ColorService
 
 
 
@@ -120,9 +135,27 @@ class Application(QMainWindow):
     Gère la fenêtre principale, le tableau de bord et la navigation entre les vues.
     """
 
+    WARMUP_DELAY_MS = 300 # Délai avant la construction en arrière-plan des pages différées
+
     def __init__(self):
         super().__init__()
-        self.db = DatabaseManager()
+        with PROFILER.phase("DatabaseManager.setup_db"):
+            self.db = DatabaseManager()
+        # Réglages lus une seule fois : les changements de page ne font plus aucune lecture
+        self.settings = SettingsStore(self.db)
+        # Raccourcis clavier partagés par le chrono et les réglages
+        self.shortcuts = ShortcutRegistry(self.settings)
+        # Activités et couleurs en mémoire, partagées par le chrono, les activités et les analyses
+        self.catalog = ActivityCatalog(self.db)
+        self.colors = ColorService(self.db, self.catalog)
+        
+        # Vues et présentateurs (construits à la demande, sauf l'accueil)
+        self.vue_accueil = self.presenter_accueil = None
+        self.vue_chrono = self.presenter_chrono = None
+        self.vue_activites = self.presenter_activites = None
+        self.vue_analyses = self.presenter_analyses = None
+        self.vue_settings = self.presenter_settings = None
+        self.page_refreshers = {} # vue -> PageRefresher
         
         # Configuration de la fenêtre
         self.setWindowFlags(Qt.FramelessWindowHint) # Fenêtre sans bordure système
@@ -149,39 +182,86 @@ class Application(QMainWindow):
         self.selected_task_name = None
 
         # On lance le Dashboard directement
-        self.afficher_dashboard()
+        with PROFILER.phase("afficher_dashboard"):
+            self.afficher_dashboard()
         
         # Redimensionnement différé pour corriger l'affichage initial
-        QTimer.singleShot(100, lambda: self.resize(self.width() + 1, self.height() + 1))
-        QTimer.singleShot(150, lambda: self.resize(self.width() - 1, self.height() - 1))
-
-    def afficher_dashboard(self):
-        """Initialise et affiche le tableau de bord avec toutes les vues."""
-        self.vue_dashboard = DashboardView()
+        QTimer.singleShot(100, lambda: self.nudge_size(1))
+        QTimer.singleShot(150, lambda: self.nudge_size(-1))
         
-        # Préparation de l'onglet Chrono (mode bulles)
-        self.vue_chrono = NewChronoView()
-        self.presenter_chrono = ChronoPresenter(self.vue_chrono, self.db)
+        # Chrono interrompu par un arrêt brutal : proposé à la reprise une fois la fenêtre affichée
+        QTimer.singleShot(0, self.recover_active_sessions)
 
-        accueil_widget = self.create_accueil_widget() # Page 0
+    def recover_active_sessions(self):
+        """Propose de reprendre ou d'enregistrer les chronos retrouvés dans le journal active_session."""
+        from vues.custom_dialog import CustomMessageBox
         
-        # Connecter le chronomètre à l'accueil pour la synchro
-        if self.presenter_chrono and self.presenter_accueil:
-             self.presenter_chrono.set_accueil_presenter(self.presenter_accueil)
+        rows = self.db.get_active_sessions()
+        if not rows:
+            return
         
-        activites_widget = self.create_activites_widget() # Page 2
-        analyses_widget = self.create_analyses_widget() # Page 3
+        lines = []
+        for slot, act_id, name, project_id, started_at, duration, running in rows:
+            h, rem = divmod(duration, 3600)
+            m, s = divmod(rem, 60)
+            lines.append(f"{name} - {h:02d}:{m:02d}:{s:02d} (débuté le {started_at:%d/%m/%Y à %H:%M})")
+        intro = "Un chrono était en cours" if len(rows) == 1 else f"{len(rows)} chronos étaient en cours"
         
-        # Page Réglages
-        settings_widget = self.create_settings_widget() # Page 4
-
-        self.vue_dashboard.set_content_pages(
-            page_accueil=accueil_widget,
-            page_chrono=self.vue_chrono, 
-            page_activites=activites_widget,
-            page_analyses=analyses_widget,
-            page_settings=settings_widget
+        resume = CustomMessageBox.question(
+            self,
+            "Session interrompue",
+            f"{intro} lors de la dernière fermeture :\n" + "\n".join(lines) +
+            "\n\nVoulez-vous les reprendre ou les enregistrer ?",
+            yes_text="Reprendre", no_text="Enregistrer"
         )
+        if resume:
+            self.vue_dashboard.switch_page(1)
+            self.presenter_chrono.restore_timers(rows)
+        else:
+            # Enregistrement de tous les chronos en une seule transaction
+            self.db.save_active_sessions([(slot, act_id, name, duration, project_id, started_at)
+                                          for slot, act_id, name, project_id, started_at, duration, _ in rows])
+
+    def closeEvent(self, event):
+        """Enregistre les chronos en cours avant la fermeture de la fenêtre."""
+        if self.presenter_chrono and self.presenter_chrono.timers:
+            self.presenter_chrono.stop_all_timers()
+        super().closeEvent(event)
+
+    def changeEvent(self, event):
+        """Fenêtre réduite : plus d'animation ni de rafraîchissement à la seconde."""
+        if event.type() == QEvent.WindowStateChange and self.isMinimized():
+            finish_animations()
+            if self.presenter_chrono:
+                self.presenter_chrono.schedule_tick()
+        super().changeEvent(event)
+
+    def nudge_size(self, delta):
+        """Redimensionne la fenêtre de delta pixels (force le recalcul des mises en page)."""
+        PROFILER.event(f"resize {delta:+d}")
+        self.resize(self.width() + delta, self.height() + delta)
+
+    def afficher_dashboard(self):
+        """
+        Initialise et affiche le tableau de bord.
+        Seule la page d'accueil est construite avant la première image : les autres pages
+        (et leurs présentateurs) le sont à la première navigation ou pendant les temps morts.
+        """
+        self.vue_dashboard = DashboardView()
+        if self.settings.get(SIDEBAR_COLLAPSED):
+            self.vue_dashboard.set_sidebar_collapsed(True, animated=False)
+        self.vue_dashboard.sidebar_toggled.connect(
+            lambda collapsed: self.settings.set(SIDEBAR_COLLAPSED, collapsed))
+        
+        accueil_widget = self.create_accueil_widget() # Page 0
+
+        self.vue_dashboard.set_lazy_pages([
+            accueil_widget,
+            self.create_chrono_widget,      # Page 1
+            self.create_activites_widget,   # Page 2
+            self.create_analyses_widget,    # Page 3
+            self.create_settings_widget,    # Page 4
+        ])
         
         # Définir la page par défaut sur Accueil (0)
         self.vue_dashboard.switch_page(0)
@@ -191,6 +271,16 @@ class Application(QMainWindow):
 
         # Connecter le changement d'onglet à la logique de rafraîchissement
         self.vue_dashboard.stack.currentChanged.connect(self.on_dashboard_page_changed)
+        
+        # Préchauffage des autres pages une fois la fenêtre affichée
+        QTimer.singleShot(self.WARMUP_DELAY_MS, self.warm_next_page)
+
+    def warm_next_page(self):
+        """Construit une page différée par tour de boucle d'événements pour ne pas bloquer l'interface."""
+        with PROFILER.phase("warm_next_page"):
+            built = self.vue_dashboard.build_next_pending_page()
+        if built:
+            QTimer.singleShot(0, self.warm_next_page)
 
     def nativeEvent(self, eventType, message):
         """Gère les événements natifs Windows pour le redimensionnement de la fenêtre."""
@@ -230,50 +320,67 @@ class Application(QMainWindow):
         return super().nativeEvent(eventType, message)
 
     def on_dashboard_page_changed(self, index):
-        """Appelé lorsque l'onglet du tableau de bord change"""
+        """
+        Appelé lorsque l'onglet du tableau de bord change.
+        La page n'est rechargée que si ses données ont changé depuis son dernier chargement.
+        """
         current_widget = self.vue_dashboard.stack.widget(index)
         
-        # Logique de rafraîchissement
-        if current_widget == self.vue_analyses and self.presenter_analyses:
-            self.presenter_analyses.refresh()
-            
-        if hasattr(self, 'vue_accueil') and current_widget == self.vue_accueil and self.presenter_accueil:
-            self.presenter_accueil.refresh()
-            
-        if hasattr(self, 'vue_activites') and current_widget == self.vue_activites and self.presenter_activites:
-            self.presenter_activites.refresh()
-            
-        if hasattr(self, 'vue_settings') and current_widget == self.vue_settings and self.presenter_settings:
-            self.presenter_settings.load_data()
+        refresher = self.page_refreshers.get(current_widget)
+        if refresher:
+            refresher.request()
 
-        # Rafraichir le chronomètre (Page Principale)
-        if hasattr(self, 'vue_chrono') and current_widget == self.vue_chrono and self.presenter_chrono:
-            self.presenter_chrono.refresh()
-        
+    def on_sessions_saved(self):
+        """Une session vient d'être enregistrée : la page affichée est rechargée si elle en dépend."""
+        self.on_dashboard_page_changed(self.vue_dashboard.stack.currentIndex())
 
+    def register_page(self, view, presenter, refresh_fn):
+        """Associe la vue au rechargement conditionnel de son présentateur."""
+        self.page_refreshers[view] = PageRefresher(self.db, refresh_fn, presenter.DEPENDS_ON)
 
     def create_accueil_widget(self):
         """Crée et retourne le widget de la page d'accueil."""
         self.vue_accueil = AccueilView()
         self.presenter_accueil = AccueilPresenter(self.vue_accueil, self.db)
+        self.register_page(self.vue_accueil, self.presenter_accueil, self.presenter_accueil.refresh)
         return self.vue_accueil
+
+    def create_chrono_widget(self):
+        """Crée et retourne le widget du chronomètre (mode bulles)."""
+        self.vue_chrono = NewChronoView()
+        self.presenter_chrono = ChronoPresenter(self.vue_chrono, self.db, self.shortcuts, self.catalog, self.colors)
+        self.register_page(self.vue_chrono, self.presenter_chrono, self.presenter_chrono.refresh)
+        
+        # Connecter le chronomètre à l'accueil pour la synchro
+        if self.presenter_accueil:
+             self.presenter_chrono.set_accueil_presenter(self.presenter_accueil)
+        # Et aux analyses, qui affichent le temps en cours sans le relire en base
+        if self.presenter_analyses:
+            self.presenter_analyses.set_live_source(self.presenter_chrono)
+        self.presenter_chrono.sessions_saved.connect(self.on_sessions_saved)
+        return self.vue_chrono
     
     def create_activites_widget(self):
         """Crée et retourne le widget de gestion des activités."""
         self.vue_activites = ActivitesView()
-        self.presenter_activites = ActivitesPresenter(self.vue_activites, self.db)
+        self.presenter_activites = ActivitesPresenter(self.vue_activites, self.db, self.catalog, self.colors)
+        self.register_page(self.vue_activites, self.presenter_activites, self.presenter_activites.refresh)
         return self.vue_activites
 
     def create_analyses_widget(self):
         """Crée et retourne le widget d'analyse et de statistiques."""
         self.vue_analyses = AnalysesView()
-        self.presenter_analyses = AnalysesPresenter(self.vue_analyses, self.db)
+        self.presenter_analyses = AnalysesPresenter(self.vue_analyses, self.db, self.settings, self.catalog, self.colors)
+        self.register_page(self.vue_analyses, self.presenter_analyses, self.presenter_analyses.refresh)
+        if self.presenter_chrono:
+            self.presenter_analyses.set_live_source(self.presenter_chrono)
         return self.vue_analyses
 
     def create_settings_widget(self):
         """Crée et retourne le widget des paramètres."""
         self.vue_settings = SettingsView()
-        self.presenter_settings = SettingsPresenter(self.vue_settings, self.db)
+        self.presenter_settings = SettingsPresenter(self.vue_settings, self.db, self.shortcuts)
+        self.register_page(self.vue_settings, self.presenter_settings, self.presenter_settings.load_data)
         return self.vue_settings
 
 
@@ -296,20 +403,26 @@ def resource_path(relative_path):
     return os.path.join(base_path, relative_path)
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
+    with PROFILER.phase("QApplication"):
+        app = QApplication(sys.argv)
+    PROFILER.watch_first_paint(app)
     
     # Chargement dynamique du style
     style_path = resource_path(os.path.join("style", "style.qss"))
     
     if os.path.exists(style_path):
-        with open(style_path, "r", encoding="utf-8") as f:
-            style_content = f.read()
+        with PROFILER.phase("style.qss lecture"):
+            with open(style_path, "r", encoding="utf-8") as f:
+                style_content = f.read()
             
+        with PROFILER.phase("style.qss application"):
             app.setStyleSheet(style_content)
-            print(f"Design chargé avec succès ! (Source: {style_path})")
+        print(f"Design chargé avec succès ! (Source: {style_path})")
     else:
         print(f"Fichier style introuvable : {style_path}")
 
-    ex = Application()
-    ex.show()
+    with PROFILER.phase("Application"):
+        ex = Application()
+    with PROFILER.phase("show"):
+        ex.show()
     sys.exit(app.exec())
\ No newline at end of file
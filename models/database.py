@@ -7,14 +7,24 @@ import sqlite3
 from datetime import datetime, timedelta
 import os
 
+from models.heatmap import WeekHeatmap, MONDAY_OFFSET, SLOT_SECONDS, WEEK_SECONDS
+from models.hierarchy import HierarchyTotals
+from models.pivot import PivotTable
+from models.progression import ProgressionPyramid, choose_level
+
 class DatabaseManager:
     """
     Gestionnaire principal de la base de données.
     Fournit des méthodes pour gérer les activités, sessions, projets, couleurs et raccourcis.
     """
-    def __init__(self, db_name='tasktime.db'):
+    def __init__(self, db_name='tasktime.db', setup=True):
+        self.db_name = db_name
         self.conn = sqlite3.connect(db_name)
-        self.setup_db()
+        self._progression_pyramids = {} # (activity_id, project_id) -> ProgressionPyramid
+        self._longest_session = None # Durée de la plus longue session (bornes des requêtes par plage)
+        self._table_versions = {} # table -> nombre d'écritures (rafraîchissements conditionnels)
+        if setup:
+            self.setup_db()
 
     def setup_db(self):
         """Initialise les tables de la base de données si elles n'existent pas."""
@@ -90,6 +100,31 @@ class DatabaseManager:
             )
         """)
 
+        # 8. Journal des sessions en cours (une ligne par chrono, reprise après un arrêt brutal)
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS active_session (
+                slot INTEGER PRIMARY KEY,
+                id_act INTEGER,
+                nom_saisi TEXT,
+                id_projet INTEGER,
+                date_debut TEXT,
+                duree INTEGER,
+                en_cours INTEGER,
+                date_maj TEXT
+            )
+        """)
+
+        # 9. Préférences de l'interface (clé -> valeur texte, décodée par le magasin de réglages)
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS preferences (
+                cle TEXT PRIMARY KEY,
+                valeur TEXT
+            )
+        """)
+
+        # 10. Index couvrant des sessions par date : totaux journaliers d'une plage sans lire la table
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_sessions_date ON sessions(date, id_act, duree)")
+
         self.conn.commit()
 
     def get_activities(self):
@@ -98,20 +133,92 @@ class DatabaseManager:
         cur.execute("SELECT id, libelle, parent_id, id_couleur FROM activites")
         return cur.fetchall()
 
+    def get_activity_nodes(self):
+        """Toutes les activités avec leur visibilité : (id, libelle, parent_id, id_couleur, est_visible)."""
+        cur = self.conn.cursor()
+        try:
+            cur.execute("SELECT id, libelle, parent_id, id_couleur, est_visible FROM activites")
+        except sqlite3.OperationalError:
+            cur.execute("SELECT id, libelle, parent_id, id_couleur, 0 FROM activites")
+        return cur.fetchall()
+
     def get_activity(self, act_id):
         cur = self.conn.cursor()
         cur.execute("SELECT id, libelle, parent_id, id_couleur FROM activites WHERE id = ?", (act_id,))
         return cur.fetchone()
 
-    def save_session(self, act_id, nom_libre, duree, project_id=None):
-        """Enregistre une session de travail dans la base de données."""
+    def save_session(self, act_id, nom_libre, duree, project_id=None, start_date=None):
+        """
+        Enregistre une session de travail dans la base de données.
+        start_date : heure réelle du début de la session (maintenant par défaut).
+        """
         cur = self.conn.cursor()
-        date_str = datetime.now().strftime("%Y-%m-%d %H:%M")
+        date_str = (start_date or datetime.now()).strftime("%Y-%m-%d %H:%M")
         cur.execute("""
             INSERT INTO sessions (id_act, nom_saisi, duree, date, id_projet) 
             VALUES (?, ?, ?, ?, ?)
         """, (act_id, nom_libre, duree, date_str, project_id))
         self.conn.commit()
+        self._touch("sessions")
+        self._invalidate_progression_cache()
+
+    def checkpoint_active_sessions(self, rows):
+        """
+        Point de sauvegarde des chronos en cours : met à jour (ou crée) leur ligne du journal.
+        rows : liste de (slot, id_act, nom_saisi, id_projet, date_debut, durée, en_cours).
+        Une seule ligne par chrono, réécrite en place, et un seul commit pour tous : le journal ne grossit pas.
+        """
+        now_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        cur = self.conn.cursor()
+        cur.executemany("""
+            INSERT INTO active_session (slot, id_act, nom_saisi, id_projet, date_debut, duree, en_cours, date_maj)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(slot) DO UPDATE SET
+                id_act = excluded.id_act, nom_saisi = excluded.nom_saisi, id_projet = excluded.id_projet,
+                date_debut = excluded.date_debut, duree = excluded.duree,
+                en_cours = excluded.en_cours, date_maj = excluded.date_maj
+        """, [(slot, act_id, nom_saisi, project_id, start_date.strftime("%Y-%m-%d %H:%M:%S"),
+               duree, 1 if running else 0, now_str)
+              for slot, act_id, nom_saisi, project_id, start_date, duree, running in rows])
+        self.conn.commit()
+
+    def get_active_sessions(self):
+        """Chronos en cours lors du dernier point de sauvegarde : (slot, id_act, nom, id_projet, début, durée, en_cours)."""
+        cur = self.conn.cursor()
+        cur.execute("""
+            SELECT slot, id_act, nom_saisi, id_projet, date_debut, duree, en_cours
+            FROM active_session ORDER BY slot
+        """)
+        return [(slot, act_id, nom, pid, datetime.strptime(debut, "%Y-%m-%d %H:%M:%S"), duree, bool(en_cours))
+                for slot, act_id, nom, pid, debut, duree, en_cours in cur.fetchall()]
+
+    def clear_active_session(self, slot):
+        cur = self.conn.cursor()
+        cur.execute("DELETE FROM active_session WHERE slot = ?", (slot,))
+        self.conn.commit()
+
+    def save_active_sessions(self, sessions):
+        """
+        Enregistre des chronos terminés et les retire du journal, en une seule transaction.
+        sessions : liste de (slot, id_act, nom_saisi, durée, id_projet, date_debut) ;
+        les durées nulles retirent le chrono du journal sans créer de session.
+        """
+        cur = self.conn.cursor()
+        try:
+            for slot, act_id, nom_saisi, duree, project_id, start_date in sessions:
+                if act_id is not None and duree > 0:
+                    cur.execute("""
+                        INSERT INTO sessions (id_act, nom_saisi, duree, date, id_projet)
+                        VALUES (?, ?, ?, ?, ?)
+                    """, (act_id, nom_saisi, duree, start_date.strftime("%Y-%m-%d %H:%M"), project_id))
+                cur.execute("DELETE FROM active_session WHERE slot = ?", (slot,))
+            self.conn.commit()
+        except Exception as e:
+            print(f"Erreur lors de l'enregistrement des sessions : {e}")
+            self.conn.rollback()
+            raise e
+        self._touch("sessions")
+        self._invalidate_progression_cache()
 
     def add_activity(self, libelle, parent_id=None, color_id=None):
         """Ajoute une nouvelle activité dans la base de données."""
@@ -119,12 +226,15 @@ class DatabaseManager:
         cur.execute("INSERT INTO activites (libelle, parent_id, id_couleur) VALUES (?, ?, ?)", 
                     (libelle, parent_id, color_id))
         self.conn.commit()
+        self._touch("activites")
 
     def update_activity(self, act_id, nom, parent_id, color_id):
         """Met à jour une activité existante."""
         cur = self.conn.cursor()
         cur.execute("UPDATE activites SET libelle = ?, parent_id = ?, id_couleur = ? WHERE id = ?", (nom, parent_id, color_id, act_id))
         self.conn.commit()
+        self._touch("activites")
+        self._invalidate_progression_cache()
 
     def delete_activity(self, act_id):
         """Supprime une activité et toutes ses dépendances (enfants, sessions)."""
@@ -148,6 +258,8 @@ class DatabaseManager:
                 cur.execute("DELETE FROM activites WHERE id = ?", (act_id,))
                 
             self.conn.commit()
+            self._touch("activites", "sessions", "projet_activites")
+            self._invalidate_progression_cache()
             
         except Exception as e:
             print(f"Erreur lors de la suppression de l'activité {act_id}: {e}")
@@ -206,9 +318,10 @@ class DatabaseManager:
         return [row[0] for row in cur.fetchall()]
 
     def get_filtered_history(self, mode, reference_date=None, activity_id=None, project_id=None):
+        """Sessions filtrées, des plus récentes aux plus anciennes : (date, activité, nom saisi, durée, id activité)."""
         cur = self.conn.cursor()
         query = """
-            SELECT s.date, a.libelle, s.nom_saisi, s.duree
+            SELECT s.date, a.libelle, s.nom_saisi, s.duree, s.id_act
             FROM sessions s
             JOIN activites a ON s.id_act = a.id
             WHERE 1=1
@@ -245,45 +358,209 @@ class DatabaseManager:
         cur.execute(query, tuple(params))
         return cur.fetchall()
 
-    def get_filtered_distribution(self, mode, reference_date=None, activity_id=None, project_id=None):
-        cur = self.conn.cursor()
-        query = """
-            SELECT a.libelle, SUM(s.duree)
-            FROM sessions s
-            JOIN activites a ON s.id_act = a.id
-            WHERE 1=1
-        """
+    def _distribution_filters(self, mode, reference_date=None, activity_id=None, project_id=None):
+        """Clause WHERE (et paramètres) commune aux requêtes de répartition."""
+        where_clause = "WHERE 1=1"
         params = []
         
         if project_id and project_id != "all":
-            query += " AND s.id_projet = ?"
+            where_clause += " AND s.id_projet = ?"
             params.append(project_id)
             
         if activity_id and activity_id != "all":
             ids = self._get_family_ids(activity_id)
             if ids:
                 placeholders = ','.join(['?'] * len(ids))
-                query += f" AND s.id_act IN ({placeholders})"
+                where_clause += f" AND s.id_act IN ({placeholders})"
                 params.extend(ids)
         
         if mode == "Aujourd'hui":
             today = datetime.now().strftime("%Y-%m-%d")
-            query += " AND s.date LIKE ?"
+            where_clause += " AND s.date LIKE ?"
             params.append(f"{today}%")
         elif mode in ["Période", "Semaine", "Une semaine", "Un mois", "Cette année"]:
             if isinstance(reference_date, (tuple, list)) and len(reference_date) >= 2:
                 start_date = reference_date[0].strftime("%Y-%m-%d")
                 end_date = reference_date[1].strftime("%Y-%m-%d")
-                query += " AND date(s.date) BETWEEN ? AND ?"
+                where_clause += " AND date(s.date) BETWEEN ? AND ?"
                 params.extend([start_date, end_date])
-            
-        query += " GROUP BY a.libelle"
+
+        return where_clause, params
+
+    @staticmethod
+    def _activity_key(rollup):
+        """
+        Expression SQL de l'activité à laquelle une session est comptée : la sienne, ou son
+        parent si rollup (les sous-activités n'ont qu'un niveau). Un entier : pas de regroupement
+        par libellé, deux activités de même nom restent distinctes.
+        """
+        return "COALESCE(a.parent_id, a.id)" if rollup else "a.id"
+
+    def get_filtered_distribution(self, mode, reference_date=None, activity_id=None, project_id=None, rollup=False):
+        """Temps par activité : liste de (id activité, secondes)."""
+        cur = self.conn.cursor()
+        where_clause, params = self._distribution_filters(mode, reference_date, activity_id, project_id)
+        query = f"""
+            SELECT {self._activity_key(rollup)} AS act, SUM(s.duree)
+            FROM sessions s
+            JOIN activites a ON s.id_act = a.id
+            {where_clause}
+            GROUP BY act
+        """
         cur.execute(query, tuple(params))
         return cur.fetchall()
 
-    def get_filtered_progression(self, mode, reference_date=None, activity_id=None, project_id=None):
+    def get_distribution_top_k(self, mode, reference_date=None, activity_id=None, project_id=None, top_k=8, offset=0,
+                               rollup=False):
+        """
+        Répartition limitée aux top_k activités (classées par temps décroissant) après les `offset` premières.
+        Les activités suivantes sont regroupées, dans la même requête, en une ligne "Autres".
+        Retourne une liste de (id activité, secondes, nb_activités, est_autres) ; l'id vaut None pour "Autres".
+        Avec rollup, le temps des sous-activités est compté à leur parent.
+        """
+        cur = self.conn.cursor()
+        where_clause, params = self._distribution_filters(mode, reference_date, activity_id, project_id)
+        limit = offset + top_k
+        query = f"""
+            WITH totaux AS (
+                SELECT {self._activity_key(rollup)} AS act, SUM(s.duree) AS total
+                FROM sessions s
+                JOIN activites a ON s.id_act = a.id
+                {where_clause}
+                GROUP BY act
+            ),
+            classement AS (
+                SELECT act, total,
+                       ROW_NUMBER() OVER (ORDER BY total DESC, act) AS rang,
+                       COUNT(*) OVER () AS nb
+                FROM totaux
+            ),
+            groupes AS (
+                -- Une seule activité restante n'est pas regroupée
+                SELECT act, total, rang, (rang <= ? OR nb <= ? + 1) AS visible
+                FROM classement
+                WHERE rang > ?
+            )
+            SELECT CASE WHEN visible THEN act END,
+                   SUM(total),
+                   COUNT(*),
+                   MAX(NOT visible)
+            FROM groupes
+            GROUP BY CASE WHEN visible THEN rang ELSE -1 END
+            ORDER BY MIN(rang)
+        """
+        cur.execute(query, tuple(params) + (limit, limit, offset))
+        return cur.fetchall()
+
+    def get_hierarchy_totals(self, mode, reference_date=None, project_id=None):
+        """
+        Temps propre de chaque activité, avec son parent, en une requête groupée.
+        Les totaux par famille et la répartition de n'importe quelle famille en sont déduits
+        en mémoire (HierarchyTotals), sans relire les sessions.
+        """
+        cur = self.conn.cursor()
+        where_clause, params = self._distribution_filters(mode, reference_date, None, project_id)
+        cur.execute(f"""
+            WITH temps AS (
+                SELECT s.id_act AS act, SUM(s.duree) AS total
+                FROM sessions s
+                {where_clause}
+                GROUP BY s.id_act
+            )
+            SELECT a.id, a.parent_id, COALESCE(t.total, 0)
+            FROM activites a
+            LEFT JOIN temps t ON t.act = a.id
+        """, tuple(params))
+        return HierarchyTotals(cur.fetchall())
+
+    def get_daily_totals(self, start, end, project_id=None):
+        """
+        Temps par jour et par activité des sessions commencées entre start (inclus) et end (exclu) :
+        liste de (jour ISO, id activité, secondes). Plage lue sur l'index idx_sessions_date.
+        """
+        cur = self.conn.cursor()
+        query = """
+            SELECT substr(s.date, 1, 10) AS jour, s.id_act, SUM(s.duree)
+            FROM sessions s
+            WHERE s.date >= ? AND s.date < ?
+        """
+        params = [start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")]
+        if project_id and project_id != "all":
+            query += " AND s.id_projet = ?"
+            params.append(project_id)
+        query += " GROUP BY jour, s.id_act"
+        cur.execute(query, tuple(params))
+        return cur.fetchall()
+
+    def get_sessions_between(self, start, end, project_id=None):
+        """
+        Sessions qui chevauchent [start, end[ (datetimes) : liste de (id, id activité, nom saisi, début, durée).
+        Seul le début étant indexé, la plage lue sur idx_sessions_date commence une plus longue
+        session avant start ; les sessions terminées avant start sont écartées par l'appelant.
+        """
+        cur = self.conn.cursor()
+        if self._longest_session is None:
+            cur.execute("SELECT COALESCE(MAX(duree), 0) FROM sessions")
+            self._longest_session = cur.fetchone()[0]
+        lower = start - timedelta(seconds=self._longest_session)
+        query = """
+            SELECT s.id, s.id_act, s.nom_saisi, s.date, s.duree
+            FROM sessions s
+            WHERE s.date >= ? AND s.date < ?
+        """
+        params = [lower.strftime("%Y-%m-%d %H:%M"), end.strftime("%Y-%m-%d %H:%M")]
+        if project_id and project_id != "all":
+            query += " AND s.id_projet = ?"
+            params.append(project_id)
+        query += " ORDER BY s.date"
+        cur.execute(query, tuple(params))
+        return cur.fetchall()
+
+    def get_week_heatmap(self, mode, reference_date=None, project_id=None):
+        """
+        Semaine type (jour x créneau de 30 minutes) des sessions filtrées, par activité.
+        Une seule requête groupée sur les bornes des sessions, au plus 336 lignes par activité
+        même sur plusieurs années : le découpage en créneaux est fait par WeekHeatmap.
+        """
+        cur = self.conn.cursor()
+        where_clause, params = self._distribution_filters(mode, reference_date, None, project_id)
+        cur.execute(f"""
+            WITH bornes AS (
+                SELECT s.id_act AS act, CAST(strftime('%s', s.date) AS INTEGER) + {MONDAY_OFFSET} AS debut,
+                       s.duree AS duree
+                FROM sessions s
+                {where_clause}
+            ),
+            points AS (
+                SELECT act, debut + duree AS t, 1 AS signe FROM bornes
+                UNION ALL
+                SELECT act, debut, -1 FROM bornes
+            )
+            SELECT act, (t % {WEEK_SECONDS}) / {SLOT_SECONDS} AS creneau,
+                   SUM(signe), SUM(signe * (t % {SLOT_SECONDS})), SUM(signe * (t / {WEEK_SECONDS}))
+            FROM points
+            WHERE t IS NOT NULL
+            GROUP BY act, creneau
+        """, tuple(params))
+        return WeekHeatmap(cur.fetchall())
+
+    def get_progression_pyramid(self, activity_id=None, project_id=None, rollup=False):
+        """
+        Pyramide multi-résolution (jour -> année) des sessions pour un filtre projet/activité.
+        Construite en un seul parcours des sessions puis gardée en mémoire jusqu'à la prochaine écriture.
+        """
+        key = (activity_id, project_id, rollup)
+        pyramid = self._progression_pyramids.get(key)
+        if pyramid is not None:
+            return pyramid
+
+        if activity_id and activity_id != "all" and not rollup:
+            # Famille d'une activité : extraite de la pyramide complète, sans relire les sessions
+            pyramid = self.get_progression_pyramid(None, project_id).restricted(self._get_family_ids(activity_id))
+            self._progression_pyramids[key] = pyramid
+            return pyramid
+
         cur = self.conn.cursor()
-        
         where_clause = "WHERE 1=1"
         params = []
         
@@ -297,25 +574,55 @@ class DatabaseManager:
                 placeholders = ','.join(['?'] * len(ids))
                 where_clause += f" AND s.id_act IN ({placeholders})"
                 params.extend(ids)
+
+        cur.execute(f"""
+            SELECT substr(s.date, 1, 10) as t, {self._activity_key(rollup)} AS act, SUM(s.duree)
+            FROM sessions s
+            JOIN activites a ON s.id_act = a.id
+            {where_clause}
+            GROUP BY t, act
+        """, tuple(params))
         
+        pyramid = ProgressionPyramid(cur.fetchall())
+        self._progression_pyramids[key] = pyramid
+        return pyramid
+
+    def _invalidate_progression_cache(self):
+        self._progression_pyramids = {}
+        self._longest_session = None
+
+    def _touch(self, *tables):
+        """Signale une écriture sur les tables données."""
+        for table in tables:
+            self._table_versions[table] = self._table_versions.get(table, 0) + 1
+
+    def data_version(self, *tables):
+        """
+        Version courante des tables données : elle change à chaque écriture sur l'une d'elles.
+        Permet aux présentateurs de ne se rafraîchir que si leurs données ont changé.
+        """
+        return tuple(self._table_versions.get(table, 0) for table in tables)
+
+    def get_progression_layout(self, mode, reference_date=None, activity_id=None, project_id=None, max_buckets=None,
+                               rollup=False):
+        """
+        Découpage du graphique d'évolution pour un filtre : (niveau, premier jour, dernier jour).
+        Le niveau vaut "hour" pour la vue horaire du jour, sinon l'un des niveaux de la pyramide ;
+        les jours valent None si aucune session ne délimite la plage (mode global sans données).
+        """
+        if mode == "Aujourd'hui":
+            today = datetime.now().date()
+            return "hour", today, today
+
         granularity = "day"
-        start_date_str = None
-        end_date_str = None
+        start_date = None
+        end_date = None
         
-        if mode == "Aujourd'hui":
-            granularity = "hour"
-            today = datetime.now().strftime("%Y-%m-%d")
-            where_clause += " AND s.date LIKE ?"
-            params.append(f"{today}%")
-            
-        elif mode in ["Période", "Semaine", "Une semaine", "Un mois", "Cette année"]:
+        if mode in ["Période", "Semaine", "Une semaine", "Un mois", "Cette année"]:
             if isinstance(reference_date, (tuple, list)) and len(reference_date) >= 2:
-                start_date_str = reference_date[0].strftime("%Y-%m-%d")
-                end_date_str = reference_date[1].strftime("%Y-%m-%d")
-                
-                d1 = reference_date[0]
-                d2 = reference_date[1]
-                delta_days = (d2 - d1).days
+                start_date = reference_date[0]
+                end_date = reference_date[1]
+                delta_days = (end_date - start_date).days
                 
                 # Déterminer la granularité selon le mode et la période
                 if mode == "Cette année":
@@ -330,56 +637,74 @@ class DatabaseManager:
                     granularity = "week"   # Plus de 2 semaines = par semaine
                 else:
                     granularity = "day"    # Moins de 2 semaines = par jour
-                
-                where_clause += " AND date(s.date) >= ? AND date(s.date) <= ?"
-                params.extend([start_date_str, end_date_str])
             else:
-                 start_date_str = datetime.now().strftime("%Y-%m-%d")
-                 end_date_str = start_date_str
-                 where_clause += " AND date(s.date) = ?"
-                 params.append(start_date_str)
+                 start_date = datetime.now().date()
+                 end_date = start_date
         else: 
             granularity = "month"
-
+            # Global : toute la plage couverte par les sessions
+            pyramid = self.get_progression_pyramid(activity_id, project_id, rollup)
+            start_date, end_date = pyramid.first_day, pyramid.last_day
+            if start_date is None:
+                return granularity, None, None
+
+        if max_buckets:
+            granularity = choose_level(start_date, end_date, granularity, max_buckets)
+        return granularity, start_date, end_date
+
+    def get_filtered_progression(self, mode, reference_date=None, activity_id=None, project_id=None, max_buckets=None,
+                                 rollup=False):
+        """
+        Temps par intervalle et par activité : liste de (intervalle, id activité, secondes).
+        Si max_buckets est fourni, la granularité est automatiquement élargie
+        (jour -> semaine -> mois -> trimestre -> année) pour ne pas dépasser ce nombre de barres.
+        """
+        granularity, start_date, end_date = self.get_progression_layout(mode, reference_date, activity_id,
+                                                                        project_id, max_buckets, rollup)
+        
         if granularity == "hour":
+            # Vue horaire : requête directe, limitée à la journée
+            cur = self.conn.cursor()
+            where_clause = "WHERE s.date LIKE ?"
+            params = [f"{datetime.now().strftime('%Y-%m-%d')}%"]
+            
+            if project_id and project_id != "all":
+                where_clause += " AND s.id_projet = ?"
+                params.append(project_id)
+                
+            if activity_id and activity_id != "all":
+                ids = self._get_family_ids(activity_id)
+                if ids:
+                    placeholders = ','.join(['?'] * len(ids))
+                    where_clause += f" AND s.id_act IN ({placeholders})"
+                    params.extend(ids)
+
             query = f"""
-                SELECT strftime('%H', s.date) as t, a.libelle, SUM(s.duree)
-                FROM sessions s
-                JOIN activites a ON s.id_act = a.id
-                {where_clause}
-                GROUP BY t, a.libelle
-                ORDER BY t
-            """
-        elif granularity == "week":
-            query = f"""
-                SELECT strftime('%Y-W%W', s.date) as t, a.libelle, SUM(s.duree)
-                FROM sessions s
-                JOIN activites a ON s.id_act = a.id
-                {where_clause}
-                GROUP BY t, a.libelle
-                ORDER BY t
-            """
-        elif granularity == "month":
-            query = f"""
-                SELECT strftime('%Y-%m', s.date) as t, a.libelle, SUM(s.duree)
-                FROM sessions s
-                JOIN activites a ON s.id_act = a.id
-                {where_clause}
-                GROUP BY t, a.libelle
-                ORDER BY t ASC
-            """
-        else: 
-            query = f"""
-                SELECT substr(s.date, 1, 10) as t, a.libelle, SUM(s.duree)
+                SELECT strftime('%H', s.date) as t, {self._activity_key(rollup)} AS act, SUM(s.duree)
                 FROM sessions s
                 JOIN activites a ON s.id_act = a.id
                 {where_clause}
-                GROUP BY t, a.libelle
+                GROUP BY t, act
                 ORDER BY t
             """
-            
-        cur.execute(query, tuple(params))
-        return cur.fetchall()
+            cur.execute(query, tuple(params))
+            return cur.fetchall()
+
+        if start_date is None:
+            return []
+        pyramid = self.get_progression_pyramid(activity_id, project_id, rollup)
+        return pyramid.query(start_date, end_date, granularity)
+
+    def get_pivot(self, mode, reference_date=None, project_id=None, level="week"):
+        """
+        Tableau croisé activités x intervalles (niveau de la pyramide) sur la plage du filtre.
+        Servi par la pyramide de progression, déjà construite pour le graphique d'évolution :
+        les sessions ne sont pas relues.
+        """
+        _, start_date, end_date = self.get_progression_layout(mode, reference_date, project_id=project_id)
+        if start_date is None:
+            return PivotTable([], level)
+        return PivotTable(self.get_progression_pyramid(None, project_id).query(start_date, end_date, level), level)
 
     def get_average_daily_time(self, mode, reference_date=None, activity_id=None, project_id=None):
         cur = self.conn.cursor()
@@ -449,6 +774,7 @@ class DatabaseManager:
         try:
             cur.execute("INSERT INTO couleurs (nom, code_hex) VALUES (?, ?)", (nom, code_hex))
             self.conn.commit()
+            self._touch("couleurs")
             return cur.lastrowid
         except sqlite3.IntegrityError:
             return None
@@ -462,6 +788,7 @@ class DatabaseManager:
         cur = self.conn.cursor()
         cur.execute("UPDATE activites SET id_couleur = ? WHERE id = ?", (color_id, act_id))
         self.conn.commit()
+        self._touch("activites")
 
     def create_project(self, nom, description=""):
         """Crée un nouveau projet."""
@@ -470,6 +797,7 @@ class DatabaseManager:
         cur.execute("INSERT INTO projets (nom, description, date_creation) VALUES (?, ?, ?)", 
                     (nom, description, date_str))
         self.conn.commit()
+        self._touch("projets")
         return cur.lastrowid
 
     def get_projects(self):
@@ -487,6 +815,8 @@ class DatabaseManager:
             # Supprimer le projet (CASCADE supprimera aussi les liens dans projet_activites)
             cur.execute("DELETE FROM projets WHERE id = ?", (project_id,))
             self.conn.commit()
+            self._touch("projets", "sessions", "projet_activites")
+            self._invalidate_progression_cache()
         except Exception as e:
             print(f"Erreur lors de la suppression du projet {project_id}: {e}")
             self.conn.rollback()
@@ -497,6 +827,7 @@ class DatabaseManager:
         try:
             cur.execute("INSERT INTO projet_activites (id_projet, id_act) VALUES (?, ?)", (project_id, act_id))
             self.conn.commit()
+            self._touch("projet_activites")
         except sqlite3.IntegrityError:
             pass
 
@@ -504,6 +835,7 @@ class DatabaseManager:
         cur = self.conn.cursor()
         cur.execute("DELETE FROM projet_activites WHERE id_projet = ? AND id_act = ?", (project_id, act_id))
         self.conn.commit()
+        self._touch("projet_activites")
 
     def get_project_activities(self, project_id):
         cur = self.conn.cursor()
@@ -520,6 +852,7 @@ class DatabaseManager:
         cur.execute("INSERT INTO raccourcis (libelle, type_raccourci, cible) VALUES (?, ?, ?)", 
                     (libelle, type_r, cible))
         self.conn.commit()
+        self._touch("raccourcis")
         return cur.lastrowid
 
     def get_shortcuts(self):
@@ -542,6 +875,18 @@ class DatabaseManager:
             cur.execute("INSERT INTO raccourcis (libelle, type_raccourci, cible) VALUES (?, ?, ?)", 
                         (action_code, "CLAVIER", key_sequence))
         self.conn.commit()
+        self._touch("raccourcis")
+
+    def get_preferences(self):
+        cur = self.conn.cursor()
+        cur.execute("SELECT cle, valeur FROM preferences")
+        return dict(cur.fetchall())
+
+    def set_preference(self, key, value):
+        cur = self.conn.cursor()
+        cur.execute("INSERT OR REPLACE INTO preferences (cle, valeur) VALUES (?, ?)", (key, value))
+        self.conn.commit()
+        self._touch("preferences")
 
     def get_visible_activity_ids(self):
         cur = self.conn.cursor()
@@ -559,6 +904,7 @@ class DatabaseManager:
             query = f"UPDATE activites SET est_visible = 1 WHERE id IN ({placeholders})"
             cur.execute(query, ids)
         self.conn.commit()
+        self._touch("activites")
 
     def has_children(self, parent_id):
         """Vérifie si une activité parent a des enfants."""
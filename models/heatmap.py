@@ -0,0 +1,54 @@
+"""
+Semaine type : secondes suivies par créneau de 30 minutes (7 jours x 48 créneaux).
+
+Les sessions ne sont pas découpées une à une. Pour un intervalle [début, fin[, le temps passé
+dans chaque créneau vaut G(fin) - G(début), où G(t) est le temps couvert dans chaque créneau
+depuis l'origine par une session qui n'aurait jamais cessé :
+    G(t)[k] = L x semaines(t) + L si k < créneau(t), reste(t) si k == créneau(t), 0 sinon.
+La requête SQL n'a donc qu'à compter, par créneau, les bornes de sessions (+1 pour une fin,
+-1 pour un début), la somme de leurs restes et de leurs semaines : au plus 336 lignes par
+activité, quel que soit le nombre de sessions. Une session à cheval sur plusieurs créneaux
+(ou sur la fin de semaine) est ainsi répartie exactement.
+"""
+
+DAYS = 7
+SLOT_SECONDS = 1800 # Créneaux de 30 minutes
+SLOTS_PER_DAY = 24 * 3600 // SLOT_SECONDS
+WEEK_SECONDS = DAYS * 24 * 3600
+WEEK_SLOTS = DAYS * SLOTS_PER_DAY
+# Décalage ajouté aux dates (secondes depuis le 1er janvier 1970, un jeudi) pour que
+# les semaines commencent le lundi à 0h
+MONDAY_OFFSET = 3 * 24 * 3600
+
+
+class WeekHeatmap:
+    """Bornes de sessions agrégées par activité et par créneau, d'où les matrices sont déduites."""
+
+    def __init__(self, rows):
+        # rows : (id activité, créneau, somme des signes, somme des restes, somme des semaines)
+        self.by_activity = {}
+        for act_id, slot, count, remainder, weeks in rows:
+            self.by_activity.setdefault(act_id, []).append((slot, count, remainder, weeks))
+
+    def matrix(self, act_ids=None):
+        """
+        Secondes par jour (lundi = 0) et par créneau : 7 listes de SLOTS_PER_DAY valeurs.
+        act_ids : activités à compter (None : toutes).
+        """
+        counts = [0] * WEEK_SLOTS
+        remainders = [0] * WEEK_SLOTS
+        weeks = 0
+        for act_id, bins in self.by_activity.items():
+            if act_ids is not None and act_id not in act_ids:
+                continue
+            for slot, count, remainder, week_sum in bins:
+                counts[slot] += count
+                remainders[slot] += remainder
+                weeks += week_sum
+
+        seconds = [0] * WEEK_SLOTS
+        after = 0 # Somme des signes des bornes situées dans un créneau ultérieur
+        for k in range(WEEK_SLOTS - 1, -1, -1):
+            seconds[k] = SLOT_SECONDS * (weeks + after) + remainders[k]
+            after += counts[k]
+        return [seconds[d * SLOTS_PER_DAY:(d + 1) * SLOTS_PER_DAY] for d in range(DAYS)]
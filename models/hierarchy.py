@@ -0,0 +1,54 @@
+"""
+Totaux de la hiérarchie des activités (parent -> sous-activités) pour un filtre.
+Une seule requête groupée donne le temps propre de chaque activité ; les totaux par famille
+en sont ensuite déduits en mémoire, sans relire les sessions.
+"""
+
+
+class HierarchyTotals:
+    """Temps propre et temps cumulé (sous-activités comprises) de chaque activité."""
+
+    def __init__(self, rows):
+        # rows : (id activité, id parent, secondes) pour toutes les activités, 0 si aucune session
+        self.own = {}
+        self.parent_of = {}
+        self.children = {} # id parent -> ids des sous-activités, dans l'ordre des lignes
+        for act_id, parent_id, sec in rows:
+            self.own[act_id] = self.own.get(act_id, 0) + (sec or 0)
+            self.parent_of[act_id] = parent_id
+        for act_id, parent_id in self.parent_of.items():
+            if parent_id is not None and parent_id in self.parent_of:
+                self.children.setdefault(parent_id, []).append(act_id)
+        self.totals = {}
+        for act_id in self.parent_of:
+            self.total(act_id)
+
+    def total(self, act_id):
+        """Temps de l'activité et de toutes ses descendantes."""
+        total = self.totals.get(act_id)
+        if total is None:
+            total = self.own.get(act_id, 0) + sum(self.total(c) for c in self.children.get(act_id, ()))
+            self.totals[act_id] = total
+        return total
+
+    def roots(self):
+        return [a for a, p in self.parent_of.items() if p is None or p not in self.parent_of]
+
+    def grand_total(self):
+        return sum(self.totals[a] for a in self.roots())
+
+    def family(self, act_id):
+        """Ids de l'activité et de ses descendantes."""
+        ids = [act_id]
+        for a in ids:
+            ids.extend(self.children.get(a, ()))
+        return set(ids)
+
+    def rings(self):
+        """
+        Données du graphique en anneaux : [(id parent, total, [(id enfant, total), ...]), ...]
+        limitées aux activités ayant du temps, par total décroissant.
+        """
+        by_total = lambda ids: sorted((a for a in ids if self.totals.get(a)), key=lambda a: (-self.totals[a], a))
+        return [(root, self.totals[root], [(c, self.totals[c]) for c in by_total(self.children.get(root, ()))])
+                for root in by_total(self.roots())]
@@ -0,0 +1,39 @@
+"""
+Tableau croisé : temps par activité (lignes) et par intervalle (colonnes), avec totaux.
+Les cellules viennent des agrégats déjà calculés par la pyramide de progression ;
+filtrer par famille ou regrouper les sous-activités se fait ensuite en mémoire.
+"""
+
+
+class PivotTable:
+    """Matrice activités x intervalles en secondes, lignes triées par total décroissant."""
+
+    def __init__(self, rows, level):
+        # rows : (clé d'intervalle, id activité, secondes), clés au format de bucket_key
+        self.level = level
+        self.rows = rows
+        self.periods = sorted({key for key, _, _ in rows})
+        columns = {key: c for c, key in enumerate(self.periods)}
+        by_activity = {}
+        for key, act_id, sec in rows:
+            line = by_activity.get(act_id)
+            if line is None:
+                line = by_activity[act_id] = [0] * len(self.periods)
+            line[columns[key]] += sec or 0
+
+        self.activities = sorted(by_activity, key=lambda a: (-sum(by_activity[a]), a))
+        self.cells = [by_activity[a] for a in self.activities]
+        self.row_totals = [sum(line) for line in self.cells]
+        self.column_totals = [sum(column) for column in zip(*self.cells)] if self.cells else [0] * len(self.periods)
+        self.grand_total = sum(self.row_totals)
+
+    def for_activities(self, act_ids=None):
+        """Même tableau limité à act_ids (None : toutes les activités)."""
+        if act_ids is None:
+            return self
+        return PivotTable([r for r in self.rows if r[1] in act_ids], self.level)
+
+    def rolled_up(self, parent_of):
+        """Sous-activités comptées à leur parent (parent_of : id -> id parent ou None)."""
+        return PivotTable([(key, parent_of.get(act_id) or act_id, sec) for key, act_id, sec in self.rows],
+                          self.level)
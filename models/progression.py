@@ -0,0 +1,135 @@
+"""
+Pyramide multi-résolution pour le graphique d'évolution.
+Les sessions sont agrégées une seule fois par jour et par activité,
+puis pré-agrégées par semaine, mois, trimestre et année.
+Changer de période ou de niveau de détail ne relit donc pas les sessions brutes.
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import date
+
+# Niveaux de détail, du plus fin au plus grossier
+LEVELS = ("day", "week", "month", "quarter", "year")
+
+
+def bucket_key(day, level):
+    """Clé d'intervalle d'un jour, au format produit par les requêtes SQL (strftime)."""
+    if level == "day":
+        return day.isoformat()
+    if level == "week":
+        return day.strftime("%Y-W%W")
+    if level == "month":
+        return day.strftime("%Y-%m")
+    if level == "quarter":
+        return f"{day.year}-T{(day.month + 2) // 3}"
+    return str(day.year)
+
+
+def estimate_bucket_count(start, end, level):
+    """Nombre (maximal) d'intervalles couvrant [start, end] au niveau donné."""
+    if end < start:
+        return 0
+    if level == "day":
+        return (end - start).days + 1
+    if level == "week":
+        return (end - start).days // 7 + 2
+    if level == "month":
+        return (end.year - start.year) * 12 + end.month - start.month + 1
+    if level == "quarter":
+        return (end.year * 4 + (end.month - 1) // 3) - (start.year * 4 + (start.month - 1) // 3) + 1
+    return end.year - start.year + 1
+
+
+def choose_level(start, end, base_level, max_buckets):
+    """
+    Niveau le plus fin, à partir de base_level, qui tient en max_buckets barres.
+    On ne descend jamais sous base_level : le mode de filtre fixe la résolution minimale.
+    """
+    idx = LEVELS.index(base_level)
+    while idx < len(LEVELS) - 1 and estimate_bucket_count(start, end, LEVELS[idx]) > max_buckets:
+        idx += 1
+    return LEVELS[idx]
+
+
+class ProgressionPyramid:
+    """
+    Agrégats (intervalle, activité) -> secondes pour chaque niveau de LEVELS.
+    Construite à partir des totaux journaliers : (jour ISO, id activité, secondes).
+    """
+    def __init__(self, day_rows):
+        days = {}
+        for day_iso, act_id, sec in day_rows:
+            d = date.fromisoformat(day_iso)
+            per_act = days.setdefault(d, {})
+            per_act[act_id] = per_act.get(act_id, 0) + sec
+        self._index(days)
+
+    def _index(self, days):
+        self.days = days
+        self.sorted_days = sorted(days)
+        self.levels = {level: self._build_level(level) for level in LEVELS}
+
+    def _build_level(self, level):
+        """
+        Retourne la liste triée des intervalles du niveau :
+        (clé, totaux {activité: secondes}, jours avec données triés).
+        """
+        buckets = {}
+        for d in self.sorted_days:
+            key = bucket_key(d, level)
+            totals, bucket_days = buckets.setdefault(key, ({}, []))
+            for act_id, sec in self.days[d].items():
+                totals[act_id] = totals.get(act_id, 0) + sec
+            bucket_days.append(d)
+
+        ordered = [(key, totals, bucket_days) for key, (totals, bucket_days) in sorted(buckets.items())]
+        # Dernier jour de chaque intervalle : croissant, sert à la recherche dichotomique
+        last_days = [bucket_days[-1] for _, _, bucket_days in ordered]
+        return ordered, last_days
+
+    def restricted(self, act_ids):
+        """Pyramide limitée à quelques activités, reconstruite depuis les totaux journaliers en mémoire."""
+        act_ids = set(act_ids)
+        days = {}
+        for d, per_act in self.days.items():
+            kept = {act_id: sec for act_id, sec in per_act.items() if act_id in act_ids}
+            if kept:
+                days[d] = kept
+        pyramid = ProgressionPyramid(())
+        pyramid._index(days)
+        return pyramid
+
+    @property
+    def first_day(self):
+        return self.sorted_days[0] if self.sorted_days else None
+
+    @property
+    def last_day(self):
+        return self.sorted_days[-1] if self.sorted_days else None
+
+    def query(self, start, end, level):
+        """
+        Lignes (clé, activité, secondes) des jours compris dans [start, end], agrégées au niveau donné.
+        Les intervalles entièrement inclus sont servis pré-agrégés ; seuls les intervalles
+        coupés par les bornes sont recomposés à partir des jours.
+        """
+        ordered, last_days = self.levels[level]
+        rows = []
+        i = bisect_left(last_days, start)
+        while i < len(ordered):
+            key, totals, bucket_days = ordered[i]
+            if bucket_days[0] > end:
+                break
+            if bucket_days[0] >= start and bucket_days[-1] <= end:
+                partial = totals
+            else:
+                partial = {}
+                lo = bisect_left(bucket_days, start)
+                hi = bisect_right(bucket_days, end)
+                for d in bucket_days[lo:hi]:
+                    for act_id, sec in self.days[d].items():
+                        partial[act_id] = partial.get(act_id, 0) + sec
+            for act_id in sorted(partial):
+                rows.append((key, act_id, partial[act_id]))
+            i += 1
+        return rows
@@ -0,0 +1,67 @@
+"""
+Chronologie : sessions d'une plage de jours placées sur l'axe des heures de chaque jour.
+Une session à cheval sur minuit est découpée entre les deux jours ; les sessions simultanées
+d'un même jour sont réparties sur des lignes distinctes pour rester visibles.
+"""
+
+from datetime import datetime, timedelta
+
+DAY_SECONDS = 24 * 3600
+
+
+class DayTimeline:
+    """Blocs (début, fin en secondes depuis minuit, id session, id activité, nom saisi) par jour."""
+
+    def __init__(self, first_day, days, rows):
+        # rows : (id session, id activité, nom saisi, début "AAAA-MM-JJ HH:MM", durée en secondes)
+        self.first_day = first_day
+        self.days = days
+        self.rows = rows
+        self.blocks = [[] for _ in range(days)]
+        origin = datetime.combine(first_day, datetime.min.time())
+        window_end = days * DAY_SECONDS
+        for session_id, act_id, nom_saisi, start_text, duree in rows:
+            if not duree or duree <= 0:
+                continue
+            start = int((datetime.strptime(start_text[:16], "%Y-%m-%d %H:%M") - origin).total_seconds())
+            end = start + duree
+            # Découpage par jour, limité à la plage demandée
+            t = max(start, 0)
+            while t < min(end, window_end):
+                day = t // DAY_SECONDS
+                day_end = min(end, (day + 1) * DAY_SECONDS)
+                self.blocks[day].append((t - day * DAY_SECONDS, day_end - day * DAY_SECONDS,
+                                         session_id, act_id, nom_saisi))
+                t = day_end
+        self.lanes = [pack_lanes(blocks) for blocks in self.blocks]
+        self._filtered = {}
+
+    def day(self, index):
+        return self.first_day + timedelta(days=index)
+
+    def for_activities(self, act_ids=None):
+        """Même chronologie limitée à act_ids (None : toutes les activités)."""
+        if act_ids is None:
+            return self
+        key = frozenset(act_ids)
+        result = self._filtered.get(key)
+        if result is None:
+            result = DayTimeline(self.first_day, self.days, [r for r in self.rows if r[1] in key])
+            self._filtered[key] = result
+        return result
+
+
+def pack_lanes(blocks):
+    """Répartit les blocs d'un jour sur le moins de lignes possible (aucun chevauchement dans une ligne)."""
+    lanes = []
+    lane_ends = []
+    for block in sorted(blocks):
+        for k, end in enumerate(lane_ends):
+            if end <= block[0]:
+                lanes[k].append(block)
+                lane_ends[k] = block[1]
+                break
+        else:
+            lanes.append([block])
+            lane_ends.append(block[1])
+    return lanes
@@ -0,0 +1,109 @@
+"""
+Mesure du temps des sessions sans dérive.
+Le temps écoulé n'est jamais accumulé tick par tick : il est recalculé à la demande à partir
+d'ancres time.monotonic_ns() (insensibles aux changements d'heure système), tandis que des
+ancres datetime donnent l'heure réelle de début et de fin de chaque segment (pause/reprise).
+"""
+
+import time
+from datetime import datetime
+
+NS_PER_SECOND = 1_000_000_000
+
+
+class SessionClock:
+    """Chronomètre d'une session : une suite de segments actifs séparés par des pauses."""
+
+    def __init__(self, monotonic=time.monotonic_ns, now=datetime.now):
+        self.monotonic = monotonic
+        self.now = now
+        self.reset()
+
+    def reset(self):
+        self.segments = [] # (début datetime, fin datetime, durée_ns) des segments terminés
+        self.closed_ns = 0 # Somme des segments terminés
+        self.segment_start_ns = None # Ancre monotone du segment en cours
+        self.segment_start_wall = None
+
+    @property
+    def running(self):
+        return self.segment_start_ns is not None
+
+    @property
+    def started_at(self):
+        """Heure réelle du début de la session (premier segment)."""
+        if self.segments:
+            return self.segments[0][0]
+        return self.segment_start_wall
+
+    def start(self):
+        """Démarre une nouvelle session."""
+        self.reset()
+        self.resume()
+
+    def restore(self, started_at, elapsed_ns, running):
+        """Reprend une session interrompue : le temps déjà mesuré devient un segment terminé."""
+        self.reset()
+        self.segments.append((started_at, self.now(), elapsed_ns))
+        self.closed_ns = elapsed_ns
+        if running:
+            self.resume()
+
+    def resume(self):
+        if self.running:
+            return
+        self.segment_start_ns = self.monotonic()
+        self.segment_start_wall = self.now()
+
+    def pause(self):
+        if not self.running:
+            return
+        duration = self.monotonic() - self.segment_start_ns
+        self.segments.append((self.segment_start_wall, self.now(), duration))
+        self.closed_ns += duration
+        self.segment_start_ns = None
+        self.segment_start_wall = None
+
+    def stop(self):
+        """Termine la session et retourne sa durée en secondes (arrondie)."""
+        self.pause()
+        return self.duration_seconds()
+
+    def elapsed_ns(self):
+        elapsed = self.closed_ns
+        if self.running:
+            elapsed += self.monotonic() - self.segment_start_ns
+        return elapsed
+
+    def elapsed_seconds(self):
+        """Secondes entières écoulées (valeur affichée)."""
+        return self.elapsed_ns() // NS_PER_SECOND
+
+    def duration_seconds(self):
+        """Durée enregistrée : arrondie à la seconde la plus proche."""
+        return (self.elapsed_ns() + NS_PER_SECOND // 2) // NS_PER_SECOND
+
+    def ms_until_next_second(self):
+        """Délai avant le prochain changement de la seconde affichée (None si en pause)."""
+        if not self.running:
+            return None
+        remaining_ns = NS_PER_SECOND - self.elapsed_ns() % NS_PER_SECOND
+        return -(-remaining_ns // 1_000_000) # Arrondi supérieur : on tombe juste après la frontière
+
+
+class ActivityTimer:
+    """Un chrono en cours : l'activité suivie, son horloge et sa ligne du journal active_session."""
+
+    def __init__(self, slot, act_id, name, project_id=None, clock=None):
+        self.slot = slot
+        self.act_id = act_id
+        self.name = name
+        self.project_id = project_id
+        self.clock = clock or SessionClock()
+        self.last_checkpoint_ns = None # Dernière écriture dans le journal (horloge monotone)
+        self.shown_seconds = None # Dernière valeur affichée, pour ne rafraîchir que les changements
+
+    def journal_row(self):
+        """Ligne du journal : (slot, id_act, nom, id_projet, début, durée, en_cours)."""
+        return (self.slot, self.act_id, self.name, self.project_id,
+                self.clock.started_at, self.clock.duration_seconds(), self.clock.running)
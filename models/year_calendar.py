@@ -0,0 +1,75 @@
+"""
+Calendrier annuel : temps suivi par jour, séries de jours actifs et plus longue pause.
+Les totaux journaliers d'une année sont lus en une requête indexée (par jour et par activité) ;
+les totaux d'une famille d'activités en sont déduits en mémoire.
+"""
+
+from datetime import date, timedelta
+
+
+class YearCalendar:
+    """Totaux journaliers d'une année, par activité."""
+
+    def __init__(self, year, rows):
+        # rows : (jour ISO, id activité, secondes)
+        self.year = year
+        self.by_day = {} # date -> {id activité: secondes}
+        for day_iso, act_id, sec in rows:
+            per_act = self.by_day.setdefault(date.fromisoformat(day_iso), {})
+            per_act[act_id] = per_act.get(act_id, 0) + (sec or 0)
+        self._totals = {} # ensemble d'activités (None : toutes) -> {date: secondes}
+
+    def totals(self, act_ids=None):
+        """Secondes par jour actif, pour toutes les activités ou seulement act_ids."""
+        key = frozenset(act_ids) if act_ids is not None else None
+        result = self._totals.get(key)
+        if result is None:
+            result = {}
+            for day, per_act in self.by_day.items():
+                if act_ids is None:
+                    sec = sum(per_act.values())
+                else:
+                    sec = sum(s for act_id, s in per_act.items() if act_id in act_ids)
+                if sec > 0:
+                    result[day] = sec
+            self._totals[key] = result
+        return result
+
+
+def calendar_stats(totals, year, today, previous=None):
+    """
+    Indicateurs d'une année : (série actuelle, plus longue série, plus longue pause, jours actifs, total).
+    totals : {date: secondes} de l'année ; previous : ceux de l'année précédente, pour une série
+    actuelle commencée avant le 1er janvier (None s'ils ne sont pas chargés).
+    La plus longue pause est comptée à partir du premier jour actif, jusqu'à la fin de l'année
+    ou jusqu'à aujourd'hui.
+    """
+    end = min(date(year, 12, 31), today)
+    longest = run = 0
+    longest_gap = gap = 0
+    started = False
+    day = date(year, 1, 1)
+    while day <= end:
+        if totals.get(day):
+            run += 1
+            longest = max(longest, run)
+            gap = 0
+            started = True
+        else:
+            run = 0
+            if started:
+                gap += 1
+                longest_gap = max(longest_gap, gap)
+        day += timedelta(days=1)
+
+    # Série actuelle : jours actifs consécutifs jusqu'à aujourd'hui (ou hier, rien n'étant peut-être encore suivi)
+    current = 0
+    if today.year == year:
+        day = today if totals.get(today) else today - timedelta(days=1)
+        while True:
+            source = totals if day.year == year else (previous or {})
+            if not source.get(day):
+                break
+            current += 1
+            day -= timedelta(days=1)
+    return current, longest, longest_gap, len(totals), sum(totals.values())
@@ -3,9 +3,15 @@ Présentateur de la page d'accueil.
 Gère l'affichage des activités récentes et du chronomètre.
 """
 
+from datetime import date
+
+from models.year_calendar import YearCalendar, calendar_stats
+
 class AccueilPresenter:
     """Présentateur pour la vue d'accueil."""
     
+    DEPENDS_ON = ("sessions", "activites")
+
     def __init__(self, view, db):
         self.view = view
         self.db = db
@@ -16,6 +22,19 @@ class AccueilPresenter:
         history = self.db.get_history()
         if hasattr(self.view, 'update_recap'):
              self.view.update_recap(history)
+        if hasattr(self.view, 'update_calendar'):
+            self.refresh_calendar()
+
+    def refresh_calendar(self):
+        """Calendrier de l'année en cours : une requête indexée sur les totaux journaliers."""
+        today = date.today()
+        year = today.year
+        totals = YearCalendar(year, self.db.get_daily_totals(date(year, 1, 1), date(year + 1, 1, 1))).totals()
+        previous = None
+        if totals.get(date(year, 1, 1)):
+            # Série actuelle commencée l'année précédente : seulement alors la relire
+            previous = YearCalendar(year - 1, self.db.get_daily_totals(date(year - 1, 1, 1), date(year, 1, 1))).totals()
+        self.view.update_calendar(year, totals, calendar_stats(totals, year, today, previous))
 
     def update_chrono_state(self, time_text, status_text=None):
         """Met à jour l'affichage du chronomètre dans la vue."""
@@ -2,9 +2,13 @@ from PySide6.QtWidgets import QTreeWidgetItem, QMessageBox, QPushButton, QWidget
 from PySide6.QtGui import QColor, QBrush, Qt
 
 class ActivitesPresenter:
-    def __init__(self, view, model):
+    DEPENDS_ON = ("activites", "couleurs")
+
+    def __init__(self, view, model, catalog, colors):
         self.view = view
         self.model = model
+        self.catalog = catalog # ActivityCatalog partagé
+        self.colors = colors # ColorService partagé
         
         self.is_editing = False
         self.edit_id = None
@@ -46,9 +50,9 @@ class ActivitesPresenter:
         # ID is now in column 2
         act_id = int(item.text(2))
         
-        act_data = self.model.get_activity(act_id)
-        if act_data:
-            _, name, parent_id, color_id = act_data
+        node = self.catalog.node(act_id)
+        if node:
+            name, parent_id = node.label, node.parent_id
             
             self.is_editing = True
             self.edit_id = act_id
@@ -58,18 +62,11 @@ class ActivitesPresenter:
 
     def update_list(self):
         self.view.tree.clear()
-        activities = self.model.get_activities()
-        colors_db = self.model.get_all_colors()
-        colors_map = {c[0]: c[2] for c in colors_db} 
-        
-        DEFAULT_COLORS = ["#4facfe", "#43e97b", "#fa709a", "#667eea", "#ff0844", "#fccb90"]
-        
         items_map = {}
         act_data = {}
         
-        for a in activities:
-             a_id, libelle, p_id, c_id = a
-             act_data[a_id] = {'libelle': libelle, 'parent_id': p_id, 'color_id': c_id, 'item': None}
+        for node in self.catalog.all():
+             act_data[node.id] = {'libelle': node.label, 'parent_id': node.parent_id, 'color_id': node.color_id, 'item': None}
 
         for act_id, data in act_data.items():
             # Colonnes: [Libelle, (Widget Couleur), ID]
@@ -79,23 +76,7 @@ class ActivitesPresenter:
             is_child = (p_id and p_id in act_data)
 
             # Logique de Couleur : Parents -> Propre Config, Enfants -> Héritage Strict
-            hex_code = None
-            
-            if is_child:
-                # Force Parent Color
-                p_data = act_data[p_id]
-                p_cid = p_data['color_id']
-                if p_cid and p_cid in colors_map:
-                    hex_code = colors_map[p_cid]
-                else:
-                    hex_code = DEFAULT_COLORS[p_id % len(DEFAULT_COLORS)]
-            else:
-                # Parent Logic
-                c_id = data['color_id']
-                if c_id and c_id in colors_map:
-                    hex_code = colors_map[c_id]
-                else:
-                    hex_code = DEFAULT_COLORS[act_id % len(DEFAULT_COLORS)]
+            hex_code = self.colors.activity_hex(p_id if is_child else act_id)
             
             data['item'] = item
             data['final_color'] = hex_code # Stockage pour usage widget
@@ -151,10 +132,9 @@ class ActivitesPresenter:
 
     def update_parents_combo(self):
         """Met à jour la liste des parents possibles (uniquement les activités de niveau racine)."""
-        activities = self.model.get_activities()
         # CORRECTION : Ne proposer que les activités sans parent (niveau racine)
         # pour éviter de créer des sous-activités de sous-activités
-        choices = [(a[0], a[1]) for a in activities if a[2] is None]  # a[2] = parent_id
+        choices = [(node.id, node.label) for node in self.catalog.roots()]
         self.view.set_parents_choices(choices)
 
     def change_activity_color(self, act_id):
@@ -162,33 +142,22 @@ class ActivitesPresenter:
         from vues.color_picker import ColorPicker
         
         # Récupérer la couleur actuelle
-        act_data = self.model.get_activity(act_id)
+        node = self.catalog.node(act_id)
         current_color = None
-        if act_data and act_data[3]:  # color_id
-            colors_db = self.model.get_all_colors()
-            colors_map = {c[0]: c[2] for c in colors_db}
-            if act_data[3] in colors_map:
-                current_color = QColor(colors_map[act_data[3]])
+        if node and node.color_id:
+            hex_code = self.colors.hex_for_id(node.color_id)
+            if hex_code:
+                current_color = QColor(hex_code)
         
         # Ouvrir le sélecteur
         color = ColorPicker.get_color_from_user(self.view, current_color)
         
         if color and color.isValid():
             hex_code = color.name()
-            color_id = self.resolve_color_id(hex_code)
+            color_id = self.colors.ensure_color_id(hex_code)
             self.model.update_activity_color(act_id, color_id)
             self.refresh()
 
-    def resolve_color_id(self, hex_code):
-        if not hex_code:
-            return None
-        colors = self.model.get_all_colors()
-        for c in colors:
-             if c[2].lower() == hex_code.lower():
-                 return c[0]
-        new_id = self.model.add_color(hex_code, hex_code)
-        return new_id
-
     def save_activity(self):
         # Clear previous messages
         self.view.clear_message()
@@ -201,8 +170,8 @@ class ActivitesPresenter:
 
         # CORRECTION : Vérifier que le parent sélectionné n'est pas lui-même un enfant
         if parent_id:
-            parent_data = self.model.get_activity(parent_id)
-            if parent_data and parent_data[2] is not None:  # parent_data[2] = parent_id du parent
+            parent_node = self.catalog.node(parent_id)
+            if parent_node and parent_node.parent_id is not None:
                 self.view.show_error("Impossible : vous ne pouvez créer qu'un seul niveau de sous-activités.")
                 return
 
@@ -212,15 +181,15 @@ class ActivitesPresenter:
                 return
             
             # Récupérer données existantes
-            curr = self.model.get_activity(self.edit_id)
+            curr = self.catalog.node(self.edit_id)
             if not curr: return
             
-            curr_color_id = curr[3]
-            old_parent_id = curr[2]
+            curr_color_id = curr.color_id
+            old_parent_id = curr.parent_id
             
             # Check limit if changing parent
             if parent_id and parent_id != old_parent_id:
-                count = self.model.get_children_count(parent_id)
+                count = self.catalog.children_count(parent_id)
                 if count >= 10:
                     self.view.show_error("Ce parent a déjà 10 sous-activités.")
                     return
@@ -229,7 +198,7 @@ class ActivitesPresenter:
             self.view.show_success("Activité modifiée avec succès.")
         else: # Mode Ajout
             if parent_id:
-                count = self.model.get_children_count(parent_id)
+                count = self.catalog.children_count(parent_id)
                 if count >= 10:
                     self.view.show_error("Vous ne pouvez pas créer plus de 10 sous-activités.")
                     return
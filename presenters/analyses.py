@@ -3,31 +3,106 @@ Présentateur des analyses et statistiques.
 Gère la logique métier des graphiques, filtres et exports de données.
 """
 
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
+
+from PySide6.QtCore import QTimer, Qt
+
+from models.progression import bucket_key
+from models.timeline import DayTimeline
+from models.year_calendar import YearCalendar, calendar_stats
+from presenters.preferences import FILTER_MODE, PIE_ROLLUP, PIVOT_LEVEL, PIVOT_ROLLUP
+from presenters.query_runner import QueryRunner
+from vues.visibility import is_on_screen
 
 class AnalysesPresenter:
     """
     Présentateur pour la vue d'analyse.
     Gère les filtres, les graphiques et l'export CSV des données.
     """
-    def __init__(self, view, model):
+    DEPENDS_ON = ("sessions", "activites", "couleurs", "projets")
+
+    def __init__(self, view, model, settings, catalog, colors):
         self.view = view
         self.model = model
+        self.settings = settings # SettingsStore (dernier mode de filtre)
+        self.catalog = catalog # ActivityCatalog partagé
+        self.colors = colors # ColorService partagé
         
         self.current_project_id = "all"
-        self.current_color_map = {}
+        self.activity_info = None # (id -> libellé, id -> couleur, ids des parents) transmis à la vue
+        
+        # Répartition : sous-activités comptées à leur parent, ou détail d'un seul parent
+        self.pie_rollup = self.settings.get(PIE_ROLLUP)
+        self.pie_parent = None
+        self.view.set_pie_rollup(self.pie_rollup)
+        
+        # Activité choisie dans la hiérarchie : toutes les cartes sont limitées à sa famille.
+        # Les sessions en sont déduites en mémoire, depuis les agrégats du filtre courant
+        self.scope_id = None
+        self.hierarchy = None # HierarchyTotals du filtre courant
+        self.heatmap = None # WeekHeatmap du filtre courant (semaine type, par activité)
+        self.history_rows = [] # Sessions du filtre courant, toutes activités
+        
+        # Calendrier annuel (indépendant du filtre de période, mais pas du projet) : les années
+        # voisines de celle affichée sont préchargées pour que la navigation soit immédiate
+        self.calendar_year = date.today().year
+        self.calendar_years = {} # année -> YearCalendar du projet courant
+        
+        # Jour du dernier chargement : au changement de date, les plages qui finissaient ce jour-là le suivent
+        self.today = date.today()
+        
+        # Chronologie : seules les sessions de la plage affichée sont lues
+        self.timeline_window = (date.today() - timedelta(days=6), 7) # (premier jour, nombre de jours)
+        self.timeline = None # DayTimeline de la plage, toutes activités
         
-        # Filtres courants (valeurs par défaut)
+        # Tableau croisé : servi par la pyramide de progression, famille et regroupement appliqués en mémoire
+        self.pivot_level = self.settings.get(PIVOT_LEVEL)
+        self.pivot_rollup = self.settings.get(PIVOT_ROLLUP)
+        self.pivot = None # PivotTable du filtre courant, toutes activités
+        self.view.card_pivot.set_level(self.pivot_level)
+        self.view.card_pivot.chk_rollup.setChecked(self.pivot_rollup)
+        
+        # Filtres courants (valeurs par défaut). Les dates des modes relatifs ("Aujourd'hui"...)
+        # sont recalculées à chaque requête ; seule la plage choisie en mode "Période" est gardée
         today = date.today()
-        start = today - timedelta(days=7)
         self.current_mode = "Période"
-        self.current_dates = (start, today)
+        self.period_dates = (today - timedelta(days=7), today)
+        # Dernier mode choisi, restauré sans émettre de changement de filtre (une seule requête)
+        mode = self.settings.get(FILTER_MODE)
+        if mode != self.current_mode and self.view.set_filter_mode(mode):
+            self.current_mode = mode
+        self.current_dates = self.dates_for_mode(self.current_mode, self.period_dates)
+        
+        # Requêtes des graphiques exécutées hors du thread de l'interface (annulables)
+        self.runner = QueryRunner(self.model)
+        self.runner.result_ready.connect(self.on_query_result)
+        self.runner.query_failed.connect(self.on_query_failed)
+        
+        # Chronos en cours (non enregistrés) ajoutés aux derniers résultats, sans nouvelle requête :
+        # seul l'enregistrement d'une session relance les requêtes
+        self.live_source = None # ChronoPresenter dont on lit les chronos
+        self.progression_layout = (None, None, None) # (niveau, premier jour, dernier jour) du graphique affiché
+        self.charts_pending = False # Résultats attendus : ils compteront peut-être déjà une session en cours
+        self.live_timer = QTimer()
+        self.live_timer.setSingleShot(True)
+        self.live_timer.setTimerType(Qt.PreciseTimer)
+        self.live_timer.timeout.connect(self.update_live_overlay)
+        self.view.updates.shown.connect(self.update_live_overlay)
         
         # Connecter les signaux de la vue
 
         self.view.global_filter_changed.connect(self.on_global_filter_changed)
         self.view.project_selected.connect(self.on_project_selected)
         self.view.export_requested.connect(self.on_export_csv)
+        self.view.progression_resolution_changed.connect(self.on_progression_resolution_changed)
+        self.view.pie_other_expand_requested.connect(self.on_pie_other_expand)
+        self.view.pie_rollup_changed.connect(self.on_pie_rollup_changed)
+        self.view.pie_drill_requested.connect(self.on_pie_drill)
+        self.view.scope_requested.connect(self.on_scope_selected)
+        self.view.calendar_year_requested.connect(self.on_calendar_year)
+        self.view.timeline_window_requested.connect(self.on_timeline_window)
+        self.view.pivot_level_changed.connect(self.on_pivot_level)
+        self.view.pivot_rollup_changed.connect(self.on_pivot_rollup)
         
         # Chargement initial
         self.refresh()
@@ -87,95 +162,429 @@ class AnalysesPresenter:
         
     def refresh(self):
         # Charge les données de référence et raffraichit les graphes
+        self.follow_today()
         self.load_reference_data()
         self._refresh_charts()
+        self.reset_calendar()
+        self.load_timeline()
+
+    def follow_today(self):
+        """
+        Date changée depuis le dernier chargement (passage de minuit) : la chronologie qui finissait
+        l'ancien jour et le calendrier de l'ancienne année avancent jusqu'à aujourd'hui.
+        """
+        today, previous = date.today(), self.today
+        if today == previous:
+            return
+        self.today = today
+        first_day, days = self.timeline_window
+        if first_day + timedelta(days=days - 1) == previous:
+            self.timeline_window = (today - timedelta(days=days - 1), days)
+        if self.calendar_year == previous.year:
+            self.calendar_year = today.year
 
     def load_reference_data(self):
         # 1. Récupérer la liste des projets
         projects = self.model.get_projects() # list of (id, nom, desc, date)
         # On extrait juste (id, nom) pour la vue
         project_choices = [(p[0], p[1]) for p in projects]
-        self.view.set_projects_list(project_choices)
+        self.current_project_id = self.view.set_projects_list(project_choices, self.current_project_id)
         
-        # 2. Récupérer activités 
-        activities = self.model.get_activities() 
-        
-        # 3. Préparer la map des couleurs
-        all_colors = self.model.get_all_colors() 
-        
-        color_db_map = {c[0]: c[2] for c in all_colors} 
-        act_map = {}
-        for a in activities:
-            act_map[a[0]] = {'lib': a[1], 'pid': a[2], 'cid': a[3]}
-            
-        name_to_color_map = {}
-        DEFAULT_COLORS = ["#4facfe", "#43e97b", "#fa709a", "#667eea", "#ff0844", "#fccb90"]
-        
-        def get_color(aid):
-            if aid not in act_map: return "#cccccc"
-            data = act_map[aid]
-            cid, pid = data['cid'], data['pid']
-            if cid and cid in color_db_map: return color_db_map[cid]
-            if pid and pid in act_map:
-                p_cid = act_map[pid]['cid']
-                if p_cid and p_cid in color_db_map: return color_db_map[p_cid]
-                return DEFAULT_COLORS[pid % len(DEFAULT_COLORS)]
-            return DEFAULT_COLORS[aid % len(DEFAULT_COLORS)]
-
-        for aid, data in act_map.items():
-            name_to_color_map[data['lib']] = get_color(aid)
-            
-        # Stocker la color map dans self pour la réutiliser
-        self.current_color_map = name_to_color_map
+        # 2. Libellés et couleurs des activités (caches partagés, relus seulement après une modification) :
+        # les graphiques reçoivent des ids et ne résolvent les libellés qu'au rendu
+        parent_ids = {node.id for node in self.catalog.roots() if self.catalog.has_children(node.id)}
+        self.activity_info = (self.catalog.labels(), self.colors.colors_by_id(), parent_ids)
+        if self.pie_parent is not None and self.catalog.node(self.pie_parent) is None:
+            self.pie_parent = None # Parent détaillé supprimé
+        if self.scope_id is not None and self.catalog.node(self.scope_id) is None:
+            self.scope_id = None # Activité choisie supprimée
 
     def _refresh_charts(self):
         """Met à jour tous les graphiques avec le projet courant et dates globales"""
         pid = self.current_project_id
         mode = self.current_mode
+        # Les modes relatifs suivent le jour courant (la page a pu rester ouverte après minuit)
+        self.current_dates = self.dates_for_mode(mode, self.period_dates)
         dates = self.current_dates
+        scope = self.scope_id
+        pivot_level = self.pivot_level
         
-        # Historique
-        history_data = self.model.get_filtered_history(mode, dates, project_id=pid)
+        max_bars = self.view.card_week.max_bars()
         
-        # Graphique Hebdo (ou mensuel selon période)
-        progression_data = self.model.get_filtered_progression(mode, dates, project_id=pid)
+        def query(db):
+            # Historique (toutes activités : filtré en mémoire selon l'activité choisie)
+            history_data = db.get_filtered_history(mode, dates, project_id=pid)
+            
+            # Graphique Hebdo (ou mensuel selon période), granularité adaptée à la largeur du graphique.
+            # Tant que le graphique n'a pas sa largeur réelle, il est demandé au premier redimensionnement
+            progression_data = layout = None
+            if max_bars is not None:
+                progression_data = db.get_filtered_progression(mode, dates, activity_id=scope, project_id=pid,
+                                                               max_buckets=max_bars)
+                # Découpage du graphique d'évolution, pour y placer la session en cours
+                layout = db.get_progression_layout(mode, dates, activity_id=scope, project_id=pid,
+                                                   max_buckets=max_bars)
+            
+            # Hiérarchie : une seule requête groupée sur la période sélectionnée
+            hierarchy = db.get_hierarchy_totals(mode, dates, project_id=pid)
+            
+            # Répartition : TOP_K activités classées en SQL, le reste regroupé dans "Autres"
+            pie_data = pie_query(db)
+            
+            # Semaine type : bornes des sessions agrégées par créneau, par activité
+            heatmap = db.get_week_heatmap(mode, dates, project_id=pid)
+            
+            # Tableau croisé : intervalles pré-agrégés de la pyramide, toutes activités
+            pivot = db.get_pivot(mode, dates, project_id=pid, level=pivot_level)
+            return history_data, progression_data, hierarchy, heatmap, layout, pivot, pie_data
+        
+        pie_query = self.pie_query()
         
-        # Pie Chart
-        # Le Pie chart est souvent "Global" mais ici on lui applique le filtre global s'il est cohérent
-        # ou alors on garde la logique "Répartition sur la période sélectionnée"
-        pie_data = self.model.get_filtered_distribution(mode, dates, project_id=pid)
+        # Ces résultats remplacent ceux des demandes partielles encore en attente
+        if max_bars is not None:
+            self.runner.cancel("progression")
+        self.runner.cancel("pivot")
+        self.runner.cancel("pie")
+        self.runner.cancel("pie_other")
+        self.charts_pending = True
+        self.runner.submit("charts", query)
+
+    def on_query_result(self, channel, generation, result):
+        # Une demande plus récente a pu être faite pendant l'acheminement du résultat
+        if not self.runner.is_current(channel, generation):
+            return
+        if channel == "charts":
+            self.history_rows, progression_data, self.hierarchy, self.heatmap, layout, pivot, pie_data = result
+            if layout is not None:
+                self.progression_layout = layout
+            if pivot.level == self.pivot_level: # Sinon, la demande "pivot" du nouvel intervalle est en cours
+                self.pivot = pivot
+            self.charts_pending = False
+            self.view.update_history(self.scoped_history(), progression_data, pie_data, self.activity_info,
+                                     self.drilled_label())
+            self.update_hierarchy_view()
+            self.update_heatmap_view()
+            self.update_calendar_view()
+            self.update_timeline_view()
+            self.update_pivot_view()
+            self.update_live_overlay()
+        elif channel == "progression":
+            progression_data, self.progression_layout = result
+            self.view.update_progression(progression_data)
+            self.update_live_overlay()
+        elif channel in ("calendar", "calendar_prefetch"):
+            self.calendar_years.update(result)
+            # L'année affichée, ou la précédente (série commencée avant le 1er janvier)
+            if self.calendar_year in result or self.calendar_year - 1 in result:
+                self.update_calendar_view()
+        elif channel == "timeline":
+            self.timeline = result
+            self.update_timeline_view()
+        elif channel == "pivot":
+            self.pivot = result
+            self.update_pivot_view()
+        elif channel == "pie":
+            self.view.update_pie(result, self.drilled_label())
+            self.update_live_overlay()
+        elif channel == "pie_other":
+            self.view.expand_pie_other(result)
+
+    def on_query_failed(self, channel, generation, message):
+        if channel == "charts":
+            self.charts_pending = False
+        print(f"Erreur lors du calcul des analyses ({channel}) : {message}")
+
+    def set_live_source(self, chrono_presenter):
+        """Chronos dont le temps en cours est superposé aux graphiques."""
+        self.live_source = chrono_presenter
+        chrono_presenter.timers_changed.connect(self.update_live_overlay)
+        self.update_live_overlay()
+
+    def live_matches_filters(self, timer):
+        """Vrai si la session en cours serait comptée par les filtres courants (projet, période)."""
+        pid = self.current_project_id
+        if pid and pid != "all" and timer.project_id != pid:
+            return False
+        if self.scope_id is not None and not self.catalog.in_family(timer.act_id, self.scope_id):
+            return False
+        started_at = timer.clock.started_at
+        if started_at is None:
+            return False
+        day = started_at.date()
+        if self.current_mode == "Aujourd'hui":
+            return day == date.today()
+        dates = self.current_dates
+        if isinstance(dates, (tuple, list)) and len(dates) >= 2:
+            return dates[0] <= day <= dates[1]
+        return True
+
+    def live_bucket(self, started_at):
+        """Intervalle du graphique d'évolution où la session en cours sera comptée (date de début)."""
+        level = self.progression_layout[0]
+        if level is None:
+            return None
+        if level == "hour":
+            return started_at.strftime("%H")
+        return bucket_key(started_at.date(), level)
+
+    def update_live_overlay(self):
+        """
+        Ajoute le temps des chronos en cours à la barre et à la part de leur activité.
+        Reprogrammé à chaque changement de seconde, tant que la page est affichée.
+        """
+        timers = list(self.live_source.timers.values()) if self.live_source else []
+        if not self.charts_pending:
+            live_bars = {}
+            live_slices = {}
+            for timer in timers:
+                if not self.live_matches_filters(timer):
+                    continue
+                seconds = timer.clock.elapsed_seconds()
+                key = self.live_bucket(timer.clock.started_at)
+                if key is not None:
+                    per_act = live_bars.setdefault(key, {})
+                    per_act[timer.act_id] = per_act.get(timer.act_id, 0) + seconds
+                slice_id = self.pie_slice_id(timer.act_id)
+                if slice_id is not None:
+                    live_slices[slice_id] = live_slices.get(slice_id, 0) + seconds
+            self.view.update_live(live_bars, live_slices)
         
-        self.view.update_history(history_data, progression_data, pie_data, self.current_color_map)
+        delays = [t.clock.ms_until_next_second() for t in timers if t.clock.running]
+        if delays and is_on_screen(self.view):
+            self.live_timer.start(min(delays))
+        else:
+            self.live_timer.stop()
+
+    def on_progression_resolution_changed(self, max_bars):
+        """Largeur du graphique modifiée : seul le graphique d'évolution est recalculé (depuis la pyramide en mémoire)."""
+        self.refresh_progression(max_bars)
+
+    def refresh_progression(self, max_bars):
+        mode, dates, pid, scope = self.current_mode, self.current_dates, self.current_project_id, self.scope_id
+        self.runner.submit("progression", lambda db: (
+            db.get_filtered_progression(mode, dates, activity_id=scope, project_id=pid, max_buckets=max_bars),
+            db.get_progression_layout(mode, dates, activity_id=scope, project_id=pid, max_buckets=max_bars)))
+
+    def pie_family(self):
+        """Activité dont la répartition détaille la famille : parent détaillé, sinon activité choisie."""
+        return self.pie_parent if self.pie_parent is not None else self.scope_id
+
+    def pie_query(self, offset=0):
+        """
+        Requête de la répartition pour les filtres courants (regroupée, détaillée ou par famille) :
+        TOP_K activités à partir du rang `offset`, les suivantes regroupées dans "Autres".
+        """
+        mode, dates, pid = self.current_mode, self.current_dates, self.current_project_id
+        # Détail d'une famille : l'activité et ses sous-activités ; sinon toutes, regroupées ou non
+        activity_id = self.pie_family()
+        rollup = self.pie_rollup and activity_id is None
+        top_k = self.view.card_pie.TOP_K
+        return lambda db: db.get_distribution_top_k(mode, dates, activity_id=activity_id, project_id=pid,
+                                                    top_k=top_k, offset=offset, rollup=rollup)
+
+    def pie_slice_id(self, act_id):
+        """Part de la répartition où compter une activité (None si elle n'y figure pas)."""
+        family = self.pie_family()
+        if family is not None:
+            return act_id if self.catalog.in_family(act_id, family) else None
+        if self.pie_rollup:
+            node = self.catalog.node(act_id)
+            if node is not None and node.parent_id is not None:
+                return node.parent_id
+        return act_id
+
+    def drilled_label(self):
+        family = self.pie_family()
+        return self.catalog.label(family) if family is not None else None
+
+    def scoped_history(self):
+        """Sessions du filtre courant limitées à la famille de l'activité choisie."""
+        if self.scope_id is None:
+            return self.history_rows
+        family = self.hierarchy.family(self.scope_id) if self.hierarchy else {self.scope_id}
+        return [row for row in self.history_rows if row[4] in family]
+
+    def update_hierarchy_view(self):
+        rings = self.hierarchy.rings() if self.hierarchy else []
+        label = self.catalog.label(self.scope_id) if self.scope_id is not None else None
+        self.view.update_hierarchy(rings, self.scope_id, label)
+
+    def scope_family(self):
+        """Ids de l'activité choisie et de ses descendantes, None pour la vue d'ensemble."""
+        if self.scope_id is None:
+            return None
+        return self.hierarchy.family(self.scope_id) if self.hierarchy else {self.scope_id}
+
+    def update_heatmap_view(self):
+        """Semaine type de toutes les activités, ou de la famille choisie (déduite en mémoire)."""
+        if self.heatmap is None:
+            return
+        self.view.update_heatmap(self.heatmap.matrix(self.scope_family()))
+
+    def calendar_query(self, years):
+        pid = self.current_project_id
+        return lambda db: {y: YearCalendar(y, db.get_daily_totals(date(y, 1, 1), date(y + 1, 1, 1), project_id=pid))
+                           for y in years}
+
+    def load_calendar(self):
+        """Affiche l'année choisie (depuis le cache si possible) et précharge ses voisines."""
+        year = self.calendar_year
+        if year in self.calendar_years:
+            self.runner.cancel("calendar")
+            self.update_calendar_view()
+        else:
+            self.runner.submit("calendar", self.calendar_query([year]))
+        current_year = date.today().year
+        neighbours = [y for y in (year - 1, year + 1) if y <= current_year and y not in self.calendar_years]
+        if neighbours:
+            self.runner.submit("calendar_prefetch", self.calendar_query(neighbours))
+
+    def update_calendar_view(self):
+        """Calendrier de toutes les activités, ou de la famille choisie (déduit en mémoire)."""
+        calendar = self.calendar_years.get(self.calendar_year)
+        if calendar is None:
+            return
+        family = self.scope_family()
+        totals = calendar.totals(family)
+        previous = self.calendar_years.get(self.calendar_year - 1)
+        stats = calendar_stats(totals, self.calendar_year, date.today(),
+                               previous.totals(family) if previous else None)
+        self.view.update_calendar(self.calendar_year, totals, stats)
+
+    def on_calendar_year(self, year):
+        if year > date.today().year or year == self.calendar_year:
+            return
+        self.calendar_year = year
+        self.load_calendar()
+
+    def reset_calendar(self):
+        """Sessions ou projet modifiés : les années en cache sont relues."""
+        self.calendar_years = {}
+        self.runner.cancel("calendar_prefetch")
+        self.load_calendar()
+
+    def load_timeline(self):
+        first_day, days = self.timeline_window
+        pid = self.current_project_id
+        start = datetime.combine(first_day, datetime.min.time())
+        end = start + timedelta(days=days)
+        self.runner.submit("timeline", lambda db: DayTimeline(first_day, days,
+                                                              db.get_sessions_between(start, end, project_id=pid)))
+
+    def update_timeline_view(self):
+        """Chronologie de toutes les activités, ou de la famille choisie (filtrée en mémoire)."""
+        if self.timeline is None:
+            return
+        self.view.update_timeline(self.timeline.for_activities(self.scope_family()))
+
+    def on_timeline_window(self, first_day, days):
+        if (first_day, days) == self.timeline_window:
+            return
+        self.timeline_window = (first_day, days)
+        self.load_timeline()
+
+    def update_pivot_view(self):
+        """Tableau croisé de toutes les activités ou de la famille choisie, regroupé par parent si demandé."""
+        if self.pivot is None:
+            return
+        table = self.pivot.for_activities(self.scope_family())
+        if self.pivot_rollup and self.hierarchy:
+            table = table.rolled_up(self.hierarchy.parent_of)
+        self.view.update_pivot(table)
+
+    def on_pivot_level(self, level):
+        """Autre intervalle de colonnes : seule la pyramide (déjà en mémoire côté requêtes) est interrogée."""
+        self.pivot_level = level
+        self.settings.set(PIVOT_LEVEL, level)
+        mode, dates, pid = self.current_mode, self.current_dates, self.current_project_id
+        self.runner.submit("pivot", lambda db: db.get_pivot(mode, dates, project_id=pid, level=level))
+
+    def on_pivot_rollup(self, enabled):
+        self.pivot_rollup = enabled
+        self.settings.set(PIVOT_ROLLUP, enabled)
+        self.update_pivot_view()
+
+    def refresh_pie(self):
+        """Seule la répartition change (regroupement, détail, portée) : elle seule est recalculée."""
+        if self.charts_pending:
+            return # Le résultat attendu tiendra compte du nouvel état
+        self.runner.cancel("pie_other")
+        self.runner.submit("pie", self.pie_query())
+
+    def on_scope_selected(self, act_id):
+        """
+        Clic dans la hiérarchie : les cartes sont limitées à la famille de l'activité (None : vue d'ensemble).
+        Sessions, anneaux et semaine type sont déduits des agrégats en mémoire ;
+        seules la répartition et l'évolution (depuis la pyramide déjà construite) sont recalculées.
+        """
+        if act_id == self.scope_id:
+            return
+        self.scope_id = act_id
+        self.pie_parent = None
+        if self.charts_pending or self.hierarchy is None:
+            self._refresh_charts()
+            return
+        self.view.update_activity_list(self.scoped_history())
+        self.refresh_pie()
+        self.update_hierarchy_view()
+        self.update_heatmap_view()
+        self.update_calendar_view()
+        self.update_timeline_view()
+        self.update_pivot_view()
+        max_bars = self.view.card_week.max_bars()
+        if max_bars is not None:
+            self.refresh_progression(max_bars)
+        self.update_live_overlay()
+
+    def on_pie_rollup_changed(self, enabled):
+        self.pie_rollup = enabled
+        self.pie_parent = None
+        self.settings.set(PIE_ROLLUP, enabled)
+        self.refresh_pie()
+
+    def on_pie_drill(self, parent_id):
+        """Clic sur une part regroupée : détail de ses sous-activités ; parent_id None : retour."""
+        if parent_id is None and self.pie_parent is None and self.scope_id is not None:
+            # Répartition limitée par la hiérarchie : "Retour" revient à la vue d'ensemble
+            self.on_scope_selected(None)
+            return
+        self.pie_parent = parent_id
+        self.refresh_pie()
+
+    def on_pie_other_expand(self, offset):
+        """Clic sur "Autres" : seconde requête, chargée à la demande, pour la page suivante d'activités."""
+        self.runner.submit("pie_other", self.pie_query(offset))
 
     def on_project_selected(self, project_id):
         self.current_project_id = project_id
         # On garde les dates actuelles
         self._refresh_charts()
+        self.reset_calendar()
+        self.load_timeline()
 
     def on_global_filter_changed(self, mode, dates):
         """Gère le changement de filtre global et calcule les dates selon le mode."""
         self.current_mode = mode
+        if mode == "Période":
+            self.period_dates = dates
+        self.settings.set(FILTER_MODE, mode)
         
-        # Calculer les dates selon le mode
+        self._refresh_charts()
+
+    @staticmethod
+    def dates_for_mode(mode, dates):
+        """Plage (début, fin) couverte par un mode de filtre ; None pour le mode Global."""
+        today = date.today()
         if mode == "Aujourd'hui":
-            today = date.today()
-            self.current_dates = (today, today)
+            return (today, today)
         elif mode == "Une semaine":
-            today = date.today()
-            week_ago = today - timedelta(days=7)
-            self.current_dates = (week_ago, today)
+            return (today - timedelta(days=7), today)
         elif mode == "Un mois":
-            today = date.today()
-            month_ago = today - timedelta(days=30)
-            self.current_dates = (month_ago, today)
+            return (today - timedelta(days=30), today)
         elif mode == "Cette année":
-            today = date.today()
-            year_start = date(today.year, 1, 1)
-            self.current_dates = (year_start, today)
+            return (date(today.year, 1, 1), today)
         elif mode == "Période":
             # Utiliser les dates fournies par la vue
-            self.current_dates = dates
+            return dates
         else:  # Global
-            self.current_dates = None
-        
-        self._refresh_charts()
+            return None
@@ -0,0 +1,98 @@
+"""
+Catalogue des activités en mémoire, partagé par tous les présentateurs.
+La table activites est lue en une requête, puis relue seulement après une écriture
+(data_version) : un clic sur une bulle ou une sélection dans l'arbre n'exécute aucune requête.
+"""
+
+
+class ActivityNode:
+    """Une activité du catalogue."""
+    __slots__ = ("id", "label", "parent_id", "color_id", "visible")
+
+    def __init__(self, act_id, label, parent_id, color_id, visible):
+        self.id = act_id
+        self.label = label
+        self.parent_id = parent_id
+        self.color_id = color_id
+        self.visible = bool(visible)
+
+
+class ActivityCatalog:
+    """Activités par id, enfants par parent, ensemble des visibles et compteurs."""
+
+    def __init__(self, model):
+        self.model = model
+        self.version = None
+        self.nodes = {} # id -> ActivityNode, dans l'ordre de la table
+        self.children_by_parent = {} # id parent -> liste des enfants
+        self.root_nodes = [] # activités sans parent
+        self.visible = set() # ids marqués visibles (vide : toutes les bulles sont affichées)
+
+    def sync(self):
+        """Relit la table si elle a été modifiée. Retourne la version chargée."""
+        version = self.model.data_version("activites")
+        if version != self.version:
+            self.version = version
+            self._load(self.model.get_activity_nodes())
+        return self.version
+
+    def _load(self, rows):
+        self.nodes = {}
+        self.children_by_parent = {}
+        self.root_nodes = []
+        self.visible = set()
+        for row in rows:
+            node = ActivityNode(*row)
+            self.nodes[node.id] = node
+            if node.visible:
+                self.visible.add(node.id)
+            if node.parent_id is None:
+                self.root_nodes.append(node)
+            else:
+                self.children_by_parent.setdefault(node.parent_id, []).append(node)
+
+    def all(self):
+        self.sync()
+        return list(self.nodes.values())
+
+    def node(self, act_id):
+        self.sync()
+        return self.nodes.get(act_id)
+
+    def label(self, act_id):
+        node = self.node(act_id)
+        return node.label if node else None
+
+    def labels(self):
+        """id -> libellé de toutes les activités."""
+        self.sync()
+        return {act_id: node.label for act_id, node in self.nodes.items()}
+
+    def roots(self):
+        self.sync()
+        return list(self.root_nodes)
+
+    def children(self, parent_id):
+        self.sync()
+        return list(self.children_by_parent.get(parent_id, ()))
+
+    def children_count(self, parent_id):
+        self.sync()
+        return len(self.children_by_parent.get(parent_id, ()))
+
+    def has_children(self, parent_id):
+        return self.children_count(parent_id) > 0
+
+    def in_family(self, act_id, root_id):
+        """Vrai si l'activité est root_id ou l'une de ses descendantes."""
+        self.sync()
+        while act_id is not None:
+            if act_id == root_id:
+                return True
+            node = self.nodes.get(act_id)
+            act_id = node.parent_id if node else None
+        return False
+
+    def visible_ids(self):
+        self.sync()
+        return set(self.visible)
@@ -3,26 +3,44 @@ Présentateur du chronomètre.
 Gère la logique métier du chronomètre, des projets et des activités.
 """
 
-from PySide6.QtCore import QTimer, QObject, Qt
-from PySide6.QtWidgets import QDialog, QVBoxLayout, QCheckBox, QDialogButtonBox, QScrollArea, QWidget, QLabel
+import time
+
+from PySide6.QtCore import QTimer, QObject, Qt, Signal
+from PySide6.QtWidgets import QApplication, QDialog, QVBoxLayout, QCheckBox, QDialogButtonBox, QScrollArea, QWidget, QLabel
+
+from models.timing import ActivityTimer, NS_PER_SECOND
+from vues.visibility import is_on_screen
 
 class ChronoPresenter(QObject):
     """
     Présentateur pour la vue du chronomètre.
     Gère le démarrage, l'arrêt, la pause et la sauvegarde des sessions de travail.
     """
-    def __init__(self, view, model):
+    DEPENDS_ON = ("activites", "couleurs", "projets")
+
+    timers_changed = Signal() # Chrono démarré, mis en pause, repris ou arrêté
+    sessions_saved = Signal() # Sessions enregistrées : les pages qui les affichent doivent être rechargées
+
+    CHECKPOINT_INTERVAL_NS = 30 * NS_PER_SECOND # Au plus une écriture du journal toutes les 30 s en cours de session
+
+    def __init__(self, view, model, shortcuts, catalog, colors):
         super().__init__()
         self.view = view
         self.model = model
-        
+        self.shortcuts = shortcuts # ShortcutRegistry partagé avec les réglages
+        self.catalog = catalog # ActivityCatalog partagé
+        self.colors = colors # ColorService partagé
+        
+        # Chronos en cours (slot du journal -> ActivityTimer) ; celui affiché au centre est focused_slot.
+        # Le temps écoulé vient des horloges ; un unique timer ne sert qu'à rafraîchir l'affichage,
+        # à chaque changement de seconde (recalé à chaque tick, donc sans dérive)
+        self.timers = {}
+        self.focused_slot = None
         self.timer = QTimer()
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.PreciseTimer)
         self.timer.timeout.connect(self.tick)
         
-        self.total_seconds = 0
-        self.running = False
-        self.current_task_id = None
-        self.current_task_name = None
         self.current_project_id = None # ID du projet sélectionné
         
         # Connexions UI
@@ -33,31 +51,28 @@ class ChronoPresenter(QObject):
         self.view.btn_delete_project.clicked.connect(self.delete_project)
         self.view.list_projects.itemClicked.connect(self.on_project_selected)
         
+        # Connexions liste des chronos en cours
+        self.view.timers_panel.timer_clicked.connect(self.focus_timer)
+        self.view.timers_panel.toggle_requested.connect(self.toggle_timer)
+        self.view.timers_panel.stop_requested.connect(lambda slot: self.stop_timers([slot]))
+        self.view.timers_panel.stop_all_requested.connect(self.stop_all_timers)
+        
+        # Retour à l'écran du chrono : repeinture immédiate et reprise des ticks à la seconde
+        self.view.updates.shown.connect(self.tick)
+        
         # Connexion Gestion Affichage
         self.view.btn_manage_display.clicked.connect(self.open_display_dialog)
             
         self.load_projects()
         self.load_bubbles()
         
-        # Charger configuration raccourcis
+        # Charger configuration raccourcis (et suivre les modifications faites dans les réglages)
         self.update_shortcuts_config()
+        self.shortcuts.changed.connect(self.update_shortcuts_config)
 
-    def update_shortcuts_config(self):
-        # 1. Defaults (Doit matcher ce qui est dans SettingsPresenter)
-        actions = {
-            "PAUSE_RESUME": "Space",
-            "STOP_TIMER": "Esc"
-        }
-        for i in range(10):
-            idx_str = str(i+1) if i < 9 else "0"
-            actions[f"BUBBLE_{i}"] = f"Ctrl+{idx_str}"
-            
-        # 2. Overrides
-        overrides = self.model.get_shortcut_overrides()
-        if overrides:
-            actions.update(overrides)
-            
-        self.view.set_shortcuts_config(actions)
+    def update_shortcuts_config(self, *_):
+        """Transmet à la vue les tables de répartition du registre (aucune lecture en base)."""
+        self.view.set_shortcut_table(self.shortcuts.by_combo, self.shortcuts.prefixes)
 
     def load_projects(self):
         self.view.list_projects.clear()
@@ -131,64 +146,27 @@ class ChronoPresenter(QObject):
 
 
     def load_bubbles(self):
-        # Récupérer toutes les activités et les couleurs
-        all_activities = self.model.get_activities() # (id, libelle, parent_id, color_id)
-        all_colors = self.model.get_all_colors() # (id, nom, hex)
-        
-        # Récupérer les visibilités
-        visible_ids = self.model.get_visible_activity_ids()
-        
-        # Map ID Couleur -> Hex
-        color_map = {c[0]: c[2] for c in all_colors}
-        
-        # Couleurs par défaut (si aucune couleur définie)
-        DEFAULT_COLORS = ["#4facfe", "#43e97b", "#fa709a", "#667eea", "#ff0844", "#fccb90"]
-        
-        # 1. Identifier les parents
-        hierarchy = {}
-        
-        # D'abord les parents
-        for a in all_activities:
-            act_id, label, p_id, c_id = a
-            
-            if p_id is None:
-                # Filtrage : Si des activités sont marquées visibles, on filtre. Sinon on montre tout
-                if visible_ids and act_id not in visible_ids:
-                    continue
-
-                # Résolution couleur
-                if c_id and c_id in color_map:
-                    color_hex = color_map[c_id]
-                else:
-                    color_hex = DEFAULT_COLORS[act_id % len(DEFAULT_COLORS)]
-                    
-                hierarchy[act_id] = {'id': act_id, 'label': label, 'color': color_hex, 'children': []}
-                
-        # Ensuite les enfants
-        for a in all_activities:
-            act_id, label, p_id, c_id = a
+        # Activités et visibilités lues dans le catalogue partagé
+        visible_ids = self.catalog.visible_ids()
+        
+        data_for_view = []
+        for parent in self.catalog.roots():
+            # Filtrage : Si des activités sont marquées visibles, on filtre. Sinon on montre tout
+            if visible_ids and parent.id not in visible_ids:
+                continue
             
-            if p_id is not None and p_id in hierarchy:
-                # Résolution couleur
-                if c_id and c_id in color_map:
-                    color_hex = color_map[c_id]
-                else:
-                    # Héritage parent (qui a déjà une couleur par défaut ou définie)
-                    color_hex = hierarchy[p_id]['color']
-                    
-                hierarchy[p_id]['children'].append({'id': act_id, 'label': label, 'color': color_hex})
-        
-        # Limitation 10 enfants max par parent
-        for p_data in hierarchy.values():
-            if len(p_data['children']) > 10:
-                p_data['children'] = p_data['children'][:10]
-        
-        data_for_view = list(hierarchy.values())
+            # Couleur propre ou héritée du parent
+            children = [{'id': c.id, 'label': c.label, 'color': self.colors.activity_hex(c.id)}
+                        for c in self.catalog.children(parent.id)]
+            data_for_view.append({'id': parent.id, 'label': parent.label,
+                                  'color': self.colors.activity_hex(parent.id), 'children': children})
+        
+        # Pas de limite ici : la vue pagine l'anneau et ne crée que les bulles affichées
         self.view.set_activities(data_for_view, self.handle_bubble_click)
 
     def open_display_dialog(self):
         from vues.chrono import SelectionDialog
-        dialog = SelectionDialog(self.view, "Sélection des activités (Max 10)")
+        dialog = SelectionDialog(self.view, "Sélection des activités")
         # dialog.setMinimumWidth(300) # Géré par SelectionDialog
         # dialog.setMinimumHeight(400)
         
@@ -201,16 +179,14 @@ class ChronoPresenter(QObject):
         container.setObjectName("dialog_container")
         vbox = QVBoxLayout(container)
         
-        activities = self.model.get_activities()
-        visible_ids = self.model.get_visible_activity_ids()
+        visible_ids = self.catalog.visible_ids()
         
         # On ne liste que les parents pour le choix
-        parents = [a for a in activities if a[2] is None]
         checkboxes = []
         
-        for p in parents:
-            p_id = p[0]
-            p_label = p[1]
+        for p in self.catalog.roots():
+            p_id = p.id
+            p_label = p.label
             
             cb = QCheckBox(p_label)
            
@@ -220,9 +196,6 @@ class ChronoPresenter(QObject):
             cb.setProperty("act_id", p_id)
             checkboxes.append(cb)
             vbox.addWidget(cb)
-            
-            # Gestion du max 10
-            cb.stateChanged.connect(lambda state, c=cb: self.check_limit(checkboxes))
 
         vbox.addStretch()
         scroll.setWidget(container)
@@ -234,60 +207,55 @@ class ChronoPresenter(QObject):
         btn_box.rejected.connect(dialog.reject)
         layout.addWidget(btn_box)
         
-        self.check_limit(checkboxes) # Init state check
-        
         if dialog.exec() == QDialog.Accepted:
             selected_ids = [cb.property("act_id") for cb in checkboxes if cb.isChecked()]
             self.model.set_visible_activities(selected_ids)
             self.load_bubbles()
 
-    def check_limit(self, checkboxes):
-        checked = [cb for cb in checkboxes if cb.isChecked()]
-        count = len(checked)
-        
-        # Si >= 10, on désactive les non-cochés
-        full = count >= 10
-        
-        for cb in checkboxes:
-            if not cb.isChecked():
-                cb.setEnabled(not full)
-                
-
     def handle_bubble_click(self, act_id, name, is_parent):
         """Dispatche l'action selon que c'est un parent ou un enfant"""
         
         if is_parent:
-            # On vérifie si ce parent a des enfants en BDD
-            has_children = self.model.has_children(act_id)
+            # On vérifie si ce parent a des enfants (catalogue en mémoire)
+            has_children = self.catalog.has_children(act_id)
             if has_children:
                 self.view.set_focus_parent(act_id)
                 print(f"Focus sur parent : {name}")
             else:
                 # Le parent n'a pas d'enfants (0 ou NULL) -> On le traite comme une activité
                 print(f"Parent sans enfant détecté : Lancement de {name}")
-                self.start_activity(act_id, name)
+                self.start_activity(act_id, name, parallel=self.parallel_requested())
         else:
             # C'est un enfant -> On lance le chrono
-            self.start_activity(act_id, name)
+            self.start_activity(act_id, name, parallel=self.parallel_requested())
 
+    @staticmethod
+    def parallel_requested():
+        """Maj maintenue pendant le clic : le nouveau chrono s'ajoute aux chronos en cours."""
+        return bool(QApplication.keyboardModifiers() & Qt.ShiftModifier)
 
-    def start_activity(self, act_id, name):
-        """Lance une nouvelle session (Arrête la précédente si existante)"""
-        
-        # Si une tâche est déjà select (En cours ou en Pause), on la sauvegarde et on clean
-        if self.current_task_id is not None:
+
+    def start_activity(self, act_id, name, parallel=False):
+        """
+        Lance une nouvelle session.
+        Sans parallel, la session affichée au centre est d'abord terminée et enregistrée ;
+        avec parallel (Maj+clic), elle continue à tourner à côté de la nouvelle.
+        """
+        if not parallel and self.focused_slot is not None:
              self.terminate_session()
              
-        self.current_task_id = act_id
-        self.current_task_name = name
-        self.total_seconds = 0
+        timer = ActivityTimer(self.free_slot(), act_id, name, self.current_project_id)
+        timer.clock.start()
+        self.timers[timer.slot] = timer
+        self.focused_slot = timer.slot
         
-        self.running = True
-        self.timer.start(1000)
+        self.checkpoint([timer])
+        self.schedule_tick()
         
         # Mise à jour de l'interface
         self.view.update_time("00:00:00")
         self.view.set_activity_name(name)
+        self.update_timers_panel()
         
         # Fermer le menu (reset focus)
         self.view.reset_focus()
@@ -297,58 +265,200 @@ class ChronoPresenter(QObject):
         # Focus sur la vue pour capter Echap/Espace
         self.view.setFocus()
 
+    def free_slot(self):
+        """Plus petit numéro de ligne du journal non utilisé par un chrono en cours."""
+        slot = 0
+        while slot in self.timers:
+            slot += 1
+        return slot
+
+    def focused_timer(self):
+        return self.timers.get(self.focused_slot)
+
+    @property
+    def current_task_id(self):
+        timer = self.focused_timer()
+        return timer.act_id if timer else None
+
+    @property
+    def current_task_name(self):
+        timer = self.focused_timer()
+        return timer.name if timer else None
+
+    @property
+    def running(self):
+        timer = self.focused_timer()
+        return timer is not None and timer.clock.running
+
+    @property
+    def total_seconds(self):
+        """Secondes écoulées dans la session affichée (calculées à la demande)."""
+        timer = self.focused_timer()
+        return timer.clock.elapsed_seconds() if timer else 0
+
     def handle_center_button(self):
         """Gère le clic sur le bouton central OU ESPACE (Pause / Reprendre)"""
-        if self.current_task_id is None:
+        if self.focused_slot is None:
             return # Rien à pauser si pas de tache
+        self.toggle_timer(self.focused_slot)
 
-        if self.running:
-            # Mettre en pause
-            self.running = False
-            self.timer.stop()
-            print(f"Pause activité : {self.current_task_name}")
+    def toggle_timer(self, slot):
+        """Met en pause ou reprend un chrono."""
+        timer = self.timers.get(slot)
+        if timer is None:
+            return
+
+        if timer.clock.running:
+            timer.clock.pause()
+            print(f"Pause activité : {timer.name}")
         else:
-            # Reprendre
-            self.running = True
-            self.timer.start(1000)
-            print(f"Reprise activité : {self.current_task_name}")
-            
+            timer.clock.resume()
+            print(f"Reprise activité : {timer.name}")
+        
+        self.checkpoint([timer])
+        self.schedule_tick()
         self.update_display() # Mettre à jour état bouton / status accueil
+        self.update_timers_panel()
+
+    def focus_timer(self, slot):
+        """Affiche un des chronos en cours au centre."""
+        timer = self.timers.get(slot)
+        if timer is None:
+            return
+        self.focused_slot = slot
+        self.view.set_activity_name(timer.name)
+        self.update_display()
+        self.update_timers_panel()
 
     def terminate_session(self):
-        """Arrêt définitif et sauvegarde (Appelé par Echap ou changement d'activité)"""
-        # On arrête tout
-        self.running = False
-        self.timer.stop()
+        """Arrêt définitif et sauvegarde du chrono affiché (Appelé par Echap ou changement d'activité)"""
+        if self.focused_slot is None:
+            return
+        self.stop_timers([self.focused_slot])
+
+    def stop_all_timers(self):
+        """Arrête et enregistre tous les chronos en cours."""
+        self.stop_timers(list(self.timers))
+
+    def stop_timers(self, slots):
+        """Arrête les chronos donnés et les enregistre en une seule transaction."""
+        finished = []
+        for slot in slots:
+            timer = self.timers.pop(slot, None)
+            if timer is None:
+                continue
+            duration = timer.clock.stop()
+            # La session est datée de son début réel ; l'enregistrement la retire aussi du journal
+            finished.append((slot, timer.act_id, timer.name, duration, timer.project_id, timer.clock.started_at))
+        if not finished:
+            return
+
+        try:
+            self.model.save_active_sessions(finished)
+            for _, _, name, duration, project_id, _ in finished:
+                if duration > 0:
+                    print(f"Activité {name} enregistrée en base. Durée : {duration}s. Projet: {project_id}")
+            self.sessions_saved.emit()
+        except Exception as e:
+            print(f"Erreur lors de la sauvegarde : {e}")
+        
+        self.schedule_tick()
         self.view.btn_stop.hide()
-        
-        if self.current_task_id and self.total_seconds > 0:
-             try:
-                # Ajout du project_id ici
-                self.model.save_session(self.current_task_id, self.current_task_name, self.total_seconds, self.current_project_id)
-                print(f"Activité {self.current_task_name} enregistrée en base. Durée : {self.total_seconds}s. Projet: {self.current_project_id}")
-             except Exception as e:
-                 print(f"Erreur lors de la sauvegarde : {e}")
-             
-        # Réinitialisation complète de l'état
-        self.current_task_id = None
-        self.total_seconds = 0  # CORRECTION : Réinitialisation du compteur
-        self.view.update_time("00:00:00")
-        self.view.set_activity_name("")
-        
-        # Reset visuel focus
-        self.view.reset_focus()
-        
+
+        if self.focused_slot not in self.timers:
+            # Le chrono affiché est arrêté : on affiche le plus récent des chronos restants
+            self.focused_slot = max(self.timers) if self.timers else None
+            timer = self.focused_timer()
+            self.view.set_activity_name(timer.name if timer else "")
+            
+            # Reset visuel focus
+            self.view.reset_focus()
+            
         # Reset accueil (remise à zero si stop) ou juste update status
         self.update_display()
-        if hasattr(self, 'accueil_presenter') and self.accueil_presenter:
-             self.accueil_presenter.update_chrono_state("00:00:00", "En pause")
+        self.update_timers_panel()
+
+    def displays_on_screen(self):
+        """Vrai si le chrono ou son aperçu sur l'accueil est visible (page affichée, fenêtre non réduite)."""
+        views = [self.view]
+        if getattr(self, 'accueil_presenter', None):
+            views.append(self.accueil_presenter.view)
+        return any(is_on_screen(view) for view in views)
+
+    def schedule_tick(self):
+        """
+        Un seul timer pour tous les chronos : il est programmé juste après le prochain
+        changement de seconde affichée parmi les chronos en cours. Si aucun affichage n'est
+        visible, il ne se réveille que pour le prochain point de sauvegarde du journal.
+        """
+        running = [t for t in self.timers.values() if t.clock.running]
+        if not running:
+            self.timer.stop()
+        elif self.displays_on_screen():
+            self.timer.start(min(t.clock.ms_until_next_second() for t in running))
+        else:
+            now = time.monotonic_ns()
+            due_ns = min(t.last_checkpoint_ns + self.CHECKPOINT_INTERVAL_NS for t in running) - now
+            self.timer.start(max(0, -(-due_ns // 1_000_000)))
 
     def tick(self):
-        self.total_seconds += 1
+        self.schedule_tick()
         self.update_display()
-        # Mettre à jour l'accueil si possible
-        self.update_chrono_in_accueil()
+        self.update_timers_panel(times_only=True)
+        
+        # Points de sauvegarde regroupés : pas d'écriture à chaque seconde, un seul commit pour tous les chronos
+        now = time.monotonic_ns()
+        due = [t for t in self.timers.values()
+               if t.clock.running and now - t.last_checkpoint_ns >= self.CHECKPOINT_INTERVAL_NS]
+        if due:
+            self.checkpoint(due)
+
+    def checkpoint(self, timers):
+        """Écrit l'état des chronos dans le journal active_session (reprise après un arrêt brutal)."""
+        try:
+            self.model.checkpoint_active_sessions([t.journal_row() for t in timers])
+        except Exception as e:
+            print(f"Erreur lors du point de sauvegarde : {e}")
+        now = time.monotonic_ns()
+        for timer in timers:
+            timer.last_checkpoint_ns = now
+
+    def restore_timers(self, rows):
+        """
+        Reprend les chronos retrouvés dans le journal au démarrage.
+        rows : lignes de get_active_sessions (slot, id_act, nom, id_projet, début, durée, en_cours).
+        """
+        restored = []
+        for slot, act_id, name, project_id, started_at, duration, running in rows:
+            timer = ActivityTimer(slot, act_id, name, project_id)
+            timer.clock.restore(started_at, duration * NS_PER_SECOND, running)
+            self.timers[slot] = timer
+            restored.append(timer)
+            print(f"Reprise de la session interrompue : {name} ({duration}s)")
+        if not restored:
+            return
+        
+        self.focused_slot = restored[-1].slot
+        self.view.set_activity_name(restored[-1].name)
+        self.checkpoint(restored)
+        self.schedule_tick()
+        self.update_display()
+        self.update_timers_panel()
+
+    def update_timers_panel(self, times_only=False):
+        """Met à jour la liste des chronos en cours (seulement les temps qui ont changé si times_only)."""
+        if not times_only:
+            self.view.set_running_timers([(t.slot, t.name, t.clock.running, t.slot == self.focused_slot)
+                                          for t in sorted(self.timers.values(), key=lambda t: t.slot)])
+            self.timers_changed.emit()
+        changed = {}
+        for timer in self.timers.values():
+            seconds = timer.clock.elapsed_seconds()
+            if seconds != timer.shown_seconds or not times_only:
+                timer.shown_seconds = seconds
+                changed[timer.slot] = self.format_seconds(seconds)
+        if changed:
+            self.view.update_running_times(changed)
 
     def update_chrono_in_accueil(self):
         if hasattr(self, 'accueil_presenter') and self.accueil_presenter:
@@ -359,20 +469,30 @@ class ChronoPresenter(QObject):
     
     def set_accueil_presenter(self, accueil_presenter):
         self.accueil_presenter = accueil_presenter
+        accueil_presenter.view.updates.shown.connect(self.tick)
 
     
     def refresh(self):
-        """Recharge toutes les données (Projets, Bulles, Raccourcis)"""
+        """Recharge toutes les données (Projets, Bulles)"""
         self.load_projects()
         self.load_bubbles()
-        self.update_shortcuts_config()
 
-    def update_display(self):
-        h, m = divmod(self.total_seconds, 3600)
+    @staticmethod
+    def format_seconds(seconds):
+        h, m = divmod(seconds, 3600)
         m, s = divmod(m, 60)
-        text = f"{h:02d}:{m:02d}:{s:02d}"
+        return f"{h:02d}:{m:02d}:{s:02d}"
+
+    def update_display(self):
+        text = self.format_seconds(self.total_seconds)
         self.view.update_time(text)
         
         if hasattr(self, 'accueil_presenter') and self.accueil_presenter:
-            status = f"En cours : {self.current_task_name}" if self.running else "En pause"
+            if self.focused_slot is None:
+                status = "En pause"
+            else:
+                status = f"En cours : {self.current_task_name}" if self.running else "En pause"
+                others = len(self.timers) - 1
+                if others > 0:
+                    status += f" (+{others} en parallèle)"
             self.accueil_presenter.update_chrono_state(text, status)
@@ -0,0 +1,103 @@
+"""
+Résolution des couleurs des activités, partagée par les pages Chrono, Activités et Analyses.
+La table couleurs n'est relue que lorsqu'elle a changé (data_version), les activités viennent
+du catalogue partagé ; les couleurs effectives (héritées du parent ou par défaut) sont calculées une fois par activité.
+"""
+
+from vues.palette import qcolor, qbrush
+
+# Couleurs par défaut (si aucune couleur définie), choisies selon l'identifiant de l'activité
+DEFAULT_COLORS = ["#4facfe", "#43e97b", "#fa709a", "#667eea", "#ff0844", "#fccb90"]
+UNKNOWN_COLOR = "#cccccc" # Activité supprimée ou inconnue
+
+
+class ColorService:
+    """Correspondances id <-> hex et couleur effective de chaque activité, mises en cache."""
+
+    def __init__(self, model, catalog):
+        self.model = model
+        self.catalog = catalog # ActivityCatalog partagé
+        self.colors_version = None
+        self.activities_version = None
+        self.hex_by_id = {} # id couleur -> code hexadécimal
+        self.id_by_hex = {} # code hexadécimal en minuscules -> id couleur
+        self.effective = {} # id activité -> code hexadécimal (héritage résolu)
+        self.id_map = None # id activité -> code hexadécimal (graphiques des analyses)
+
+    def _sync(self):
+        """Recharge ce qui a été modifié depuis la dernière lecture."""
+        colors_version = self.model.data_version("couleurs")
+        if colors_version != self.colors_version:
+            self.colors_version = colors_version
+            self.hex_by_id = {}
+            self.id_by_hex = {}
+            for c_id, _, hex_code in self.model.get_all_colors(): # (id, nom, hex)
+                self._add(c_id, hex_code)
+            self.effective = {}
+            self.id_map = None
+
+        activities_version = self.catalog.sync()
+        if activities_version != self.activities_version:
+            self.activities_version = activities_version
+            self.effective = {}
+            self.id_map = None
+
+    def _add(self, color_id, hex_code):
+        self.hex_by_id[color_id] = hex_code
+        self.id_by_hex.setdefault(hex_code.lower(), color_id)
+
+    def hex_for_id(self, color_id):
+        self._sync()
+        return self.hex_by_id.get(color_id)
+
+    def id_for_hex(self, hex_code):
+        """Id de la couleur enregistrée sous ce code (casse ignorée), None si elle n'existe pas."""
+        self._sync()
+        return self.id_by_hex.get(hex_code.lower())
+
+    def ensure_color_id(self, hex_code):
+        """Id de la couleur, créée en base si nécessaire."""
+        if not hex_code:
+            return None
+        color_id = self.id_for_hex(hex_code)
+        if color_id is None:
+            color_id = self.model.add_color(hex_code, hex_code)
+            if color_id is not None:
+                # Écriture connue : mise à jour en place plutôt que relecture de la table
+                self._add(color_id, hex_code)
+                self.colors_version = self.model.data_version("couleurs")
+        return color_id
+
+    def activity_hex(self, act_id):
+        """Couleur propre de l'activité, sinon celle de son parent, sinon une couleur par défaut."""
+        self._sync()
+        return self._resolve(act_id)
+
+    def _resolve(self, act_id):
+        hex_code = self.effective.get(act_id)
+        if hex_code is not None:
+            return hex_code
+        node = self.catalog.nodes.get(act_id)
+        if node is None:
+            return UNKNOWN_COLOR
+        hex_code = self.hex_by_id.get(node.color_id) if node.color_id else None
+        if hex_code is None:
+            if node.parent_id is not None and node.parent_id in self.catalog.nodes:
+                hex_code = self._resolve(node.parent_id)
+            else:
+                hex_code = DEFAULT_COLORS[act_id % len(DEFAULT_COLORS)]
+        self.effective[act_id] = hex_code
+        return hex_code
+
+    def activity_qcolor(self, act_id):
+        return qcolor(self.activity_hex(act_id))
+
+    def activity_brush(self, act_id):
+        return qbrush(self.activity_hex(act_id))
+
+    def colors_by_id(self):
+        """Id -> couleur effective de toutes les activités (même objet tant que rien ne change)."""
+        self._sync()
+        if self.id_map is None:
+            self.id_map = {act_id: self._resolve(act_id) for act_id in self.catalog.nodes}
+        return self.id_map
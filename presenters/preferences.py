@@ -0,0 +1,75 @@
+"""
+Magasin des réglages de l'application, lu une seule fois au démarrage.
+Chaque réglage est une clé typée (Setting) : nom, type Python, valeur par défaut et table
+de stockage. Les lectures se font en mémoire ; une modification est écrite aussitôt en base
+puis diffusée par le signal changed, sans jamais relire les tables.
+"""
+
+from PySide6.QtCore import QObject, Signal
+
+
+class Setting:
+    """Clé typée d'un réglage."""
+
+    def __init__(self, name, kind, default, table="preferences"):
+        self.name = name
+        self.kind = kind # bool, int ou str
+        self.default = default
+        self.table = table # "preferences" (clé/valeur) ou "raccourcis" (séquences clavier)
+
+    def decode(self, text):
+        if self.kind is bool:
+            return text == "1"
+        return self.kind(text)
+
+    def encode(self, value):
+        if self.kind is bool:
+            return "1" if value else "0"
+        return str(value)
+
+
+# Préférences de l'interface
+FILTER_MODE = Setting("analyses.filter_mode", str, "Période")
+PIE_ROLLUP = Setting("analyses.pie_rollup", bool, False)
+PIVOT_LEVEL = Setting("analyses.pivot_level", str, "week")
+PIVOT_ROLLUP = Setting("analyses.pivot_rollup", bool, False)
+SIDEBAR_COLLAPSED = Setting("dashboard.sidebar_collapsed", bool, False)
+
+
+class SettingsStore(QObject):
+    """Valeurs des réglages en mémoire, enregistrées en base à chaque modification."""
+
+    changed = Signal(str, object) # nom du réglage, nouvelle valeur
+
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+        # Textes bruts de chaque table, décodés à la première lecture de chaque clé
+        self.raw = {
+            "preferences": model.get_preferences(),
+            "raccourcis": model.get_shortcut_overrides(),
+        }
+        self.values = {} # nom -> valeur décodée
+
+    def get(self, setting):
+        if setting.name not in self.values:
+            text = self.raw[setting.table].get(setting.name)
+            self.values[setting.name] = setting.default if text is None else setting.decode(text)
+        return self.values[setting.name]
+
+    def set(self, setting, value):
+        """Enregistre une nouvelle valeur. Retourne False si elle était déjà en place."""
+        if not isinstance(value, setting.kind):
+            raise TypeError(f"{setting.name} attend une valeur de type {setting.kind.__name__}")
+        if self.get(setting) == value:
+            return False
+
+        text = setting.encode(value)
+        if setting.table == "raccourcis":
+            self.model.update_shortcut(setting.name, text)
+        else:
+            self.model.set_preference(setting.name, text)
+        self.raw[setting.table][setting.name] = text
+        self.values[setting.name] = value
+        self.changed.emit(setting.name, value)
+        return True
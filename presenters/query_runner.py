@@ -0,0 +1,98 @@
+"""
+Exécution des requêtes d'analyse hors du thread de l'interface.
+Les requêtes passent par une connexion SQLite dédiée, dans un thread unique. Chaque demande
+reçoit un jeton de génération par canal : une nouvelle demande sur le même canal rend la
+précédente obsolète, et le gestionnaire de progression SQLite interrompt alors sa requête
+en cours au lieu de la laisser se terminer. Les résultats obsolètes ne sont jamais livrés.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from PySide6.QtCore import QObject, Signal, QCoreApplication
+
+from models.database import DatabaseManager
+
+# Nombre d'instructions de la machine virtuelle SQLite entre deux vérifications du jeton
+PROGRESS_STEPS = 1000
+
+# Tables dont dépendent les caches en mémoire de la connexion de travail (pyramides)
+CACHED_TABLES = ("sessions", "activites", "projets")
+
+
+class QueryRunner(QObject):
+    result_ready = Signal(str, int, object) # canal, génération, résultat
+    query_failed = Signal(str, int, str) # canal, génération, message
+
+    def __init__(self, main_db):
+        super().__init__()
+        self.main_db = main_db
+        self.generations = {} # canal -> dernière génération demandée
+        self.worker_db = None # DatabaseManager propre au thread de travail
+        self.seen_versions = None
+        self.closed = False
+
+        # Une base en mémoire n'est pas partageable entre connexions : exécution directe
+        self.synchronous = main_db.db_name == ":memory:"
+        self.executor = None if self.synchronous else ThreadPoolExecutor(max_workers=1, thread_name_prefix="analyses")
+
+        app = QCoreApplication.instance()
+        if app:
+            app.aboutToQuit.connect(self.shutdown)
+
+    def submit(self, channel, fn):
+        """
+        Programme fn(db) et retourne son jeton de génération.
+        Le résultat est émis par result_ready seulement s'il n'a pas été remplacé entre-temps.
+        """
+        generation = self.generations.get(channel, 0) + 1
+        self.generations[channel] = generation
+        if self.synchronous:
+            self._run(channel, generation, fn, self.main_db)
+        elif not self.closed:
+            self.executor.submit(self._run, channel, generation, fn)
+        return generation
+
+    def cancel(self, channel):
+        """Rend obsolète la demande en cours sur ce canal."""
+        self.generations[channel] = self.generations.get(channel, 0) + 1
+
+    def is_current(self, channel, generation):
+        return not self.closed and self.generations.get(channel) == generation
+
+    def shutdown(self):
+        """Rend toutes les demandes obsolètes (la requête en cours est interrompue)."""
+        self.closed = True
+        if self.executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _worker(self):
+        """Connexion du thread de travail, ouverte à la première utilisation."""
+        if self.worker_db is None:
+            self.worker_db = DatabaseManager(self.main_db.db_name, setup=False)
+        # Invalide les caches dérivés si la connexion principale a écrit depuis
+        versions = self.main_db.data_version(*CACHED_TABLES)
+        if versions != self.seen_versions:
+            self.worker_db._invalidate_progression_cache()
+            self.seen_versions = versions
+        return self.worker_db
+
+    def _run(self, channel, generation, fn, db=None):
+        if not self.is_current(channel, generation):
+            return # Remplacée avant même d'avoir commencé
+
+        db = db or self._worker()
+        # Une valeur non nulle interrompt la requête SQLite en cours (OperationalError)
+        db.conn.set_progress_handler(lambda: not self.is_current(channel, generation), PROGRESS_STEPS)
+        try:
+            result = fn(db)
+        except Exception as e:
+            # Requête interrompue (OperationalError) ou erreur quelconque : le canal est libéré
+            # dans tous les cas, et seule la demande courante est signalée
+            if self.is_current(channel, generation):
+                self.query_failed.emit(channel, generation, f"{type(e).__name__}: {e}")
+            return
+        finally:
+            db.conn.set_progress_handler(None, 0)
+
+        if self.is_current(channel, generation):
+            self.result_ready.emit(channel, generation, result)
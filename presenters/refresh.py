@@ -0,0 +1,52 @@
+"""
+Rafraîchissement conditionnel des pages du tableau de bord.
+Une page n'est rechargée que si les tables dont dépend son présentateur ont été modifiées
+depuis son dernier chargement, ou si la date a changé (les filtres "Aujourd'hui", "Une semaine"
+et les calendriers dépendent du jour courant), et plusieurs demandes dans le même tour de boucle
+d'événements ne donnent lieu qu'à un seul rechargement.
+"""
+
+from datetime import date
+
+from PySide6.QtCore import QTimer
+
+
+class PageRefresher:
+    """
+    Associe une fonction de rechargement aux tables dont elle dépend (et au jour courant).
+    tables : DEPENDS_ON du présentateur, les tables lues par son refresh(). La page n'est rechargée
+    que si l'une d'elles a changé ou si la date a changé. Le registre partagé des raccourcis prévient
+    lui-même les pages : la table raccourcis n'y figure donc jamais (DEPENDS_ON vide pour les Réglages).
+    """
+
+    def __init__(self, db, refresh_fn, tables):
+        self.db = db
+        self.refresh_fn = refresh_fn
+        self.tables = tuple(tables)
+        # Le présentateur vient de charger ses données à sa construction
+        self.seen_version = self.version()
+        self.pending = False
+        self.forced = False
+
+    def version(self):
+        """Clé du dernier chargement : versions des tables et jour courant."""
+        return self.db.data_version(*self.tables), date.today()
+
+    def is_dirty(self):
+        return self.version() != self.seen_version
+
+    def request(self, force=False):
+        """Programme un rechargement à la fin du tour de boucle courant (regroupé)."""
+        self.forced = self.forced or force
+        if self.pending:
+            return
+        self.pending = True
+        QTimer.singleShot(0, self.run)
+
+    def run(self):
+        self.pending = False
+        forced, self.forced = self.forced, False
+        if not forced and not self.is_dirty():
+            return
+        self.seen_version = self.version()
+        self.refresh_fn()
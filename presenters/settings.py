@@ -1,28 +1,25 @@
 from PySide6.QtWidgets import QColorDialog, QListWidgetItem, QMessageBox
 from PySide6.QtCore import Qt, QObject
 
+from presenters.shortcuts import ACTIONS
+from vues.key_combos import parse_sequence
+
 class SettingsPresenter(QObject):
+    DEPENDS_ON = ()
 
-    def __init__(self, view, model):
+    def __init__(self, view, model, shortcuts):
         super().__init__()
         self.view = view
         self.model = model
+        self.shortcuts = shortcuts # ShortcutRegistry partagé avec le chrono
+        self.items = {} # code de l'action -> ligne de la liste
         
-        # Actions définies par le système (Action Code -> Defaut)
-        self.ACTIONS = {
-            "PAUSE_RESUME": {"label": "Pause / Reprendre", "default": "Space"},
-            "STOP_TIMER":   {"label": "Arrêter Timer", "default": "Esc"},
-        }
-        # Ajout dynamique des bulles
-        for i in range(1, 11):
-             idx = i-1
-             if i < 10:
-                 self.ACTIONS[f"BUBBLE_{idx}"] = {"label": f"Sélectionner Bulle {i}", "default": f"Ctrl+{i}"}
-             else:
-                 self.ACTIONS[f"BUBBLE_{idx}"] = {"label": f"Sélectionner Bulle 10", "default": "Ctrl+0"}
+        # Actions définies par le système (Action Code -> libellé, défaut)
+        self.ACTIONS = ACTIONS
 
         self.view.btn_edit_shortcut.clicked.connect(self.edit_shortcut)
         self.view.btn_del_shortcut.hide() # On ne supprime pas les actions système pour l'instant
+        self.shortcuts.changed.connect(self.on_shortcut_changed)
 
         # Initial load
         self.load_data()
@@ -34,12 +31,11 @@ class SettingsPresenter(QObject):
         from PySide6.QtWidgets import QTreeWidgetItem
         
         self.view.list_shortcuts.clear()
-        
-        overrides = self.model.get_shortcut_overrides()
+        self.items = {}
         
         for code, details in self.ACTIONS.items():
             label = details["label"]
-            shortcut = overrides.get(code, details["default"])
+            shortcut = self.shortcuts.sequence_text(code)
             
             # Item avec 2 colonnes
             item = QTreeWidgetItem([label, shortcut])
@@ -49,6 +45,13 @@ class SettingsPresenter(QObject):
             # item.setTextAlignment(1, Qt.AlignCenter) 
             
             self.view.list_shortcuts.addTopLevelItem(item)
+            self.items[code] = item
+
+    def on_shortcut_changed(self, code, sequence):
+        """Seule la ligne de l'action modifiée est mise à jour."""
+        item = self.items.get(code)
+        if item is not None:
+            item.setText(1, sequence)
 
     def edit_shortcut(self):
         selected_items = self.view.list_shortcuts.selectedItems()
@@ -72,40 +75,31 @@ class SettingsPresenter(QObject):
                 return
 
             # --- Détection de doublons ---
-            # 1. Obtenir l'état actuel de tous les raccourcis
-            overrides = self.model.get_shortcut_overrides()
-            
-            # 2. Chercher qui utilise déjà cette séquence
-            conflict_code = None
-            
-            for action_code, action_details in self.ACTIONS.items():
-                # Le raccourci actuel pour cette action est soit l'override, soit le défaut
-                current_seq = overrides.get(action_code, action_details["default"])
-                
-                if current_seq == new_sequence:
-                    conflict_code = action_code
-                    break
+            # Séquence identique, ou l'une commençant par l'autre (séquences à plusieurs accords)
+            combos = parse_sequence(new_sequence)
+            conflict_code = self.shortcuts.conflict(code, combos)
             
-            # 3. Si conflit trouvé (et ce n'est pas nous-mêmes)
-            if conflict_code and conflict_code != code:
+            if conflict_code:
                 conflict_label = self.ACTIONS[conflict_code]["label"]
+                conflict_sequence = self.shortcuts.sequence_text(conflict_code)
                 
                 reply = QMessageBox.question(
                     self.view, 
                     "Raccourci déjà utilisé", 
-                    f"Le raccourci '{new_sequence}' est déjà utilisé pour '{conflict_label}'.\n\nVoulez-vous le remplacer ?\n(L'ancien raccourci sera supprimé)",
+                    f"Le raccourci '{new_sequence}' entre en conflit avec '{conflict_sequence}' ({conflict_label}).\n\nVoulez-vous le remplacer ?\n(L'ancien raccourci sera supprimé)",
                     QMessageBox.Yes | QMessageBox.No
                 )
                 
                 if reply == QMessageBox.No:
                     return # Annuler tout
                 
-                # Si Oui, on "vide" le raccourci de l'action en conflit
-                self.model.update_shortcut(conflict_code, "")
+                # Si Oui, on "vide" le raccourci des actions en conflit
+                while conflict_code:
+                    self.shortcuts.set_sequence(conflict_code, "")
+                    conflict_code = self.shortcuts.conflict(code, combos)
             
-            # 4. Sauvegarder le nouveau raccourci
-            self.model.update_shortcut(code, new_sequence)
-            self.load_shortcuts()
+            # Sauvegarder le nouveau raccourci (diffusé au chrono par le registre)
+            self.shortcuts.set_sequence(code, new_sequence)
 
     def delete_shortcut(self):
         pass # Disactivé pour le moment
@@ -0,0 +1,108 @@
+"""
+Registre des raccourcis clavier, partagé par les pages Chrono et Réglages.
+Chaque séquence texte (ex : "Ctrl+1" ou "Ctrl+K, Ctrl+S") est normalisée une seule fois
+en tuple d'entiers (touche | modificateurs, un entier par accord) : retrouver l'action d'une
+frappe, détecter un conflit ou reconnaître le début d'une séquence à plusieurs accords
+se fait par simple accès à un dictionnaire. Les modifications sont enregistrées en base
+(via le magasin de réglages) et diffusées par le signal changed, sans relecture de la table.
+"""
+
+from PySide6.QtCore import QObject, Signal
+
+from presenters.preferences import Setting
+from vues.key_combos import parse_sequence, format_sequence
+
+
+def _default_actions():
+    """Actions système : code -> {libellé, séquence par défaut}."""
+    actions = {
+        "PAUSE_RESUME": {"label": "Pause / Reprendre", "default": "Space"},
+        "STOP_TIMER":   {"label": "Arrêter Timer", "default": "Esc"},
+        "PREV_PAGE":    {"label": "Page de bulles précédente", "default": "PgUp"},
+        "NEXT_PAGE":    {"label": "Page de bulles suivante", "default": "PgDown"},
+    }
+    # Ajout des bulles
+    for i in range(1, 11):
+        actions[f"BUBBLE_{i - 1}"] = {"label": f"Sélectionner Bulle {i}", "default": f"Ctrl+{i % 10}"}
+    return actions
+
+
+ACTIONS = _default_actions()
+
+# Clé typée de la séquence de chaque action (table raccourcis)
+SHORTCUT_SETTINGS = {code: Setting(code, str, details["default"], table="raccourcis")
+                     for code, details in ACTIONS.items()}
+
+
+class ShortcutRegistry(QObject):
+    """Séquence de chaque action et tables de recherche inverses, tenues à jour à chaque modification."""
+
+    changed = Signal(str, str) # code de l'action, nouvelle séquence ("" si aucune)
+
+    def __init__(self, settings):
+        super().__init__()
+        self.settings = settings # SettingsStore
+        self.sequences = {} # code -> tuple d'accords
+        self.by_combo = {} # tuple d'accords -> code (table de répartition des frappes)
+        self.prefixes = {} # début strict d'une séquence -> codes concernés (séquences à plusieurs accords)
+
+        for code, setting in SHORTCUT_SETTINGS.items():
+            self.sequences[code] = parse_sequence(settings.get(setting))
+        self._rebuild_indexes()
+
+    def _rebuild_indexes(self):
+        self.by_combo = {}
+        self.prefixes = {}
+        for code, combos in self.sequences.items():
+            self._index(code, combos)
+
+    def _index(self, code, combos):
+        if not combos:
+            return
+        self.by_combo[combos] = code
+        for n in range(1, len(combos)):
+            self.prefixes.setdefault(combos[:n], set()).add(code)
+
+    def _unindex(self, code, combos):
+        if self.by_combo.get(combos) == code:
+            del self.by_combo[combos]
+        for n in range(1, len(combos)):
+            codes = self.prefixes.get(combos[:n], set())
+            codes.discard(code)
+            if not codes:
+                self.prefixes.pop(combos[:n], None)
+
+    def label(self, code):
+        return ACTIONS[code]["label"]
+
+    def sequence_text(self, code):
+        return format_sequence(self.sequences.get(code, ()))
+
+    def action_for(self, combos):
+        return self.by_combo.get(combos)
+
+    def is_prefix(self, combos):
+        """Vrai si combos est le début d'une séquence plus longue (attendre l'accord suivant)."""
+        return combos in self.prefixes
+
+    def conflict(self, code, combos):
+        """
+        Action (autre que code) dont la séquence entre en collision avec combos : identique,
+        commençant par combos, ou dont combos commence par elle. None si aucune.
+        """
+        candidates = [self.by_combo.get(combos), *self.prefixes.get(combos, ())]
+        candidates += [self.by_combo.get(combos[:n]) for n in range(1, len(combos))]
+        for other in candidates:
+            if other is not None and other != code:
+                return other
+        return None
+
+    def set_sequence(self, code, text):
+        """Change la séquence d'une action, l'enregistre en base et prévient les pages abonnées."""
+        combos = parse_sequence(text)
+        self._unindex(code, self.sequences.get(code, ()))
+        self.sequences[code] = combos
+        self._index(code, combos)
+        text = format_sequence(combos)
+        self.settings.set(SHORTCUT_SETTINGS[code], text)
+        self.changed.emit(code, text)
@@ -0,0 +1,114 @@
+"""
+Profilage du démarrage de TaskTime.
+Activé par l'option --profile-startup[=fichier.json] : chaque phase nommée (imports,
+chargement du style, base de données, construction des vues...) est chronométrée avec
+perf_counter_ns, ainsi que l'instant de la première image, puis le tout est écrit en JSON.
+Ce module n'importe rien d'autre que la bibliothèque standard pour pouvoir être chargé
+avant PySide6 et mesurer son import.
+"""
+
+import os
+import sys
+import json
+import time
+from contextlib import contextmanager
+
+DEFAULT_OUTPUT = "startup_profile.json"
+SETTLE_MS = 500 # Délai après la première image avant l'écriture (redimensionnements différés, préchauffage)
+
+
+class StartupProfiler:
+    """Chronomètre les phases du démarrage. Désactivé, toutes les méthodes sont sans effet."""
+
+    def __init__(self, enabled=False, output_path=DEFAULT_OUTPUT, quit_after=False):
+        self.enabled = enabled
+        self.output_path = output_path
+        self.quit_after = quit_after # Quitter l'application une fois le profil écrit (benchmarks)
+        self.origin_ns = time.perf_counter_ns()
+        self.phases = [] # (nom, début_ns, durée_ns)
+        self.events = [] # (nom, instant_ns)
+        self.first_paint_ns = None
+        self._paint_filter = None
+
+    @classmethod
+    def from_argv(cls, argv):
+        """Construit le profileur à partir des options --profile-startup[=chemin] et --profile-quit."""
+        enabled = False
+        output_path = DEFAULT_OUTPUT
+        quit_after = False
+        for arg in argv[1:]:
+            if arg == "--profile-startup":
+                enabled = True
+            elif arg.startswith("--profile-startup="):
+                enabled = True
+                output_path = arg.split("=", 1)[1]
+            elif arg == "--profile-quit":
+                quit_after = True
+        return cls(enabled, output_path, quit_after)
+
+    @contextmanager
+    def phase(self, name):
+        """Chronomètre le bloc sous le nom donné."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.phases.append((name, start, time.perf_counter_ns() - start))
+
+    def event(self, name):
+        """Enregistre un instant ponctuel (ex : redimensionnement différé)."""
+        if self.enabled:
+            self.events.append((name, time.perf_counter_ns()))
+
+    def watch_first_paint(self, app):
+        """Enregistre la première peinture de l'application puis écrit le profil après SETTLE_MS."""
+        if not self.enabled:
+            return
+        from PySide6.QtCore import QObject, QEvent, QTimer
+
+        profiler = self
+
+        class FirstPaintFilter(QObject):
+            def eventFilter(self, obj, event):
+                if event.type() == QEvent.Paint and profiler.first_paint_ns is None:
+                    profiler.first_paint_ns = time.perf_counter_ns()
+                    # Retrait différé : on ne modifie pas les filtres pendant leur parcours
+                    QTimer.singleShot(0, lambda: app.removeEventFilter(self))
+                    QTimer.singleShot(SETTLE_MS, profiler.finish)
+                return False
+
+        self._paint_filter = FirstPaintFilter(app)
+        app.installEventFilter(self._paint_filter)
+
+    def to_dict(self):
+        def ms(ns):
+            return round(ns / 1e6, 3)
+
+        return {
+            "python": sys.version.split()[0],
+            "platform": sys.platform,
+            "qpa_platform": os.environ.get("QT_QPA_PLATFORM"),
+            "origin_ns": self.origin_ns,
+            "phases": [
+                {"name": name, "start_ms": ms(start - self.origin_ns), "duration_ms": ms(duration)}
+                for name, start, duration in self.phases
+            ],
+            "events": [{"name": name, "at_ms": ms(at - self.origin_ns)} for name, at in self.events],
+            "first_paint_ms": ms(self.first_paint_ns - self.origin_ns) if self.first_paint_ns else None,
+            # Valeur brute (horloge monotone du système) pour les mesures inter-processus
+            "first_paint_ns": self.first_paint_ns,
+        }
+
+    def write(self):
+        with open(self.output_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def finish(self):
+        self.write()
+        print(f"Profil de démarrage écrit : {self.output_path}")
+        if self.quit_after:
+            from PySide6.QtWidgets import QApplication
+            QApplication.quit()
@@ -7,6 +7,9 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                                QListWidget, QListWidgetItem, QPushButton, QFrame)
 from PySide6.QtCore import Qt
 
+from vues.calendar_heatmap import YearCalendarWidget, format_stats
+from vues.visibility import DeferredUpdates
+
 
 class MiniChronoCard(QFrame):
     """Widget affichant un aperçu du chronomètre en cours."""
@@ -92,10 +95,36 @@ class RecapCard(QFrame):
             self.list_widget.addItem(item)
 
 
+class CalendarCard(QFrame):
+    """Version compacte du calendrier de l'année en cours, avec la série de jours actifs."""
+    def __init__(self):
+        super().__init__()
+        self.setObjectName("recap_card")
+        
+        layout = QVBoxLayout(self)
+        
+        lbl_title = QLabel("Votre année")
+        lbl_title.setObjectName("lbl_recap_title")
+        layout.addWidget(lbl_title)
+        
+        self.calendar = YearCalendarWidget(compact=True)
+        layout.addWidget(self.calendar)
+        
+        self.lbl_stats = QLabel()
+        self.lbl_stats.setObjectName("lbl_calendar_stats")
+        layout.addWidget(self.lbl_stats)
+
+    def set_data(self, year, totals, stats):
+        self.calendar.set_data(year, totals)
+        self.lbl_stats.setText(format_stats(stats))
+
+
 class AccueilView(QWidget):
     """Vue principale de la page d'accueil."""
     def __init__(self):
         super().__init__()
+        # Aperçu du chrono : mis à jour seulement quand la page est affichée
+        self.updates = DeferredUpdates(self)
         
         main_layout = QVBoxLayout(self)
         main_layout.setContentsMargins(30, 30, 30, 30)
@@ -122,12 +151,20 @@ class AccueilView(QWidget):
         content_layout.addWidget(self.recap_card, 2) # Stretch factor 2
         
         main_layout.addLayout(content_layout)
+        
+        # Bas : calendrier de l'année
+        self.calendar_card = CalendarCard()
+        main_layout.addWidget(self.calendar_card)
         main_layout.addStretch()
 
     def update_recap(self, activities):
         """Met à jour la liste des activités récentes."""
         self.recap_card.set_activities(activities)
 
+    def update_calendar(self, year, totals, stats):
+        """Met à jour le calendrier de l'année (au prochain affichage si la page est masquée)."""
+        self.updates.apply("calendar", self.calendar_card.set_data, year, totals, stats)
+
     def update_chrono(self, time_text, status_text=None):
-        """Met à jour l'affichage du chronomètre."""
-        self.mini_chrono.update_display(time_text, status_text)
+        """Met à jour l'affichage du chronomètre (au prochain affichage si la page est masquée)."""
+        self.updates.apply("chrono", self.mini_chrono.update_display, time_text, status_text)
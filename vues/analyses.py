@@ -1,12 +1,22 @@
 from datetime import date, datetime, timedelta
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QFrame, 
                                QListWidget, QListWidgetItem, QComboBox, QHBoxLayout, QDateEdit, QToolTip, 
-                               QStackedWidget, QPushButton, QScrollArea, QSizePolicy)
-from PySide6.QtGui import QPainter, QPixmap, QPainterPath, QColor, QPen
-from PySide6.QtCore import Qt, QSize, QPoint, QRect, QRectF, Signal, QDate
+                               QStackedWidget, QPushButton, QScrollArea, QSizePolicy, QCheckBox)
+from PySide6.QtGui import QPainter, QPixmap, QColor, QPen
+from PySide6.QtCore import Qt, QSize, QPoint, QPointF, QRect, QRectF, Signal, QDate, QEvent, QTimer
 import os
 import math
 
+from vues.calendar_heatmap import YearCalendarWidget, format_stats
+from vues.chart_format import JOURS_MAP, JOURS_COMPLETS, format_duration
+from vues.day_timeline import DayTimelineWidget
+from vues.hit_test import BarHitIndex, PieHitIndex
+from vues.pivot_table import PivotTableModel, PivotTableView
+from vues.sunburst import SunburstWidget
+from vues.visibility import DeferredUpdates
+from vues.week_heatmap import WeekHeatmapWidget
+from vues.palette import qcolor, qbrush, OTHER_COLOR
+
 class AnalysisCard(QFrame):
     """
     Carte simple avec un titre et une zone de contenu.
@@ -36,55 +46,321 @@ class AnalysisCard(QFrame):
     def set_content_widget(self, widget):
         self.content_layout.addWidget(widget)
 
+MOIS_MAP = ["Jan", "Fév", "Mar", "Avr", "Mai", "Juin",
+            "Juil", "Août", "Sep", "Oct", "Nov", "Déc"]
+
+
+def format_bucket_label(date_iso, nb_barres):
+    """
+    Libellé court d'un intervalle de temps pour l'axe X.
+    date_iso est "YYYY-MM-DD" (jour), "YYYY-Www" (semaine), "YYYY-MM" (mois),
+    "YYYY-Tn" (trimestre), "YYYY" (année) ou "HH" (heure).
+    """
+    # Gérer les différents formats
+    if "-T" in date_iso:
+        # Format trimestre : "2026-T1"
+        year, quarter = date_iso.split("-T")
+        return f"T{quarter} {year[2:]}"
+    elif len(date_iso) == 4 and date_iso.isdigit():
+        # Format année : "2026"
+        return date_iso
+    elif date_iso.startswith("2") and "-W" in date_iso:
+        # Format semaine : "2026-W05"
+        try:
+            year, week = date_iso.split("-W")
+            # Calculer la date du lundi de cette semaine
+            jan1 = datetime(int(year), 1, 1)
+            week_start = jan1 + timedelta(weeks=int(week)-1)
+            # Ajuster au lundi
+            week_start = week_start - timedelta(days=week_start.weekday())
+            return week_start.strftime("%d/%m")
+        except:
+            return f"S{date_iso.split('-W')[-1]}"
+    elif date_iso.count("-") == 1 and len(date_iso) == 7:
+        # Format mois : "2026-01"
+        try:
+            year, month = date_iso.split("-")
+            return MOIS_MAP[int(month)-1]
+        except:
+            return date_iso
+    else:
+        # Format date normale : "2026-02-13"
+        try:
+            dt_obj = date.fromisoformat(date_iso)
+            if nb_barres > 7:
+                return dt_obj.strftime("%d/%m")
+            return JOURS_MAP[dt_obj.weekday()]
+        except:
+            return date_iso
+
+
 class GraphiqueHebdomadaireWidget(QWidget):
+    """
+    Histogramme empilé.
+    Le graphique statique est rendu une fois dans un QPixmap (adapté au device pixel ratio)
+    et n'est reconstruit que si les données, la taille ou la palette changent.
+    Le survol est dessiné par-dessus, sans repeindre le graphique, de même que le temps
+    de la session en cours : chaque seconde, seule la zone de la barre concernée est repeinte,
+    et seulement si sa hauteur change d'au moins un pixel.
+    Les segments sont identifiés par l'id de leur activité ; libellés et couleurs ne sont
+    résolus qu'au rendu.
+    """
+    DEFAULT_COLORS = ["#6200EA", "#d500f9", "#3700B3", "#FF4081", "#7C4DFF", "#03DAC6"]
+    MARGINS = (60, 30, 20, 30) # gauche, droite, haut, bas
+    MIN_COLUMN_WIDTH = 42 # Largeur d'une colonne pour que les libellés "dd/mm" ne se chevauchent pas
+
+    # Émis quand le nombre maximal de barres affichables change (redimensionnement)
+    max_bars_changed = Signal(int)
+
     def __init__(self):
         super().__init__()
-        # self.donnees_semaine est maintenant {date: {activity: seconds}}
+        # self.donnees_semaine est maintenant {date: {id activité: seconds}}
         self.donnees_semaine = {} 
-        self.color_map = {}
+        self.color_map = {} # id activité -> code hexadécimal
+        self.labels = {} # id activité -> libellé
         self.setMinimumHeight(250)
         
         # Interaction mouse tracking
         self.setMouseTracking(True)
-        self.interactive_rects = [] # list of (QRectF, label, duration)
+        self.interactive_rects = [] # list of (QRectF, id activité, duration)
+        self.hit_index = BarHitIndex() # Segment sous la souris en O(log n)
+        self.hovered_index = None # Index dans interactive_rects du segment survolé
+
+        # Données préparées une seule fois par set_data
+        self.prepared_bars = [] # list of (libellé axe X, [(id activité, duration), ...] triés par libellé)
+        self.bar_keys = [] # Intervalle de chaque barre de prepared_bars
+        self.max_sec = 0
+
+        # Session en cours, non enregistrée : {intervalle: [(id activité, secondes), ...]}
+        self.live_bars = {}
+        self.live_columns = set() # Intervalles sans session enregistrée : colonnes vides ajoutées au rendu
+        self.live_rects = [] # (QRectF, id activité, secondes) dessinés au-dessus du rendu statique
+        self.column_tops = {} # intervalle -> (x, haut de la pile) au dernier rendu
+        self.scale = None # (scale_max, h_graph, bar_width) du dernier rendu
+
+        # Cache du rendu statique
+        self.render_cache = None
+        self.render_cache_key = None
+        # Connu au premier redimensionnement : avant la mise en page, la largeur n'est pas la largeur réelle
+        self.last_max_bars = None
+
+    def max_bars(self):
+        """Nombre de barres lisibles pour la largeur actuelle (niveau de détail visé par la requête)."""
+        m_left, m_right, _, _ = self.MARGINS
+        return max(1, int((self.width() - m_left - m_right) // self.MIN_COLUMN_WIDTH))
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        max_bars = self.max_bars()
+        if max_bars != self.last_max_bars:
+            self.last_max_bars = max_bars
+            self.max_bars_changed.emit(max_bars)
     
     def set_data(self, data):
         self.donnees_semaine = data
-        self.update()
+        self.live_columns = set(self.live_bars) - set(data)
+        self.prepare_data()
+        self.invalidate_cache()
+
+    def set_live(self, live_bars):
+        """
+        live_bars : {intervalle: {id activité: secondes}} de la session en cours.
+        L'échelle et les colonnes ne changent que rarement : le rendu statique est alors refait ;
+        sinon seuls les segments superposés sont déplacés.
+        """
+        live_bars = {key: sorted(per_act.items()) for key, per_act in live_bars.items()}
+        if live_bars == self.live_bars:
+            return
+        self.live_bars = live_bars
+
+        # Intervalle encore sans session enregistrée : une colonne vide, ajoutée ou retirée au rendu
+        live_columns = set(live_bars) - set(self.donnees_semaine)
+        columns_changed = live_columns != self.live_columns
+        if columns_changed:
+            self.live_columns = live_columns
+            self.prepare_data()
+        if columns_changed or self.scale is None or self.compute_scale(self.effective_max())[0] != self.scale[0]:
+            self.invalidate_cache()
+            return
+
+        old_rects = [rect.toAlignedRect() for rect, _, _ in self.live_rects]
+        self.live_rects = self.layout_live()
+        new_rects = [rect.toAlignedRect() for rect, _, _ in self.live_rects]
+        if new_rects != old_rects:
+            for rect in old_rects + new_rects:
+                self.update(rect.adjusted(-2, -2, 2, 2))
+
+    def effective_max(self):
+        """Plus haute barre, session en cours comprise."""
+        max_sec = self.max_sec
+        for key, segments in self.live_bars.items():
+            day_data = self.donnees_semaine.get(key, {})
+            total = sum(day_data.values()) + sum(sec for _, sec in segments)
+            if total > max_sec: max_sec = total
+        return max_sec
+
+    def layout_live(self):
+        """Rectangles des segments de la session en cours, empilés au sommet de leur barre."""
+        rects = []
+        if self.scale is None:
+            return rects
+        scale_max, h_graph, bar_width = self.scale
+        for key, segments in self.live_bars.items():
+            if key not in self.column_tops:
+                continue
+            x, top = self.column_tops[key]
+            for act_id, sec in segments:
+                bar_h = (sec / scale_max) * h_graph
+                if bar_h <= 0: continue
+                top -= bar_h
+                rects.append((QRectF(x, top, bar_width, bar_h), act_id, sec))
+        return rects
+
+    def segment_color(self, act_id, color_idx=0):
+        if act_id in self.color_map:
+            return self.get_qcolor(self.color_map[act_id])
+        return self.get_qcolor(self.DEFAULT_COLORS[color_idx % len(self.DEFAULT_COLORS)])
 
-    def set_color_map(self, colors):
+    def activity_label(self, act_id):
+        return self.labels.get(act_id, "Activité inconnue")
+
+    @staticmethod
+    def compute_scale(max_sec):
+        """Échelle adaptative : (maximum de l'axe, pas de graduation, unité) en secondes."""
+        if max_sec >= 3600:
+            return (math.ceil(max_sec / 3600) + 4) * 3600, 3600, 3600 # Heures
+        if max_sec >= 60:
+            return (math.ceil(max_sec / 60) + 4) * 60, 60, 60 # Minutes
+        return 60, 10, 1 # Secondes
+
+    format_duration = staticmethod(format_duration)
+
+    def set_activity_info(self, labels, colors):
+        """Libellés et couleurs des activités (id -> libellé, id -> code hexadécimal)."""
+        if labels == self.labels and colors == self.color_map:
+            return
+        relabeled = labels != self.labels
+        self.labels = labels
         self.color_map = colors
+        if relabeled:
+            self.prepare_data() # L'ordre des segments suit les libellés
+        self.invalidate_cache()
+
+    def prepare_data(self):
+        """Calcule le maximum, trie les segments et formate les libellés (une fois par jeu de données)."""
+        self.max_sec = 0
+        for day_data in self.donnees_semaine.values():
+            val = sum(day_data.values()) if isinstance(day_data, dict) else day_data
+            if val > self.max_sec: self.max_sec = val
+
+        dates_sorted = sorted(self.donnees_semaine.keys() | self.live_columns)
+        nb_barres = len(dates_sorted)
+        self.bar_keys = dates_sorted
+        self.prepared_bars = []
+        for date_iso in dates_sorted:
+            # Trier les segments (ordre alphabétique des libellés, l'id départage les homonymes)
+            segments = sorted(self.donnees_semaine.get(date_iso, {}).items(),
+                              key=lambda x: (self.activity_label(x[0]), x[0]))
+            self.prepared_bars.append((format_bucket_label(date_iso, nb_barres), segments))
+
+    def invalidate_cache(self):
+        self.render_cache = None
+        self.hovered_index = None
         self.update()
+
+    def get_qcolor(self, hex_code):
+        return qcolor(hex_code)
+
+    def changeEvent(self, event):
+        if event.type() in (QEvent.PaletteChange, QEvent.FontChange, QEvent.StyleChange):
+            self.invalidate_cache()
+        super().changeEvent(event)
+
+    def leaveEvent(self, event):
+        self.set_hovered(None)
+        QToolTip.hideText()
+        super().leaveEvent(event)
+
+    def set_hovered(self, index):
+        """Change le segment survolé et ne repeint que les zones concernées."""
+        if index == self.hovered_index:
+            return
+        for old_or_new in (self.hovered_index, index):
+            if old_or_new is not None and old_or_new < len(self.interactive_rects):
+                self.update(self.interactive_rects[old_or_new][0].toAlignedRect().adjusted(-3, -3, 3, 3))
+        self.hovered_index = index
         
     def mouseMoveEvent(self, event):
         pos = event.position() if hasattr(event, 'position') else event.pos()
         
-        found = False
-        for rect, label, duration in self.interactive_rects:
-            if rect.contains(pos):
-                # Format duration
-                h, r = divmod(duration, 3600)
-                m, s = divmod(r, 60)
-                if h > 0:
-                    time_str = f"{int(h)}h {int(m)}m"
-                else:
-                    time_str = f"{int(m)}m {int(s)}s"
-                
-                QToolTip.showText(event.globalPos(), f"{label}\n{time_str}", self)
-                found = True
-                break
-        
-        if not found:
-            QToolTip.hideText()
+        index = self.hit_index.find(pos.x(), pos.y())
+
+        # L'infobulle n'est mise à jour que si le segment survolé change
+        if index != self.hovered_index:
+            self.set_hovered(index)
+            if index is None:
+                QToolTip.hideText()
+            else:
+                _, act_id, duration = self.interactive_rects[index]
+                QToolTip.showText(event.globalPos(),
+                                  f"{self.activity_label(act_id)}\n{self.format_duration(duration)}", self)
+
+        # Segments de la session en cours (hors index de survol)
+        if index is None:
+            for rect, act_id, duration in self.live_rects:
+                if rect.contains(pos):
+                    QToolTip.showText(event.globalPos(),
+                                      f"{self.activity_label(act_id)} (en cours)\n{self.format_duration(duration)}", self)
+                    break
             
         super().mouseMoveEvent(event)
 
     def paintEvent(self, event):
+        dpr = self.devicePixelRatioF()
+        key = (self.width(), self.height(), dpr)
+        if self.render_cache is None or self.render_cache_key != key:
+            self.render_cache = self.render_static(dpr)
+            self.render_cache_key = key
+            self.hovered_index = None
+            self.live_rects = self.layout_live()
+
         dessinateur = QPainter(self)
+        dessinateur.drawPixmap(0, 0, self.render_cache)
+
+        # Session en cours : segments translucides au sommet de leur barre
+        if self.live_rects:
+            dessinateur.setRenderHint(QPainter.Antialiasing)
+            live_pen = QPen(QColor("#F0EDEE"), 1, Qt.DashLine)
+            for rect, act_id, _ in self.live_rects:
+                col = QColor(self.segment_color(act_id))
+                col.setAlpha(170)
+                dessinateur.setBrush(col)
+                dessinateur.setPen(live_pen)
+                dessinateur.drawRect(rect)
+
+        # Surbrillance du segment survolé (overlay)
+        if self.hovered_index is not None and self.hovered_index < len(self.interactive_rects):
+            rect = self.interactive_rects[self.hovered_index][0]
+            dessinateur.setRenderHint(QPainter.Antialiasing)
+            dessinateur.setBrush(QColor(255, 255, 255, 60))
+            dessinateur.setPen(QPen(QColor("#F0EDEE"), 1.5))
+            dessinateur.drawRect(rect)
+
+    def render_static(self, dpr):
+        """Dessine axes, grille, barres et libellés dans un QPixmap et reconstruit interactive_rects."""
+        w = self.width()
+        h = self.height()
+
+        pixmap = QPixmap(max(1, int(w * dpr)), max(1, int(h * dpr)))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.transparent)
+
+        dessinateur = QPainter(pixmap)
         dessinateur.setRenderHint(QPainter.Antialiasing)
         
         # Reset interactive zones
         self.interactive_rects = []
+        self.hit_index.clear()
         
         f = self.font()
         # Initialiser avec une taille raisonnable si le défaut est invalide
@@ -92,34 +368,12 @@ class GraphiqueHebdomadaireWidget(QWidget):
             f.setPointSize(9)
         dessinateur.setFont(f)
         
-        w = self.width()
-        h = self.height()
-        m_left, m_right, m_top, m_bot = 60, 30, 20, 30 
+        m_left, m_right, m_top, m_bot = self.MARGINS
         w_graph = w - m_left - m_right
         h_graph = h - m_top - m_bot
         
-        # Calcul du maximum
-        max_sec = 0
-        if self.donnees_semaine:
-            for day_data in self.donnees_semaine.values():
-                val = sum(day_data.values()) if isinstance(day_data, dict) else day_data
-                if val > max_sec: max_sec = val
-        
-        # Echelle adaptative
-        if max_sec >= 3600:
-            base_unit = 3600 # Heures
-            top_units = math.ceil(max_sec / 3600) + 4
-            scale_max = top_units * 3600
-            step = 3600
-        elif max_sec >= 60:
-            base_unit = 60 # Minutes
-            top_units = math.ceil(max_sec / 60) + 4
-            scale_max = top_units * 60
-            step = 60
-        else:
-            scale_max = 60 # Secondes
-            step = 10
-            base_unit = 1
+        # Echelle adaptative (la session en cours comprise, pour qu'elle tienne dans le graphique)
+        scale_max, step, base_unit = self.compute_scale(self.effective_max())
 
         # Ajustement du pas
         display_step = step
@@ -136,6 +390,7 @@ class GraphiqueHebdomadaireWidget(QWidget):
         # Grille et étiquettes Y
         grid_pen = QPen(QColor("#e0e0e0"))
         grid_pen.setStyle(Qt.DotLine)
+        text_color = QColor("#F0EDEE")
         
         label_font = dessinateur.font()
         label_font.setPointSize(8)
@@ -159,10 +414,10 @@ class GraphiqueHebdomadaireWidget(QWidget):
              # Dessiner la ligne de la grille
              if current_val > 0:
                  dessinateur.setPen(grid_pen)
-                 dessinateur.drawLine(m_left, y_pos, w - m_right, y_pos)
+                 dessinateur.drawLine(QPointF(m_left, y_pos), QPointF(w - m_right, y_pos))
                  
              # Dessiner le tiret et l'étiquette
-             dessinateur.setPen(QColor("#F0EDEE"))
+             dessinateur.setPen(text_color)
              dessinateur.drawLine(m_left - 4, int(y_pos), m_left, int(y_pos))
              
              r_lbl = QRectF(0, y_pos - 10, m_left - 6, 20)
@@ -171,44 +426,40 @@ class GraphiqueHebdomadaireWidget(QWidget):
              current_val += display_step
              
         # Dessiner les barres empilées
-        dates_sorted = sorted(self.donnees_semaine.keys())
-        nb_barres = len(dates_sorted)
-        if nb_barres == 0: return
+        self.column_tops = {}
+        self.scale = None
+        nb_barres = len(self.prepared_bars)
+        if nb_barres == 0:
+            dessinateur.end()
+            return pixmap
         
         col_width = w_graph / nb_barres
         max_bar_w = 80
         bar_width = min(col_width * 0.6, max_bar_w)
+        self.scale = (scale_max, h_graph, bar_width)
         offset_x = (col_width - bar_width) / 2
         day_font = self.font()
         if day_font.pointSize() <= 0: 
             day_font.setPointSize(8)
         dessinateur.setFont(day_font)
-        
-        jours_map = ['Lun', 'Mar', 'Mer', 'Jeu', 'Ven', 'Sam', 'Dim']
-        default_colors = ["#6200EA", "#d500f9", "#3700B3", "#FF4081", "#7C4DFF", "#03DAC6"]
+        dessinateur.setPen(Qt.NoPen)
 
-        for i, date_iso in enumerate(dates_sorted):
-            day_activities = self.donnees_semaine[date_iso] # Dict {activity: duration}
-            
+        for i, (nom_jour, segments) in enumerate(self.prepared_bars):
             # Position X
             x = m_left + (i * col_width) + offset_x
             
             # On commence en bas
             current_y_bottom = h - m_bot
             
-            # Trier les segments
-            sorted_segments = sorted(day_activities.items(), key=lambda x: x[0])
-            
             color_idx = 0
-            for act_label, duration in sorted_segments:
+            column_segments = []
+            for act_id, duration in segments:
                 if duration <= 0: continue
                 bar_h = (duration / scale_max) * h_graph
                 
                 # Couleur
-                if act_label in self.color_map:
-                    col = QColor(self.color_map[act_label])
-                else:
-                    col = QColor(default_colors[color_idx % len(default_colors)])
+                col = self.segment_color(act_id, color_idx)
+                if act_id not in self.color_map:
                     color_idx += 1
                 
                 y = current_y_bottom - bar_h
@@ -217,75 +468,164 @@ class GraphiqueHebdomadaireWidget(QWidget):
                 rect_bar = QRectF(x, y, bar_width, bar_h)
                 
                 dessinateur.setBrush(col)
-                dessinateur.setPen(Qt.NoPen)
                 dessinateur.drawRect(rect_bar)
                 
                 # Stocker pour interactivité
-                self.interactive_rects.append((rect_bar, act_label, duration))
+                column_segments.append((y, current_y_bottom, len(self.interactive_rects)))
+                self.interactive_rects.append((rect_bar, act_id, duration))
                 
                 current_y_bottom -= bar_h
+
+            self.hit_index.add_column(x, x + bar_width, column_segments)
+            self.column_tops[self.bar_keys[i]] = (x, current_y_bottom)
             
-            # Label date
-            nom_jour = date_iso
-            
-            # Gérer les différents formats
-            if date_iso.startswith("2") and "-W" in date_iso:
-                # Format semaine : "2026-W05"
-                try:
-                    year, week = date_iso.split("-W")
-                    # Calculer la date du lundi de cette semaine
-                    from datetime import datetime, timedelta
-                    jan1 = datetime(int(year), 1, 1)
-                    week_start = jan1 + timedelta(weeks=int(week)-1)
-                    # Ajuster au lundi
-                    week_start = week_start - timedelta(days=week_start.weekday())
-                    nom_jour = week_start.strftime("%d/%m")
-                except:
-                    nom_jour = f"S{week}"
-            elif date_iso.count("-") == 1 and len(date_iso) == 7:
-                # Format mois : "2026-01"
-                try:
-                    mois_map = ["Jan", "Fév", "Mar", "Avr", "Mai", "Juin", 
-                               "Juil", "Août", "Sep", "Oct", "Nov", "Déc"]
-                    year, month = date_iso.split("-")
-                    nom_jour = mois_map[int(month)-1]
-                except:
-                    nom_jour = date_iso
-            else:
-                # Format date normale : "2026-02-13"
-                try:
-                    dt_obj = date.fromisoformat(date_iso)
-                    if nb_barres > 7:
-                        nom_jour = dt_obj.strftime("%d/%m")
-                    else:
-                        nom_jour = jours_map[dt_obj.weekday()]
-                except:
-                    nom_jour = date_iso
-            
-            dessinateur.setPen(QColor("#F0EDEE"))
+        # Labels dates
+        dessinateur.setPen(text_color)
+        for i, (nom_jour, _) in enumerate(self.prepared_bars):
             r_txt = QRectF(m_left + (i * col_width), h - 20, col_width, 20)
             dessinateur.drawText(r_txt, Qt.AlignCenter, nom_jour)
 
+        dessinateur.end()
+        return pixmap
+
 class PieChartWidget(QWidget):
+    OTHER_COLOR = OTHER_COLOR # Couleur de la part "Autres"
+    other_expand_requested = Signal(int) # Clic sur "Autres" : rang à partir duquel détailler
+    drill_down_requested = Signal(int) # Clic sur une part regroupée : id de l'activité parente
+
     def __init__(self):
         super().__init__()
-        self.pie_data = [] 
+        self.pie_data = [] # (id activité, secondes) ; id None pour la part "Autres"
+        self.other_index = None # Position de la part "Autres" dans pie_data
+        self.other_count = 0 # Nombre d'activités regroupées dans "Autres"
         self.colors = ["#6200EA", "#d500f9", "#3700B3", "#FF4081", "#7C4DFF", "#03DAC6"]
-        self.color_map = {}
+        self.color_map = {} # id activité -> code hexadécimal
+        self.labels = {} # id activité -> libellé
+        self.drillable = set() # ids des parts qui regroupent des sous-activités (clic = détail)
         self.setMinimumHeight(250)
         
         # Interaction
         self.setMouseTracking(True)
-        self.interactive_slices = [] # list of (start_angle_deg, span_angle_deg, label, val)
+        self.interactive_slices = [] # list of (start_angle_deg, span_angle_deg, label, val, data_index)
+        self.hit_index = PieHitIndex() # Part sous la souris en O(log n)
+        self.hovered_slice = None
+        self.pie_total = 0
         self.pie_geometry = None # (center_QPoint, radius)
 
+        # Session en cours, non enregistrée, ajoutée aux parts sans nouvelle requête
+        self.base_total = 0
+        self.live_values = {} # id activité -> secondes
+        self.live_slices = {} # index dans pie_data -> secondes
+        self.painted_signature = None
+
     def set_data(self, data):
-        self.pie_data = data
+        """
+        data : lignes (id activité, secondes) ou (id activité, secondes, nb_activités, est_autres)
+        telles que renvoyées par get_distribution_top_k.
+        """
+        self.pie_data, self.other_index, self.other_count = self.normalize_rows(data)
+        self.base_total = sum(x[1] for x in self.pie_data)
+        self.resolve_live()
+        self.hovered_slice = None
+        self.update()
+
+    def set_live(self, live_values):
+        """
+        live_values : {id activité: secondes} de la session en cours.
+        Toutes les parts dépendent du total : le graphique n'est repeint que si un
+        pourcentage affiché ou la durée (à la minute) d'une part en cours change.
+        """
+        if live_values == self.live_values:
+            return
+        self.live_values = dict(live_values)
+        self.resolve_live()
+        if self.visual_signature() != self.painted_signature:
+            self.update()
+
+    def resolve_live(self):
+        """Rattache le temps en cours à la part de son activité, sinon à "Autres", sinon à une nouvelle part."""
+        index_by_id = {key: i for i, (key, _) in enumerate(self.pie_data) if i != self.other_index}
+        self.live_slices = {}
+        for act_id, sec in self.live_values.items():
+            i = index_by_id.get(act_id)
+            if i is None:
+                i = self.other_index
+            if i is None:
+                self.pie_data.append((act_id, 0))
+                i = index_by_id[act_id] = len(self.pie_data) - 1
+            self.live_slices[i] = self.live_slices.get(i, 0) + sec
+        self.pie_total = self.base_total + sum(self.live_slices.values())
+
+    def slice_value(self, index):
+        return self.pie_data[index][1] + self.live_slices.get(index, 0)
+
+    def visual_signature(self):
+        """Ce qui est visible du temps en cours : pourcentages au dixième, durées des parts en cours à la minute."""
+        total = self.pie_total or 1
+        return (tuple(round(self.slice_value(i) * 1000 / total) for i in range(len(self.pie_data))),
+                tuple(self.slice_value(i) // 60 for i in sorted(self.live_slices)))
+
+    @classmethod
+    def normalize_rows(cls, rows, start=0):
+        """Convertit les lignes en (id activité, secondes) et repère la part "Autres" (position, effectif)."""
+        pie_data = []
+        other_index = None
+        other_count = 0
+        for row in rows:
+            if len(row) >= 4 and row[3]:
+                other_index = start + len(pie_data)
+                other_count = row[2]
+                pie_data.append((None, row[1]))
+            else:
+                pie_data.append((row[0], row[1]))
+        return pie_data, other_index, other_count
+
+    def expand_other(self, rows):
+        """Remplace la part "Autres" par la page suivante d'activités (chargée à la demande)."""
+        if self.other_index is None:
+            return
+        index = self.other_index
+        new_rows, new_other, new_count = self.normalize_rows(rows, start=index)
+        self.pie_data = self.pie_data[:index] + new_rows + self.pie_data[index + 1:]
+        self.other_index = new_other
+        self.other_count = new_count
+        self.base_total = sum(x[1] for x in self.pie_data)
+        self.resolve_live()
+        self.hovered_slice = None
+        QToolTip.hideText()
+        self.unsetCursor()
         self.update()
 
-    def set_color_map(self, map_colors):
-        self.color_map = map_colors
+    def get_color(self, index, act_id):
+        if index == self.other_index:
+            return self.OTHER_COLOR
+        return self.color_map.get(act_id, self.colors[index % len(self.colors)])
+
+    def slice_label(self, index):
+        if index == self.other_index:
+            return f"Autres ({self.other_count})"
+        return self.labels.get(self.pie_data[index][0], "Activité inconnue")
+
+    def is_other_slice(self, slice_index):
+        if slice_index is None or self.other_index is None:
+            return False
+        return self.interactive_slices[slice_index][4] == self.other_index
+
+    def drillable_id(self, slice_index):
+        """Id de l'activité parente si la part survolée peut être détaillée, sinon None."""
+        if slice_index is None or self.is_other_slice(slice_index):
+            return None
+        act_id = self.pie_data[self.interactive_slices[slice_index][4]][0]
+        return act_id if act_id in self.drillable else None
+
+    def set_activity_info(self, labels, colors):
+        """Libellés et couleurs des activités (id -> libellé, id -> code hexadécimal)."""
+        self.labels = labels
+        self.color_map = colors
         self.update()
+
+    def set_drillable(self, ids):
+        self.drillable = set(ids)
         
     def mouseMoveEvent(self, event):
         if not self.pie_geometry or not self.interactive_slices:
@@ -297,9 +637,9 @@ class PieChartWidget(QWidget):
         
         dx = pos.x() - center.x()
         dy = pos.y() - center.y()
-        dist = math.sqrt(dx*dx + dy*dy)
         
-        if dist <= radius:
+        index = None
+        if dx*dx + dy*dy <= radius*radius:
             # Calcul de l'angle en degrés [0, 360) (0 = 3h, sens anti-horaire visuel inversé par l'axe Y)
             angle_rad = math.atan2(-dy, dx)
             angle_deg = math.degrees(angle_rad)
@@ -307,35 +647,57 @@ class PieChartWidget(QWidget):
             if angle_deg < 0:
                 angle_deg += 360
             
-            found = False
-            for start, span, label, val in self.interactive_slices:
-                diff = (angle_deg - start) % 360
-                if diff <= span:
-                    # Trouvé !
-                    total_val = sum(x[1] for x in self.pie_data)
-                    pct = (val / total_val) * 100 if total_val > 0 else 0
-                    QToolTip.showText(event.globalPos(), f"{label}\n{pct:.1f}%", self)
-                    found = True
-                    break
-            
-            if not found:
+            index = self.hit_index.find(angle_deg)
+
+        # L'infobulle n'est mise à jour que si la part survolée change
+        if index != self.hovered_slice:
+            self.hovered_slice = index
+            if index is None:
                 QToolTip.hideText()
-        else:
-             QToolTip.hideText()
+            else:
+                _, _, label, val, _ = self.interactive_slices[index]
+                pct = (val / self.pie_total) * 100 if self.pie_total > 0 else 0
+                text = f"{label}\n{pct:.1f}%"
+                if self.is_other_slice(index) or self.drillable_id(index) is not None:
+                    text += "\nCliquer pour détailler"
+                QToolTip.showText(event.globalPos(), text, self)
+            if self.is_other_slice(index) or self.drillable_id(index) is not None:
+                self.setCursor(Qt.PointingHandCursor)
+            else:
+                self.unsetCursor()
              
         super().mouseMoveEvent(event)
 
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton and self.is_other_slice(self.hovered_slice):
+            # Nombre d'activités déjà détaillées avant "Autres"
+            self.other_expand_requested.emit(self.other_index)
+            return
+        parent_id = self.drillable_id(self.hovered_slice) if event.button() == Qt.LeftButton else None
+        if parent_id is not None:
+            self.drill_down_requested.emit(parent_id)
+            return
+        super().mousePressEvent(event)
+
+    def leaveEvent(self, event):
+        self.hovered_slice = None
+        QToolTip.hideText()
+        self.unsetCursor()
+        super().leaveEvent(event)
+
     def paintEvent(self, event):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
+        self.painted_signature = self.visual_signature()
         
         # Reset interaction data
         self.interactive_slices = []
+        self.hit_index.clear()
         self.pie_geometry = None
         
         w, h = self.width(), self.height()
         
-        total = sum(i[1] for i in self.pie_data)
+        total = self.pie_total
         
         if total == 0:
              f = self.font()
@@ -385,22 +747,25 @@ class PieChartWidget(QWidget):
         f_slice.setBold(True)
         painter.setFont(f_slice)
         
-        for i, (lbl, val) in enumerate(self.pie_data):
+        for i, (act_id, _) in enumerate(self.pie_data):
+            val = self.slice_value(i)
             if val == 0: continue
+            lbl = self.slice_label(i)
             
             # Qt utilise des 1/16èmes de degré
             span_angle_deg = (val / total) * 360
             span_angle_qt = int(span_angle_deg * 16)
             start_angle_qt = int(start_angle * 16)
             
-            col_hex = self.color_map.get(lbl, self.colors[i % len(self.colors)])
-            painter.setBrush(QColor(col_hex))
+            col_hex = self.get_color(i, act_id)
+            painter.setBrush(qbrush(col_hex))
             painter.setPen(QPen(Qt.white, 2))
             
             painter.drawPie(pie_rect, start_angle_qt, span_angle_qt)
             
             # Stockage des infos pour l'interaction
-            self.interactive_slices.append((start_angle, span_angle_deg, lbl, val))
+            self.hit_index.add_slice(start_angle, span_angle_deg, len(self.interactive_slices))
+            self.interactive_slices.append((start_angle, span_angle_deg, lbl, val, i))
             
             # Affichage du pourcentage si assez d'espace
             pct = (val/total)*100
@@ -433,13 +798,15 @@ class PieChartWidget(QWidget):
         item_height = 28
         curr_y = legend_y_start
         
-        for i, (lbl, val) in enumerate(self.pie_data):
+        for i, (act_id, _) in enumerate(self.pie_data):
+            val = self.slice_value(i)
             if val == 0: continue
             if curr_y + item_height > h and is_horizontal: break
+            lbl = self.slice_label(i)
             
-            col_hex = self.color_map.get(lbl, self.colors[i % len(self.colors)])
+            col_hex = self.get_color(i, act_id)
             
-            painter.setBrush(QColor(col_hex))
+            painter.setBrush(qbrush(col_hex))
             painter.setPen(Qt.NoPen)
             painter.drawRoundedRect(QRectF(legend_x_start, curr_y + 4, 16, 16), 4, 4)
             
@@ -456,39 +823,347 @@ class PieChartWidget(QWidget):
             
             curr_y += item_height
 
+
+
 class CarteGraphiqueHebdo(AnalysisCard):
     def __init__(self):
         super().__init__("Évolution du Temps", "weekly_chart")
         self.graphique = GraphiqueHebdomadaireWidget()
         self.set_content_widget(self.graphique)
 
-    def update_color_map(self, colors):
-        self.graphique.set_color_map(colors)
+    def max_bars(self):
+        """Nombre de barres à la largeur réelle, None tant que le graphique n'a pas été disposé."""
+        return self.graphique.last_max_bars
+
+    def update_activity_info(self, labels, colors):
+        self.graphique.set_activity_info(labels, colors)
+
+    def update_live(self, live_bars):
+        self.graphique.set_live(live_bars)
 
     def update_data(self, lignes_bdd):
         donnees = {}
         
         if lignes_bdd:
-            for time_lbl, label, sec in lignes_bdd:
+            for time_lbl, act_id, sec in lignes_bdd:
                 # time_lbl est soit "YYYY-MM-DD" (jour) soit "YYYY-MM" (mois) ou "HH" (heure)
                 # On utilise time_lbl comme clé principale
                 if time_lbl not in donnees: donnees[time_lbl] = {}
-                if label not in donnees[time_lbl]: donnees[time_lbl][label] = 0
-                donnees[time_lbl][label] += sec
+                if act_id not in donnees[time_lbl]: donnees[time_lbl][act_id] = 0
+                donnees[time_lbl][act_id] += sec
         
+        # Même résultat (ex : redimensionnement sans changement de niveau) : pas de nouveau rendu
+        if donnees == self.graphique.donnees_semaine:
+            return
         self.graphique.set_data(donnees)
 
 class PieChartCard(AnalysisCard):
+    """
+    Répartition du temps par activité. Avec le regroupement, les sous-activités sont comptées
+    à leur parent ; un clic sur un parent détaille ses sous-activités, "Retour" remonte.
+    """
+    TOP_K = 8 # Activités affichées avant regroupement dans "Autres"
+    TITLE = "Répartition"
+
+    rollup_toggled = Signal(bool)
+    drill_up_requested = Signal()
+
     def __init__(self):
-        super().__init__("Répartition", "pie_chart")
+        super().__init__(self.TITLE, "pie_chart")
         self.chart = PieChartWidget()
+        self.parent_ids = set() # Activités ayant des sous-activités
+        self.drilled = False
+        
+        # En-tête : titre, retour au niveau des parents et option de regroupement
+        header = QHBoxLayout()
+        self.layout.removeWidget(self.lbl_title)
+        header.addWidget(self.lbl_title)
+        header.addStretch()
+        
+        self.btn_drill_up = QPushButton("Retour")
+        self.btn_drill_up.setObjectName("btn_pie_drill_up")
+        self.btn_drill_up.setCursor(Qt.PointingHandCursor)
+        self.btn_drill_up.clicked.connect(self.drill_up_requested.emit)
+        self.btn_drill_up.hide()
+        header.addWidget(self.btn_drill_up)
+        
+        self.chk_rollup = QCheckBox("Regrouper les sous-activités")
+        self.chk_rollup.toggled.connect(self.rollup_toggled.emit)
+        header.addWidget(self.chk_rollup)
+        self.layout.insertLayout(0, header)
+        
         self.set_content_widget(self.chart)
         
     def update_data(self, db_rows):
         self.chart.set_data(db_rows)
 
-    def update_color_map(self, map_colors):
-        self.chart.set_color_map(map_colors)
+    def expand_other(self, db_rows):
+        self.chart.expand_other(db_rows)
+
+    def update_live(self, live_values):
+        self.chart.set_live(live_values)
+
+    def update_activity_info(self, labels, colors, parent_ids):
+        self.parent_ids = set(parent_ids)
+        self.chart.set_activity_info(labels, colors)
+        self.update_drillable()
+
+    def set_rollup(self, enabled):
+        """Coche l'option sans émettre rollup_toggled."""
+        self.chk_rollup.blockSignals(True)
+        self.chk_rollup.setChecked(enabled)
+        self.chk_rollup.blockSignals(False)
+        self.update_drillable()
+
+    def set_drilled_parent(self, label):
+        """Libellé du parent détaillé, None pour revenir à la vue d'ensemble."""
+        self.drilled = label is not None
+        self.lbl_title.setText(f"{self.TITLE} · {label}" if self.drilled else self.TITLE)
+        self.btn_drill_up.setVisible(self.drilled)
+        self.update_drillable()
+
+    def update_drillable(self):
+        rolled_up = self.chk_rollup.isChecked() and not self.drilled
+        self.chart.set_drillable(self.parent_ids if rolled_up else ())
+
+class HierarchyCard(AnalysisCard):
+    """
+    Temps par famille d'activités (parents et sous-activités). Un clic sur une part limite
+    les autres cartes à cette activité ; "Vue d'ensemble" les rétablit.
+    """
+    TITLE = "Hiérarchie des activités"
+
+    def __init__(self):
+        super().__init__(self.TITLE, "hierarchy_chart")
+        self.chart = SunburstWidget()
+
+        # En-tête : titre et retour à la vue d'ensemble
+        header = QHBoxLayout()
+        self.layout.removeWidget(self.lbl_title)
+        header.addWidget(self.lbl_title)
+        header.addStretch()
+
+        self.btn_reset = QPushButton("Vue d'ensemble")
+        self.btn_reset.setObjectName("btn_hierarchy_reset")
+        self.btn_reset.setCursor(Qt.PointingHandCursor)
+        self.btn_reset.clicked.connect(lambda: self.chart.scope_requested.emit(None))
+        self.btn_reset.hide()
+        header.addWidget(self.btn_reset)
+        self.layout.insertLayout(0, header)
+
+        self.set_content_widget(self.chart)
+
+    def update_data(self, rings):
+        self.chart.set_data(rings)
+
+    def update_activity_info(self, labels, colors):
+        self.chart.set_activity_info(labels, colors)
+
+    def set_scope(self, scope_id, label):
+        """Activité choisie (None : vue d'ensemble) et son libellé pour le titre."""
+        scoped = scope_id is not None
+        self.lbl_title.setText(f"{self.TITLE} · {label}" if scoped else self.TITLE)
+        self.btn_reset.setVisible(scoped)
+        self.chart.set_scope(scope_id)
+
+class WeekHeatmapCard(AnalysisCard):
+    """Temps suivi par jour de la semaine et par heure, sur la période filtrée."""
+    def __init__(self):
+        super().__init__("Semaine type", "week_heatmap")
+        self.chart = WeekHeatmapWidget()
+        self.set_content_widget(self.chart)
+
+    def update_data(self, matrix):
+        self.chart.set_data(matrix)
+
+
+class DayTimelineCard(AnalysisCard):
+    """Sessions jour par jour sur une plage d'un jour à quatre semaines, avec zoom sur les heures."""
+    TITLE = "Chronologie"
+    SPANS = (("Jour", 1), ("Semaine", 7), ("4 semaines", 28))
+
+    window_requested = Signal(object, int) # Premier jour, nombre de jours
+
+    def __init__(self):
+        super().__init__(self.TITLE, "day_timeline")
+        self.chart = DayTimelineWidget()
+        self.days = 7
+        self.first_day = date.today() - timedelta(days=self.days - 1)
+
+        # En-tête : titre, durée de la plage et navigation
+        header = QHBoxLayout()
+        self.layout.removeWidget(self.lbl_title)
+        header.addWidget(self.lbl_title)
+        header.addStretch()
+
+        self.span_buttons = {}
+        for text, days in self.SPANS:
+            btn = QPushButton(text)
+            btn.setObjectName("btn_timeline_span")
+            btn.setCheckable(True)
+            btn.setCursor(Qt.PointingHandCursor)
+            btn.clicked.connect(lambda _=False, d=days: self.request_span(d))
+            header.addWidget(btn)
+            self.span_buttons[days] = btn
+
+        self.btn_prev = QPushButton("◀")
+        self.btn_prev.setObjectName("btn_calendar_nav")
+        self.btn_prev.setCursor(Qt.PointingHandCursor)
+        self.btn_prev.clicked.connect(lambda: self.request_window(self.first_day - timedelta(days=self.days), self.days))
+        header.addWidget(self.btn_prev)
+
+        self.lbl_range = QLabel()
+        self.lbl_range.setObjectName("lbl_calendar_year")
+        header.addWidget(self.lbl_range)
+
+        self.btn_next = QPushButton("▶")
+        self.btn_next.setObjectName("btn_calendar_nav")
+        self.btn_next.setCursor(Qt.PointingHandCursor)
+        self.btn_next.clicked.connect(lambda: self.request_window(self.first_day + timedelta(days=self.days), self.days))
+        header.addWidget(self.btn_next)
+        self.layout.insertLayout(0, header)
+
+        self.set_content_widget(self.chart)
+        lbl_hint = QLabel("Molette : zoom · Glisser : déplacer · Double-clic : journée entière")
+        lbl_hint.setObjectName("lbl_calendar_stats")
+        self.content_layout.addWidget(lbl_hint)
+        self.update_nav()
+
+    def request_span(self, days):
+        # La nouvelle plage se termine au même jour que l'actuelle
+        last = self.first_day + timedelta(days=self.days - 1)
+        self.request_window(last - timedelta(days=days - 1), days)
+
+    def request_window(self, first_day, days):
+        # Pas de plage au-delà d'aujourd'hui
+        first_day = min(first_day, date.today() - timedelta(days=days - 1))
+        self.first_day, self.days = first_day, days
+        self.update_nav()
+        self.window_requested.emit(first_day, days)
+
+    def update_nav(self):
+        last = self.first_day + timedelta(days=self.days - 1)
+        if self.days == 1:
+            self.lbl_range.setText(f"{JOURS_COMPLETS[last.weekday()]} {last.strftime('%d/%m/%Y')}")
+        else:
+            self.lbl_range.setText(f"{self.first_day.strftime('%d/%m')} – {last.strftime('%d/%m/%Y')}")
+        self.btn_next.setEnabled(last < date.today())
+        for days, btn in self.span_buttons.items():
+            btn.setChecked(days == self.days)
+
+    def update_activity_info(self, labels, colors):
+        self.chart.set_activity_info(labels, colors)
+
+    def update_data(self, timeline):
+        self.first_day, self.days = timeline.first_day, timeline.days
+        self.update_nav()
+        self.chart.set_data(timeline)
+
+class YearCalendarCard(AnalysisCard):
+    """Temps suivi jour par jour sur une année, avec séries et plus longue pause."""
+    TITLE = "Calendrier"
+
+    year_requested = Signal(int)
+
+    def __init__(self):
+        super().__init__(self.TITLE, "year_calendar")
+        self.chart = YearCalendarWidget()
+        self.year = self.chart.year
+
+        # En-tête : titre et navigation entre les années
+        header = QHBoxLayout()
+        self.layout.removeWidget(self.lbl_title)
+        header.addWidget(self.lbl_title)
+        header.addStretch()
+
+        self.btn_prev_year = QPushButton("◀")
+        self.btn_prev_year.setObjectName("btn_calendar_nav")
+        self.btn_prev_year.setCursor(Qt.PointingHandCursor)
+        self.btn_prev_year.clicked.connect(lambda: self.year_requested.emit(self.year - 1))
+        header.addWidget(self.btn_prev_year)
+
+        self.lbl_year = QLabel(str(self.year))
+        self.lbl_year.setObjectName("lbl_calendar_year")
+        header.addWidget(self.lbl_year)
+
+        self.btn_next_year = QPushButton("▶")
+        self.btn_next_year.setObjectName("btn_calendar_nav")
+        self.btn_next_year.setCursor(Qt.PointingHandCursor)
+        self.btn_next_year.clicked.connect(lambda: self.year_requested.emit(self.year + 1))
+        header.addWidget(self.btn_next_year)
+        self.layout.insertLayout(0, header)
+
+        self.set_content_widget(self.chart)
+        self.lbl_stats = QLabel()
+        self.lbl_stats.setObjectName("lbl_calendar_stats")
+        self.content_layout.addWidget(self.lbl_stats)
+        self.update_nav()
+
+    def update_nav(self):
+        self.lbl_year.setText(str(self.year))
+        self.btn_next_year.setEnabled(self.year < date.today().year)
+
+    def update_data(self, year, totals, stats):
+        self.year = year
+        self.update_nav()
+        self.chart.set_data(year, totals)
+        self.lbl_stats.setText(format_stats(stats))
+
+class PivotCard(AnalysisCard):
+    """Tableau croisé du temps par activité et par intervalle, sur la période filtrée."""
+    TITLE = "Tableau croisé"
+    LEVELS = (("Jour", "day"), ("Semaine", "week"), ("Mois", "month"), ("Trimestre", "quarter"), ("Année", "year"))
+
+    level_changed = Signal(str)
+    rollup_toggled = Signal(bool)
+
+    def __init__(self):
+        super().__init__(self.TITLE, "pivot_table")
+        self.model = PivotTableModel()
+        self.table = PivotTableView(self.model)
+        self.table.setMinimumHeight(320)
+
+        # En-tête : titre, intervalle des colonnes, regroupement et copie
+        header = QHBoxLayout()
+        self.layout.removeWidget(self.lbl_title)
+        header.addWidget(self.lbl_title)
+        header.addStretch()
+
+        self.chk_rollup = QCheckBox("Regrouper les sous-activités")
+        self.chk_rollup.toggled.connect(self.rollup_toggled.emit)
+        header.addWidget(self.chk_rollup)
+
+        self.combo_level = QComboBox()
+        self.combo_level.setObjectName("modern_combo")
+        for text, level in self.LEVELS:
+            self.combo_level.addItem(text, level)
+        self.combo_level.setCurrentIndex(1)
+        self.combo_level.currentIndexChanged.connect(lambda i: self.level_changed.emit(self.combo_level.itemData(i)))
+        header.addWidget(self.combo_level)
+
+        self.btn_copy = QPushButton("Copier")
+        self.btn_copy.setObjectName("btn_pivot_copy")
+        self.btn_copy.setCursor(Qt.PointingHandCursor)
+        self.btn_copy.setToolTip("Copie la sélection (ou tout le tableau) pour un tableur")
+        self.btn_copy.clicked.connect(self.table.copy_selection)
+        header.addWidget(self.btn_copy)
+        self.layout.insertLayout(0, header)
+
+        self.set_content_widget(self.table)
+
+    def set_level(self, level):
+        """Sélectionne un intervalle sans émettre level_changed."""
+        index = self.combo_level.findData(level)
+        if index >= 0:
+            self.combo_level.blockSignals(True)
+            self.combo_level.setCurrentIndex(index)
+            self.combo_level.blockSignals(False)
+
+    def update_activity_info(self, labels, colors):
+        self.model.set_activity_info(labels, colors)
+
+    def update_data(self, table):
+        self.model.set_table(table)
 
 class ActivityListCard(AnalysisCard):
     def __init__(self):
@@ -506,7 +1181,7 @@ class ActivityListCard(AnalysisCard):
             return
             
         for row in data:
-            raw_date, cat, lbl, dur = row
+            raw_date, cat, lbl, dur = row[:4]
             d_str = raw_date
             
             h, m = divmod(dur, 3600)
@@ -542,8 +1217,13 @@ class ProjectsList(QWidget):
         # Largeur fixe pour la sidebar
         self.setFixedWidth(250)
 
-    def set_projects(self, projects):
-        """projects: list of (id, label)"""
+    def set_projects(self, projects, selected_id="all"):
+        """
+        projects: list of (id, label)
+        Recharge la liste en conservant la sélection (sans émettre project_selected).
+        Retourne l'id du projet sélectionné ("all" si selected_id n'existe plus).
+        """
+        self.list_widget.blockSignals(True)
         self.list_widget.clear()
         
         # Item "Tous les projets"
@@ -551,12 +1231,17 @@ class ProjectsList(QWidget):
         item_all.setData(Qt.UserRole, "all")
         self.list_widget.addItem(item_all)
         
+        selected_row = 0
         for pid, label in projects:
             item = QListWidgetItem(label)
             item.setData(Qt.UserRole, pid)
             self.list_widget.addItem(item)
+            if pid == selected_id:
+                selected_row = self.list_widget.count() - 1
             
-        self.list_widget.setCurrentRow(0)
+        self.list_widget.setCurrentRow(selected_row)
+        self.list_widget.blockSignals(False)
+        return self.list_widget.currentItem().data(Qt.UserRole)
 
     def on_selection(self, current, previous):
         if current:
@@ -567,9 +1252,22 @@ class AnalysesView(QWidget):
     global_filter_changed = Signal(str, object)
     project_selected = Signal(object)
     export_requested = Signal()
+    progression_resolution_changed = Signal(int) # Nombre max de barres du graphique d'évolution
+    pie_other_expand_requested = Signal(int) # Rang à partir duquel détailler la part "Autres"
+    pie_rollup_changed = Signal(bool) # Regroupement des sous-activités dans la répartition
+    pie_drill_requested = Signal(object) # Parent à détailler, None pour remonter
+    scope_requested = Signal(object) # Activité choisie dans la hiérarchie, None pour la vue d'ensemble
+    calendar_year_requested = Signal(int) # Année à afficher dans le calendrier
+    timeline_window_requested = Signal(object, int) # Plage de la chronologie : premier jour, nombre de jours
+    pivot_level_changed = Signal(str) # Intervalle des colonnes du tableau croisé (niveau de la pyramide)
+    pivot_rollup_changed = Signal(bool)
+    
+    FILTER_DEBOUNCE_MS = 300 # Délai sans modification des dates avant de relancer les requêtes
     
     def __init__(self):
         super().__init__()
+        # Résultats arrivés page masquée : les graphiques ne sont repeints qu'au retour sur la page
+        self.updates = DeferredUpdates(self)
         
         # Layout principal horizontal : [Liste Projets] | [Contenu Analyses]
         self.main_layout = QHBoxLayout(self)
@@ -631,6 +1329,12 @@ class AnalysesView(QWidget):
         self.date_end.setDisplayFormat("dd/MM/yyyy")
         self.date_end.setFixedWidth(140)
         self.date_end.dateChanged.connect(self.on_date_changed)
+        
+        # Regroupe les changements de dates successifs en une seule émission
+        self.filter_debounce = QTimer(self)
+        self.filter_debounce.setSingleShot(True)
+        self.filter_debounce.setInterval(self.FILTER_DEBOUNCE_MS)
+        self.filter_debounce.timeout.connect(self.emit_filter)
         layout_filter.addWidget(self.date_end)
         
         layout_filter.addWidget(self.date_end)
@@ -648,27 +1352,67 @@ class AnalysesView(QWidget):
         
         # 2. Graphiques
         self.card_week = CarteGraphiqueHebdo() 
+        self.card_week.graphique.max_bars_changed.connect(self.progression_resolution_changed.emit)
         self.card_pie = PieChartCard()
+        self.card_pie.chart.other_expand_requested.connect(self.pie_other_expand_requested.emit)
+        self.card_pie.chart.drill_down_requested.connect(self.pie_drill_requested.emit)
+        self.card_pie.drill_up_requested.connect(lambda: self.pie_drill_requested.emit(None))
+        self.card_pie.rollup_toggled.connect(self.pie_rollup_changed.emit)
+        self.card_hierarchy = HierarchyCard()
+        self.card_hierarchy.chart.scope_requested.connect(self.scope_requested.emit)
+        self.card_heatmap = WeekHeatmapCard()
+        self.card_calendar = YearCalendarCard()
+        self.card_timeline = DayTimelineCard()
+        self.card_timeline.window_requested.connect(self.timeline_window_requested.emit)
+        self.card_pivot = PivotCard()
+        self.card_pivot.level_changed.connect(self.pivot_level_changed.emit)
+        self.card_pivot.rollup_toggled.connect(self.pivot_rollup_changed.emit)
+        self.card_calendar.year_requested.connect(self.calendar_year_requested.emit)
         self.card_list = ActivityListCard() 
         
         self.content_layout.addWidget(self.card_week, 1)
         
+        self.content_layout.addWidget(self.card_hierarchy, 1)
+        
         self.content_layout.addWidget(self.card_pie, 1)
         
+        self.content_layout.addWidget(self.card_heatmap, 1)
+        
+        self.content_layout.addWidget(self.card_calendar)
+        
+        self.content_layout.addWidget(self.card_timeline)
+        
+        self.content_layout.addWidget(self.card_pivot)
+        
         self.main_layout.addWidget(self.scroll_area)
         
         # Init visibility
         self.on_filter_change("Période")
 
     def on_filter_change(self, text):
-        is_period = (text == "Période")
+        # Changement de mode : appliqué immédiatement
+        self.filter_debounce.stop()
+        self.show_period_dates(text == "Période")
+        self.emit_filter()
+
+    def show_period_dates(self, is_period):
         self.date_start.setVisible(is_period)
         self.date_end.setVisible(is_period)
         self.lbl_sep.setVisible(is_period)
-        self.emit_filter()
+
+    def set_filter_mode(self, mode):
+        """Sélectionne un mode sans émettre global_filter_changed. Retourne False si le mode est inconnu."""
+        if self.combo_mode.findText(mode) < 0:
+            return False
+        self.combo_mode.blockSignals(True)
+        self.combo_mode.setCurrentText(mode)
+        self.combo_mode.blockSignals(False)
+        self.show_period_dates(mode == "Période")
+        return True
 
     def on_date_changed(self, _):
-        self.emit_filter()
+        # Saisie au clavier ou molette : on attend la fin de la rafale avant de recalculer
+        self.filter_debounce.start()
 
     def emit_filter(self):
         mode = self.combo_mode.currentText()
@@ -677,15 +1421,81 @@ class AnalysesView(QWidget):
             dates = (self.date_start.date().toPython(), self.date_end.date().toPython())
         self.global_filter_changed.emit(mode, dates)
 
-    def set_projects_list(self, projects):
-        self.sidebar_projects.set_projects(projects)
+    def set_projects_list(self, projects, selected_id="all"):
+        return self.sidebar_projects.set_projects(projects, selected_id)
+
+    def update_history(self, today_data, week_data, pie_data, activity_info=None, drilled_label=None):
+        """
+        activity_info : (id -> libellé, id -> couleur, ids des parents) résolus au rendu.
+        drilled_label : parent dont la répartition détaille les sous-activités (None : vue d'ensemble).
+        """
+        self.updates.apply("history", self._update_history, today_data, week_data, pie_data, activity_info,
+                           drilled_label)
+
+    def update_pie(self, pie_data, drilled_label=None):
+        """Répartition seule (regroupement ou détail d'un parent)."""
+        self.updates.apply("pie", self._update_pie, pie_data, drilled_label)
+
+    def update_hierarchy(self, rings, scope_id=None, scope_label=None):
+        """Anneaux de la hiérarchie et activité à laquelle les cartes sont limitées."""
+        self.updates.apply("hierarchy", self._update_hierarchy, rings, scope_id, scope_label)
 
-    def update_history(self, today_data, week_data, pie_data, color_map=None):
+    def update_heatmap(self, matrix):
+        """Semaine type : 7 listes (lundi -> dimanche) de secondes par demi-heure."""
+        self.updates.apply("heatmap", self.card_heatmap.update_data, matrix)
+
+    def update_calendar(self, year, totals, stats):
+        """Calendrier d'une année : {date: secondes} et indicateurs (séries, pause, jours actifs, total)."""
+        self.updates.apply("calendar", self.card_calendar.update_data, year, totals, stats)
+
+    def update_timeline(self, timeline):
+        """Chronologie (DayTimeline) de la plage demandée."""
+        self.updates.apply("timeline", self.card_timeline.update_data, timeline)
+
+    def update_pivot(self, table):
+        """Tableau croisé (PivotTable) du filtre courant."""
+        self.updates.apply("pivot", self.card_pivot.update_data, table)
+
+    def update_activity_list(self, rows):
+        """Sessions seules (changement de l'activité choisie, filtrées en mémoire)."""
+        self.updates.apply("activity_list", self.card_list.update_data, rows)
+
+    def set_pie_rollup(self, enabled):
+        self.card_pie.set_rollup(enabled)
+
+    def update_progression(self, week_data):
+        self.updates.apply("progression", self.card_week.update_data, week_data)
+
+    def expand_pie_other(self, rows):
+        self.updates.apply("pie_other", self.card_pie.expand_other, rows)
+
+    def update_live(self, live_bars, live_slices):
+        """Temps de la session en cours ajouté aux barres et parts déjà affichées."""
+        self.updates.apply("live", self._update_live, live_bars, live_slices)
+
+    def _update_live(self, live_bars, live_slices):
+        self.card_week.update_live(live_bars)
+        self.card_pie.update_live(live_slices)
+
+    def _update_history(self, today_data, week_data, pie_data, activity_info=None, drilled_label=None):
         self.card_list.update_data(today_data)
-        self.card_week.update_data(week_data)
         
-        if color_map:
-            self.card_pie.update_color_map(color_map)
-            self.card_week.update_color_map(color_map)
+        if activity_info:
+            labels, colors, parent_ids = activity_info
+            self.card_pie.update_activity_info(labels, colors, parent_ids)
+            self.card_week.update_activity_info(labels, colors)
+            self.card_hierarchy.update_activity_info(labels, colors)
+            self.card_timeline.update_activity_info(labels, colors)
+            self.card_pivot.update_activity_info(labels, colors)
             
+        if week_data is not None: # None : évolution demandée au premier redimensionnement du graphique
+            self.card_week.update_data(week_data)
+        self._update_pie(pie_data, drilled_label)
+
+    def _update_hierarchy(self, rings, scope_id, scope_label):
+        self.card_hierarchy.set_scope(scope_id, scope_label)
+        self.card_hierarchy.update_data(rings)
+
+    def _update_pie(self, pie_data, drilled_label):
+        self.card_pie.set_drilled_parent(drilled_label)
         self.card_pie.update_data(pie_data)
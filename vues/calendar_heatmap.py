@@ -0,0 +1,204 @@
+"""
+Calendrier annuel façon GitHub, partagé par l'accueil (version compacte) et les analyses.
+Une colonne par semaine (lundi en haut), une case par jour, d'autant plus intense que le
+temps suivi ce jour-là est élevé.
+"""
+
+from datetime import date, timedelta
+
+from PySide6.QtWidgets import QWidget, QToolTip
+from PySide6.QtGui import QPainter, QPixmap, QColor, QPen
+from PySide6.QtCore import Qt, QRectF, QEvent
+
+from vues.palette import qcolor
+
+JOURS_COMPLETS = ['Lundi', 'Mardi', 'Mercredi', 'Jeudi', 'Vendredi', 'Samedi', 'Dimanche']
+MOIS_COMPLETS = ["janvier", "février", "mars", "avril", "mai", "juin",
+                 "juillet", "août", "septembre", "octobre", "novembre", "décembre"]
+MOIS_COURTS = ["Jan", "Fév", "Mar", "Avr", "Mai", "Juin", "Juil", "Août", "Sep", "Oct", "Nov", "Déc"]
+
+
+def format_duration(seconds):
+    h, r = divmod(int(seconds), 3600)
+    m = r // 60
+    return f"{h}h{m:02d}" if h else f"{m} min"
+
+
+def format_stats(stats):
+    """Texte des indicateurs (série actuelle, record, plus longue pause, jours actifs, total)."""
+    current, longest, gap, active_days, total = stats
+    return (f"Série actuelle : {current} j · Record : {longest} j · Plus longue pause : {gap} j · "
+            f"{active_days} jours actifs · {format_duration(total)}")
+
+
+class YearCalendarWidget(QWidget):
+    """
+    Calendrier d'une année rendu une fois dans un QPixmap.
+    La case survolée est retrouvée par calcul (semaine, jour) et seul son contour est repeint.
+    """
+    LEVEL_COLORS = ["#2a2233", "#5c2a4a", "#99335f", "#d94d80", "#FF6699"] # Aucun temps -> maximum
+    MAX_CELL = 16 # Taille maximale d'une case (version complète)
+    MAX_CELL_COMPACT = 11
+
+    def __init__(self, compact=False):
+        super().__init__()
+        self.compact = compact
+        self.year = date.today().year
+        self.totals = {} # date -> secondes
+        self.thresholds = () # Secondes minimales des niveaux 2 à 4
+        self.setMinimumHeight(90 if compact else 150)
+        self.setMouseTracking(True)
+        self.hovered = None # date survolée
+        self.render_cache = None
+        self.render_cache_key = None
+
+    def set_data(self, year, totals):
+        if year == self.year and totals == self.totals:
+            return
+        self.year = year
+        self.totals = totals
+        # Niveaux répartis sur la racine carrée du maximum : les journées courtes restent visibles
+        top = max(totals.values(), default=0)
+        self.thresholds = tuple(top * (k / 4) ** 2 for k in (1, 2, 3))
+        self.invalidate_cache()
+
+    def invalidate_cache(self):
+        self.render_cache = None
+        self.hovered = None
+        self.update()
+
+    def changeEvent(self, event):
+        if event.type() in (QEvent.PaletteChange, QEvent.FontChange, QEvent.StyleChange):
+            self.invalidate_cache()
+        super().changeEvent(event)
+
+    def first_monday(self):
+        jan1 = date(self.year, 1, 1)
+        return jan1 - timedelta(days=jan1.weekday())
+
+    def level(self, seconds):
+        if not seconds:
+            return 0
+        return 1 + sum(1 for t in self.thresholds if seconds > t)
+
+    def margins(self):
+        """(gauche, haut) : libellés des jours et des mois, absents de la version compacte."""
+        return (0, 0) if self.compact else (30, 16)
+
+    def grid(self):
+        """(x0, y0, pas d'une case, taille d'une case) pour la taille actuelle ; None si trop petit."""
+        m_left, m_top = self.margins()
+        weeks = (date(self.year, 12, 31) - self.first_monday()).days // 7 + 1
+        max_cell = self.MAX_CELL_COMPACT if self.compact else self.MAX_CELL
+        step = min((self.width() - m_left) / weeks, (self.height() - m_top) / 7, max_cell + 2)
+        if step < 2:
+            return None
+        x0 = m_left + (self.width() - m_left - weeks * step) / 2 # Calendrier centré horizontalement
+        return x0, m_top, step, max(1.0, step - 2)
+
+    def cell_rect(self, day, grid=None):
+        x0, y0, step, size = grid or self.grid()
+        col = (day - self.first_monday()).days // 7
+        return QRectF(x0 + col * step, y0 + day.weekday() * step, size, size)
+
+    def day_at(self, pos):
+        grid = self.grid()
+        if not grid:
+            return None
+        x0, y0, step, _ = grid
+        col = int((pos.x() - x0) // step)
+        row = int((pos.y() - y0) // step)
+        if col < 0 or not 0 <= row < 7:
+            return None
+        day = self.first_monday() + timedelta(days=col * 7 + row)
+        return day if day.year == self.year else None
+
+    def mouseMoveEvent(self, event):
+        pos = event.position() if hasattr(event, 'position') else event.pos()
+        day = self.day_at(pos)
+        if day != self.hovered:
+            self.set_hovered(day)
+            if day is None:
+                QToolTip.hideText()
+            else:
+                sec = self.totals.get(day, 0)
+                text = format_duration(sec) if sec else "Aucun temps suivi"
+                QToolTip.showText(event.globalPos(), f"{JOURS_COMPLETS[day.weekday()]} {day.day} "
+                                  f"{MOIS_COMPLETS[day.month - 1]} {day.year}\n{text}", self)
+        super().mouseMoveEvent(event)
+
+    def leaveEvent(self, event):
+        self.set_hovered(None)
+        QToolTip.hideText()
+        super().leaveEvent(event)
+
+    def set_hovered(self, day):
+        """Change la case survolée et ne repeint que les cases concernées."""
+        for old_or_new in (self.hovered, day):
+            if old_or_new is not None and self.grid():
+                self.update(self.cell_rect(old_or_new).toAlignedRect().adjusted(-2, -2, 2, 2))
+        self.hovered = day
+
+    def paintEvent(self, event):
+        dpr = self.devicePixelRatioF()
+        key = (self.width(), self.height(), dpr)
+        if self.render_cache is None or self.render_cache_key != key:
+            self.render_cache = self.render_static(dpr)
+            self.render_cache_key = key
+            self.hovered = None
+
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self.render_cache)
+        if self.hovered is not None and self.grid():
+            painter.setRenderHint(QPainter.Antialiasing)
+            painter.setBrush(Qt.NoBrush)
+            painter.setPen(QPen(QColor("#F0EDEE"), 1.5))
+            painter.drawRoundedRect(self.cell_rect(self.hovered), 2, 2)
+
+    def render_static(self, dpr):
+        """Dessine les cases, les mois et les jours dans un QPixmap."""
+        w, h = self.width(), self.height()
+        pixmap = QPixmap(max(1, int(w * dpr)), max(1, int(h * dpr)))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.transparent)
+
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        grid = self.grid()
+        if not grid:
+            painter.end()
+            return pixmap
+        x0, m_top, step, size = grid
+        m_left = self.margins()[0]
+        first = self.first_monday()
+        last = date(self.year, 12, 31)
+
+        painter.setPen(Qt.NoPen)
+        today = date.today()
+        day = date(self.year, 1, 1)
+        while day <= last:
+            rect = self.cell_rect(day, grid)
+            if day > today:
+                painter.setBrush(Qt.NoBrush)
+                painter.setPen(QPen(qcolor(self.LEVEL_COLORS[0]), 1))
+                painter.drawRoundedRect(rect.adjusted(0.5, 0.5, -0.5, -0.5), 2, 2)
+                painter.setPen(Qt.NoPen)
+            else:
+                painter.setBrush(qcolor(self.LEVEL_COLORS[self.level(self.totals.get(day, 0))]))
+                painter.drawRoundedRect(rect, 2, 2)
+            day += timedelta(days=1)
+
+        if not self.compact:
+            f = self.font()
+            f.setPointSize(8)
+            painter.setFont(f)
+            painter.setPen(QColor("#F0EDEE"))
+            for row in (0, 2, 4):
+                painter.drawText(QRectF(0, m_top + row * step, m_left - 4, size),
+                                 Qt.AlignRight | Qt.AlignVCenter, JOURS_COMPLETS[row][:3])
+            for month in range(12):
+                col = (date(self.year, month + 1, 1) - first).days // 7
+                painter.drawText(QRectF(x0 + col * step, 0, 4 * step, m_top - 2),
+                                 Qt.AlignLeft | Qt.AlignBottom, MOIS_COURTS[month])
+        painter.end()
+        return pixmap
@@ -0,0 +1,15 @@
+"""
+Textes communs aux graphiques des analyses : noms des jours et durées des infobulles.
+"""
+
+JOURS_MAP = ['Lun', 'Mar', 'Mer', 'Jeu', 'Ven', 'Sam', 'Dim']
+JOURS_COMPLETS = ['Lundi', 'Mardi', 'Mercredi', 'Jeudi', 'Vendredi', 'Samedi', 'Dimanche']
+
+
+def format_duration(duration):
+    """Durée d'une infobulle : "2h 05m", ou "5m 30s" sous une heure."""
+    h, r = divmod(duration, 3600)
+    m, s = divmod(r, 60)
+    if h > 0:
+        return f"{int(h)}h {int(m)}m"
+    return f"{int(m)}m {int(s)}s"
@@ -4,145 +4,209 @@ Permet de sélectionner et chronométrer des activités de manière visuelle.
 """
 
 from PySide6.QtWidgets import (QWidget, QLabel, QPushButton, QHBoxLayout, QVBoxLayout, 
-                                 QListWidget, QLineEdit, QFrame, QSizePolicy, QGraphicsDropShadowEffect, QDialog)
-from PySide6.QtCore import Qt, QPoint, Signal, QTimer, QPropertyAnimation, QEasingCurve, QSize
-from PySide6.QtGui import QIcon, QKeySequence
+                                 QListWidget, QLineEdit, QFrame, QSizePolicy, QGraphicsDropShadowEffect, QDialog, QLayout)
+from PySide6.QtCore import Qt, QPoint, Signal, QTimer, QPropertyAnimation, QParallelAnimationGroup, QEasingCurve, QSize
+from PySide6.QtGui import QIcon
+from functools import lru_cache, partial
 import math
 import os
 
+# Nombre d'emplacements sur l'anneau principal
+TOTAL_SLOTS = 8
+
+
+@lru_cache(maxsize=128)
+def compute_bubble_layout(width, height, child_counts, focus_index, center_size):
+    """
+    Calcule (sans toucher aux widgets) la disposition des bulles.
+    Le résultat ne dépend que de ses arguments, il est donc mémorisé :
+    une rafale de resize ou un retour sur une taille connue ne refait aucun calcul trigonométrique.
+
+    Args:
+        width, height: Taille du conteneur
+        child_counts: Tuple du nombre d'enfants affichés de chaque parent (au plus TOTAL_SLOTS, une page d'enfants)
+        focus_index: Index du parent en focus (ou None)
+        center_size: Tuple (largeur, hauteur) du widget central
+
+    Returns:
+        (center_pos, parents) où parents est une liste de
+        ((x, y, taille) ou None si masqué, [(x, y, taille) ou None, ...])
+    """
+    cx, cy = width / 2, height / 2
+
+    # -- 1. Calcul de l'espace disponible --
+    min_dim = min(width, height)
+
+    # Marge de sécurité : Rayon Parent (50) + Rayon Enfant (20) + Orbit (15) + Marge (20) ≈ 105-115px
+    # Cela évite que les enfants (fleurs) ne sortent du cadre
+    safe_margin = 115
+    available_radius = (min_dim / 2) - safe_margin
+
+    # Centrer l'horloge
+    cw_w, cw_h = center_size
+    center_pos = (int(cx - cw_w/2), int(cy - cw_h/2))
+
+    angle_step = 2 * math.pi / TOTAL_SLOTS
+
+    # -- 2. Rayon du cercle principal --
+    # On définit le rayon pour rester DANS la safe_margin
+    # min 90 pour ne pas écraser l'horloge, max 280 pour l'esthétique
+    dist_parent = min(280, max(90, available_radius))
+
+    # -- 3. Calcul de la taille (Anti-Chevauchement) --
+    # Corde disponible entre 2 bulles sur le cercle : C = 2 * R * sin(pi/N)
+    # On veut size < C (avec une petite marge)
+    chord = 2 * dist_parent * math.sin(math.pi / TOTAL_SLOTS)
+    max_size_allowed = chord * 0.9 # 10% de marge entre bulles
+
+    # Taille standard voulue : 100px
+    # On réduit si nécessaire, mais pas en dessous de 50px
+    base_size = int(min(100, max(50, max_size_allowed)))
+
+    # Facteur d'échelle global déduit
+    scale_factor = base_size / 100.0
+
+    # Tailles dérivées
+    size_parent = base_size
+    size_parent_focus = int(140 * scale_factor)
+    size_child = int(40 * scale_factor)
+    size_child_focus = int(90 * scale_factor)
+
+    parents = []
+    for i, nb_children in enumerate(child_counts):
+        if i == focus_index:
+            # --- Parent FOCUS : Au Centre ---
+            parent_geo = (int(cx - size_parent_focus/2), int(cy - size_parent_focus/2), size_parent_focus)
+
+            # Enfants orbite
+            radius_orbit = min(220, max(140, available_radius * 1.5)) # Un peu plus large si possible
+            c_step = 2 * math.pi / max(1, nb_children)
+
+            children_geo = []
+            for k in range(nb_children):
+                c_angle = c_step * k - (math.pi / 2)
+                c_px = cx + math.cos(c_angle) * radius_orbit
+                c_py = cy + math.sin(c_angle) * radius_orbit
+                children_geo.append((int(c_px - size_child_focus/2), int(c_py - size_child_focus/2), size_child_focus))
+
+        elif i < TOTAL_SLOTS:
+            # --- Parent NON-FOCUS ---
+            angle = angle_step * i - (math.pi / 2)
+            px = cx + math.cos(angle) * dist_parent
+            py = cy + math.sin(angle) * dist_parent
+            parent_geo = (int(px - size_parent/2), int(py - size_parent/2), size_parent)
+
+            # Enfants Fleur serrée
+            orbit_radius = size_parent / 2 + size_child / 2 + (15 * scale_factor)
+            children_geo = []
+            for j in range(nb_children):
+                c_angle = angle_step * j - (math.pi / 2)
+                c_px = px + math.cos(c_angle) * orbit_radius
+                c_py = py + math.sin(c_angle) * orbit_radius
+                children_geo.append((int(c_px - size_child/2), int(c_py - size_child/2), size_child))
+        else:
+            parent_geo = None
+            children_geo = [None] * nb_children
+
+        parents.append((parent_geo, tuple(children_geo)))
+
+    return center_pos, tuple(parents)
+
+
 class BubbleLayoutManager:
     """
     Gestionnaire de disposition des bulles d'activités.
     Calcule et applique le positionnement des bulles parents et enfants.
     """
-    @staticmethod
-    def apply_layout(bubbles, center_widget, container_rect, focus_item=None):
-        if container_rect.width() < 50: return
-        cx, cy = container_rect.center().x(), container_rect.center().y()
-        
-        # -- 1. Calcul de l'espace disponible --
-        min_dim = min(container_rect.width(), container_rect.height())
-        
-        # Marge de sécurité : Rayon Parent (50) + Rayon Enfant (20) + Orbit (15) + Marge (20) ≈ 105-115px
-        # Cela évite que les enfants (fleurs) ne sortent du cadre
-        safe_margin = 115 
-        available_radius = (min_dim / 2) - safe_margin
-        
-        # Centrer l'horloge
-        cw_w, cw_h = center_widget.width(), center_widget.height()
-        center_widget.move(int(cx - cw_w/2), int(cy - cw_h/2))
-        if not focus_item: center_widget.raise_()
- 
-        TOTAL_SLOTS = 8
-        angle_step = 2 * math.pi / TOTAL_SLOTS
-
-        # -- 2. Rayon du cercle principal --
-        # On définit le rayon pour rester DANS la safe_margin
-        # min 90 pour ne pas écraser l'horloge, max 280 pour l'esthétique
-        dist_parent = min(280, max(90, available_radius))
-        
-        # -- 3. Calcul de la taille (Anti-Chevauchement) --
-        # Corde disponible entre 2 bulles sur le cercle : C = 2 * R * sin(pi/N)
-        # On veut size < C (avec une petite marge)
-        chord = 2 * dist_parent * math.sin(math.pi / TOTAL_SLOTS)
-        max_size_allowed = chord * 0.9 # 10% de marge entre bulles
-        
-        # Taille standard voulue : 100px
-        # On réduit si nécessaire, mais pas en dessous de 50px
-        base_size = int(min(100, max(50, max_size_allowed)))
-        
-        # Facteur d'échelle global déduit
-        scale_factor = base_size / 100.0
-        
-        # Tailles dérivées
-        size_parent = base_size
-        size_parent_focus = int(140 * scale_factor) # ou fixe 140 si on a de la place au centre? Gardons l'échelle.
-        size_child = int(40 * scale_factor)
-        size_child_focus = int(90 * scale_factor)
-
-        # Helper pour garantir Style Rond + Taille
-        def apply_circle_style(btn, size, color):
-            # Utilisation de border-radius: 50% pour un cercle parfait
-            style = f"""
-                QPushButton {{
-                    background-color: {color};
-                    border-radius: {size//2}px; /* Fallback si 50% bug */
-                    color: white; font-weight: bold;
-                    border: 2px solid transparent; /* Evite saut visuel au hover */
-                }}
-                QPushButton:hover {{ border: 2px solid white; }}
-            """
-            btn.setFixedSize(size, size)
-            btn.setStyleSheet(style)
+    ANIMATION_DURATION = 250
 
+    @staticmethod
+    def layout_key(bubbles, center_widget, container_rect, focus_item=None):
+        """Clé identifiant une disposition : deux appels avec la même clé produisent le même résultat."""
+        focus_index = None
         for i, item in enumerate(bubbles):
-            item['btn'].show()
-            children = item['children']
-            is_focused = (item == focus_item)
-            
-            p_btn = item['btn']
-            # Récupération couleur
-            p_color = item.get('color', '#333') 
-
-            if is_focused:
-                # --- Parent FOCUS : Au Centre ---
-                # Au centre, on a de la place, on peut être un peu plus gros
-                # Mais gardons la cohérence de scale
-                apply_circle_style(p_btn, size_parent_focus, p_color)
-                p_btn.move(int(cx - p_btn.width()/2), int(cy - p_btn.height()/2))
-                
-                # Enfants orbite
-                radius_orbit = min(220, max(140, available_radius * 1.5)) # Un peu plus large si possible
-                c_step = 2 * math.pi / max(1, len(children))
-                
-                for k, child_item in enumerate(children):
-                     c_btn = child_item['btn'] if isinstance(child_item, dict) else child_item
-                     c_color = item['children_colors'][k] if 'children_colors' in item and k < len(item['children_colors']) else '#555'
-
-                     c_btn.show()
-                     apply_circle_style(c_btn, size_child_focus, c_color)
-                     
-                     c_angle = c_step * k - (math.pi / 2)
-                     c_px = cx + math.cos(c_angle) * radius_orbit
-                     c_py = cy + math.sin(c_angle) * radius_orbit
-                     c_btn.move(int(c_px - c_btn.width()/2), int(c_py - c_btn.height()/2))
-                     c_btn.raise_() 
+            if item is focus_item:
+                focus_index = i
+                break
+        return (container_rect.width(), container_rect.height(),
+                tuple(len(item['children']) for item in bubbles),
+                focus_index,
+                (center_widget.width(), center_widget.height()))
+
+    @staticmethod
+    def apply_circle_style(btn, size, color):
+        """Applique taille + style rond, uniquement si la taille ou la couleur a changé."""
+        key = (size, color)
+        if getattr(btn, 'bubble_style_key', None) == key:
+            return
+        btn.bubble_style_key = key
+
+        # Utilisation de border-radius: 50% pour un cercle parfait
+        style = f"""
+            QPushButton {{
+                background-color: {color};
+                border-radius: {size//2}px; /* Fallback si 50% bug */
+                color: white; font-weight: bold;
+                border: 2px solid transparent; /* Evite saut visuel au hover */
+            }}
+            QPushButton:hover {{ border: 2px solid white; }}
+        """
+        btn.setFixedSize(size, size)
+        btn.setStyleSheet(style)
 
+    @staticmethod
+    def apply_layout(bubbles, center_widget, container_rect, focus_item=None, animate=False):
+        """
+        Applique la disposition (mémorisée) aux widgets.
+        Si animate est vrai, les bulles glissent vers leur nouvelle position ;
+        retourne alors le groupe d'animation (à conserver par l'appelant), sinon None.
+        """
+        if container_rect.width() < 50: return None
+
+        width, height, child_counts, focus_index, center_size = BubbleLayoutManager.layout_key(
+            bubbles, center_widget, container_rect, focus_item)
+        center_pos, parents = compute_bubble_layout(width, height, child_counts, focus_index, center_size)
+
+        center_widget.move(*center_pos)
+        if focus_item is None: center_widget.raise_()
+
+        group = QParallelAnimationGroup() if animate else None
+
+        def place(btn, geo, color):
+            if geo is None:
+                btn.hide()
+                return
+            x, y, size = geo
+            BubbleLayoutManager.apply_circle_style(btn, size, color)
+            btn.show()
+            if group is not None and btn.pos() != QPoint(x, y):
+                anim = QPropertyAnimation(btn, b"pos")
+                anim.setDuration(BubbleLayoutManager.ANIMATION_DURATION)
+                anim.setEndValue(QPoint(x, y))
+                anim.setEasingCurve(QEasingCurve.OutCubic)
+                group.addAnimation(anim)
             else:
-                # --- Parent NON-FOCUS ---
-                apply_circle_style(p_btn, size_parent, p_color)
-
-                if i < TOTAL_SLOTS:
-                    angle = angle_step * i - (math.pi / 2)
-                    px = cx + math.cos(angle) * dist_parent
-                    py = cy + math.sin(angle) * dist_parent
-                    
-                    p_btn.move(int(px - p_btn.width()/2), int(py - p_btn.height()/2))
-                    
-                    # Enfants Fleur serrée
-                    p_radius = p_btn.width() / 2
-                    
-                    for j, child_item in enumerate(children):
-                        if j >= TOTAL_SLOTS: break
-                        c_btn = child_item['btn'] if isinstance(child_item, dict) else child_item
-                        c_color = item['children_colors'][j] if 'children_colors' in item and j < len(item['children_colors']) else '#555'
-                        
-                        c_btn.show()
-                        apply_circle_style(c_btn, size_child, c_color)
-                        
-                        c_radius = c_btn.width() / 2
-                        orbit_radius = p_radius + c_radius + (15 * scale_factor)
-                        c_angle = angle_step * j - (math.pi / 2)
-                        c_px = px + math.cos(c_angle) * orbit_radius
-                        c_py = py + math.sin(c_angle) * orbit_radius
-                        c_btn.move(int(c_px - c_btn.width()/2), int(c_py - c_btn.height()/2))
-                else:
-                     item['btn'].hide()
-                     for c in children:
-                         c_btn = c['btn'] if isinstance(c, dict) else c
-                         c_btn.hide()
+                btn.move(x, y)
+
+        for i, item in enumerate(bubbles):
+            parent_geo, children_geo = parents[i]
+            place(item['btn'], parent_geo, item.get('color', '#333'))
+
+            c_colors = item.get('children_colors', [])
+            for k, c_btn in enumerate(item['children']):
+                c_color = c_colors[k] if k < len(c_colors) else '#555'
+                place(c_btn, children_geo[k], c_color)
+                if i == focus_index:
+                    c_btn.raise_()
+
+        if group is not None and group.animationCount() > 0:
+            start_animation(group)
+            return group
+        return None
 
 from vues.custom_dialog import StyledDialog
+from vues.visibility import DeferredUpdates, start_animation
+from vues.key_combos import combo_from_event
 
 class SelectionDialog(StyledDialog):
     """
@@ -155,13 +219,133 @@ class SelectionDialog(StyledDialog):
         # On peut ajouter des styles spécifiques ici si nécessaire
 
 
+class RunningTimersPanel(QFrame):
+    """
+    Liste compacte des chronos en cours : une ligne par chrono (nom, temps, pause, arrêt)
+    et un bouton pour tous les arrêter d'un coup.
+    """
+    timer_clicked = Signal(int) # slot du chrono à afficher au centre
+    toggle_requested = Signal(int)
+    stop_requested = Signal(int)
+    stop_all_requested = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setObjectName("running_timers_panel")
+        self.setToolTip("Maj+clic sur une bulle : lancer un chrono en parallèle")
+        self.setMinimumWidth(230)
+        self.rows = {} # slot -> (ligne, label du temps)
+        self.rows_key = None
+
+        self.layout_panel = QVBoxLayout(self)
+        self.layout_panel.setContentsMargins(10, 8, 10, 8)
+        self.layout_panel.setSpacing(4)
+        # Panneau superposé (hors layout) : sa taille suit son contenu
+        self.layout_panel.setSizeConstraint(QLayout.SetFixedSize)
+
+        self.lbl_title = QLabel("Chronos en cours")
+        self.lbl_title.setObjectName("lbl_running_timers_title")
+        self.layout_panel.addWidget(self.lbl_title)
+
+        self.rows_layout = QVBoxLayout()
+        self.rows_layout.setSpacing(2)
+        self.layout_panel.addLayout(self.rows_layout)
+
+        self.btn_stop_all = QPushButton("Tout arrêter")
+        self.btn_stop_all.setObjectName("btn_stop_all_timers")
+        self.btn_stop_all.setCursor(Qt.PointingHandCursor)
+        self.btn_stop_all.clicked.connect(self.stop_all_requested.emit)
+        self.layout_panel.addWidget(self.btn_stop_all)
+
+        self.hide()
+
+    def set_timers(self, timers):
+        """timers : liste de (slot, nom, en_cours, affiché_au_centre). Reconstruit seulement si elle a changé."""
+        key = tuple(timers)
+        if key == self.rows_key:
+            return
+        self.rows_key = key
+
+        for row, _ in self.rows.values():
+            row.hide()
+            self.rows_layout.removeWidget(row)
+            row.deleteLater()
+        self.rows = {}
+
+        for slot, name, running, focused in timers:
+            row = QWidget()
+            row.setObjectName("running_timer_row")
+            row.setProperty("focused", focused)
+            row_layout = QHBoxLayout(row)
+            row_layout.setContentsMargins(0, 0, 0, 0)
+            row_layout.setSpacing(4)
+
+            btn_name = QPushButton(name)
+            btn_name.setObjectName("btn_running_timer_name")
+            btn_name.setCursor(Qt.PointingHandCursor)
+            btn_name.clicked.connect(lambda _=False, s=slot: self.timer_clicked.emit(s))
+            row_layout.addWidget(btn_name, 1)
+
+            lbl_time = QLabel("00:00:00")
+            lbl_time.setObjectName("lbl_running_timer_time")
+            row_layout.addWidget(lbl_time)
+
+            btn_toggle = QPushButton("❚❚" if running else "▶")
+            btn_toggle.setObjectName("btn_running_timer_action")
+            btn_toggle.setFixedSize(24, 24)
+            btn_toggle.setCursor(Qt.PointingHandCursor)
+            btn_toggle.setToolTip("Pause" if running else "Reprendre")
+            btn_toggle.clicked.connect(lambda _=False, s=slot: self.toggle_requested.emit(s))
+            row_layout.addWidget(btn_toggle)
+
+            btn_stop = QPushButton("■")
+            btn_stop.setObjectName("btn_running_timer_action")
+            btn_stop.setFixedSize(24, 24)
+            btn_stop.setCursor(Qt.PointingHandCursor)
+            btn_stop.setToolTip("Arrêter et enregistrer")
+            btn_stop.clicked.connect(lambda _=False, s=slot: self.stop_requested.emit(s))
+            row_layout.addWidget(btn_stop)
+
+            self.rows_layout.addWidget(row)
+            self.rows[slot] = (row, lbl_time)
+
+        self.btn_stop_all.setVisible(len(timers) > 1)
+        self.setVisible(bool(timers))
+
+    def update_times(self, times):
+        """times : {slot: texte} des seuls chronos dont la seconde affichée a changé."""
+        for slot, text in times.items():
+            if slot in self.rows:
+                self.rows[slot][1].setText(text)
+
+
 class NewChronoView(QWidget):
     escape_pressed = Signal()
     space_pressed = Signal()
     
+    CHORD_TIMEOUT_MS = 1500 # Délai maximal entre deux accords d'une même séquence
+    
     def __init__(self):
         super().__init__()
         self.setFocusPolicy(Qt.StrongFocus) 
+        # Temps affichés : pas de repeinture tant que la page est masquée ou la fenêtre réduite
+        self.updates = DeferredUpdates(self)
+        
+        # Raccourcis : table {accords: action} fournie par le présentateur
+        self.shortcut_table = {}
+        self.shortcut_prefixes = {}
+        self.pending_chords = ()
+        self.chord_timer = QTimer(self)
+        self.chord_timer.setSingleShot(True)
+        self.chord_timer.timeout.connect(self.reset_pending_chords)
+        self.shortcut_handlers = {
+            "PAUSE_RESUME": self.space_pressed.emit,
+            "STOP_TIMER": self.escape_pressed.emit,
+            "NEXT_PAGE": self.next_page,
+            "PREV_PAGE": self.previous_page,
+        }
+        for i in range(10):
+            self.shortcut_handlers[f"BUBBLE_{i}"] = partial(self.trigger_bubble_at_index, i)
         
         self.main_layout = QHBoxLayout(self)
         self.main_layout.setContentsMargins(0, 0, 0, 0)
@@ -246,8 +430,14 @@ class NewChronoView(QWidget):
 
         self.main_layout.addWidget(self.sidebar)
 
-        self.bubbles = []
+        self.bubbles = [] # Bulles de la page affichée
+        self.activities_data = [] # Tous les parents (données)
+        self.on_bubble_click = None
+        self.pages = {} # index de page -> bulles déjà créées
+        self.page_index = 0
         self.current_focus_ptr = None # Pour stocker le parent focus actuel
+        self.last_layout_key = None # Dernière disposition appliquée
+        self.layout_animation = None # Transition en cours entre deux dispositions
 
         # --- Dimmer pour le mode Focus ---
         self.dimmer = QWidget(self.bubble_container)
@@ -278,46 +468,78 @@ class NewChronoView(QWidget):
         self.btn_stop.setObjectName("btn_stop_center")
         self.btn_stop.hide() 
 
+        # --- Pagination de l'anneau ---
+        self.page_bar = QWidget(self.bubble_container)
+        self.page_bar.setObjectName("bubble_page_bar")
+        page_layout = QHBoxLayout(self.page_bar)
+        page_layout.setContentsMargins(0, 0, 0, 0)
+
+        self.btn_page_prev = QPushButton("‹")
+        self.btn_page_prev.setObjectName("btn_page_nav")
+        self.btn_page_prev.setFixedSize(30, 30)
+        self.btn_page_prev.setCursor(Qt.PointingHandCursor)
+        self.btn_page_prev.setToolTip("Page précédente")
+        self.btn_page_prev.clicked.connect(self.previous_page)
+        page_layout.addWidget(self.btn_page_prev)
+
+        self.lbl_page = QLabel("1 / 1")
+        self.lbl_page.setObjectName("lbl_bubble_page")
+        self.lbl_page.setAlignment(Qt.AlignCenter)
+        page_layout.addWidget(self.lbl_page)
+
+        self.btn_page_next = QPushButton("›")
+        self.btn_page_next.setObjectName("btn_page_nav")
+        self.btn_page_next.setFixedSize(30, 30)
+        self.btn_page_next.setCursor(Qt.PointingHandCursor)
+        self.btn_page_next.setToolTip("Page suivante")
+        self.btn_page_next.clicked.connect(self.next_page)
+        page_layout.addWidget(self.btn_page_next)
+
+        self.page_bar.setFixedSize(130, 30)
+        self.page_bar.hide()
+
+        # --- Chronos en cours (en haut à gauche) ---
+        self.timers_panel = RunningTimersPanel(self.bubble_container)
+        self.timers_panel.move(10, 10)
+
         # Lancer le repositionnement après un court délai pour laisser le layout s'installer
         QTimer.singleShot(50, self.reposition_bubbles)
 
     def set_activities(self, activities_data, on_click_callback):
+        """
+        Reçoit la liste complète des parents (avec leurs enfants).
+        Les parents sont répartis en pages de TOTAL_SLOTS bulles : seuls les widgets
+        de la page affichée (et de ses voisines préchargées) sont créés.
+        Les enfants d'un parent sont paginés de la même façon : seule sa page d'enfants
+        affichée est instanciée, les suivantes se parcourent quand le parent est en focus.
+        """
         # 1. Sauvegarder focus
         old_focus_id = self.current_focus_ptr['id'] if self.current_focus_ptr else None
         self.current_focus_ptr = None
         if hasattr(self, 'dimmer'): self.dimmer.hide()
         
-        for item in self.bubbles:
-            item['btn'].deleteLater()
-            for child_btn in item['children']:
-                child_btn.deleteLater()
+        for page in self.pages.values():
+            self.destroy_page(page)
+        self.pages = {}
         self.bubbles = []
 
-        for parent_data in activities_data:
-            p_id, p_label = parent_data['id'], parent_data['label']
-            p_color = parent_data.get('color', '#cccccc')
-            
-            p_btn = self.create_bubble_btn(p_label, 100, f"background-color: {p_color}; border-radius: 50px;") 
-            p_btn.show()
-            
-            p_btn.clicked.connect(lambda checked=False, aid=p_id, lbl=p_label: on_click_callback(aid, lbl, True))
-            
-            children_btns = []
-            for child_data in parent_data['children']:
-                c_btn = self.create_bubble_btn(child_data['label'], 40, f"background-color: {child_data.get('color', p_color)}; border-radius: 20px;")
-                c_btn.show()
-                # On cache le texte des petites bulles par défaut
-                lbl = c_btn.findChild(QLabel)
-                if lbl: lbl.hide()
-                
-                c_btn.clicked.connect(lambda checked=False, aid=child_data['id'], lbl=child_data['label']: on_click_callback(aid, lbl, False))
-                children_btns.append(c_btn)
-            
-            self.bubbles.append({
-                'id': p_id, 'btn': p_btn, 'children': children_btns,
-                'expanded': False, 'color': p_color,
-                'children_colors': [c.get('color', p_color) for c in parent_data['children']]
-            })
+        self.activities_data = list(activities_data)
+        self.on_bubble_click = on_click_callback
+
+        # Rester sur la page courante si elle existe encore, sinon aller à celle du focus
+        target_page = min(self.page_index, self.page_count() - 1)
+        if old_focus_id:
+            for i, parent_data in enumerate(self.activities_data):
+                if parent_data['id'] == old_focus_id:
+                    target_page = i // TOTAL_SLOTS
+                    break
+
+        self.page_index = target_page
+        self.bubbles = self.build_page(target_page)
+        self.update_page_bar()
+
+        # Nouveaux widgets : la prochaine disposition doit être appliquée
+        self.last_layout_key = None
 
         # Relance du layout / Restauration du focus
         def restore():
@@ -333,9 +555,151 @@ class NewChronoView(QWidget):
                     self.reposition_bubbles()
             else:
                 self.reposition_bubbles()
+            self.prefetch_neighbours()
                 
         QTimer.singleShot(10, restore)
 
+    def page_count(self):
+        return max(1, math.ceil(len(self.activities_data) / TOTAL_SLOTS))
+
+    def build_page(self, index):
+        """Crée (une seule fois) les bulles de la page `index`. Les widgets restent cachés jusqu'au layout."""
+        if index in self.pages:
+            return self.pages[index]
+
+        on_click_callback = self.on_bubble_click
+        items = []
+        for parent_data in self.activities_data[index * TOTAL_SLOTS:(index + 1) * TOTAL_SLOTS]:
+            p_id, p_label = parent_data['id'], parent_data['label']
+            p_color = parent_data.get('color', '#cccccc')
+            
+            p_btn = self.create_bubble_btn(p_label, 100, f"background-color: {p_color}; border-radius: 50px;") 
+            p_btn.hide()
+            
+            p_btn.clicked.connect(lambda checked=False, aid=p_id, lbl=p_label: on_click_callback(aid, lbl, True))
+            
+            item = {
+                'id': p_id, 'btn': p_btn, 'children': [],
+                'expanded': False, 'color': p_color,
+                'children_data': parent_data['children'], 'child_page': 0,
+                'children_colors': []
+            }
+            self.build_children(item, 0)
+            items.append(item)
+
+        self.pages[index] = items
+        return items
+
+    def child_page_count(self, item):
+        return max(1, math.ceil(len(item['children_data']) / TOTAL_SLOTS))
+
+    def build_children(self, item, page):
+        """(Re)crée les bulles enfants de la page `page` du parent : les autres pages ne sont pas instanciées."""
+        for c_btn in item['children']:
+            c_btn.deleteLater()
+
+        on_click_callback = self.on_bubble_click
+        p_color = item['color']
+        page_data = item['children_data'][page * TOTAL_SLOTS:(page + 1) * TOTAL_SLOTS]
+        children_btns = []
+        for child_data in page_data:
+            c_btn = self.create_bubble_btn(child_data['label'], 40, f"background-color: {child_data.get('color', p_color)}; border-radius: 20px;")
+            c_btn.hide()
+            # Texte des petites bulles visible uniquement en focus
+            c_btn.bubble_label.setVisible(item is self.current_focus_ptr)
+            
+            c_btn.clicked.connect(lambda checked=False, aid=child_data['id'], lbl=child_data['label']: on_click_callback(aid, lbl, False))
+            children_btns.append(c_btn)
+
+        item['children'] = children_btns
+        item['children_colors'] = [c.get('color', p_color) for c in page_data]
+        item['child_page'] = page
+
+    def reset_child_page(self, item):
+        """Revient à la première page d'enfants (la seule affichée en fleur hors focus)."""
+        if item['child_page'] != 0:
+            self.build_children(item, 0)
+
+    def destroy_page(self, items):
+        for item in items:
+            item['btn'].deleteLater()
+            for child_btn in item['children']:
+                child_btn.deleteLater()
+
+    def neighbour_pages(self, index):
+        count = self.page_count()
+        return {index, (index + 1) % count, (index - 1) % count}
+
+    def prefetch_neighbours(self):
+        """Précharge les pages voisines (anneau) et libère les pages plus éloignées."""
+        keep = self.neighbour_pages(self.page_index)
+        for index in list(self.pages):
+            if index not in keep:
+                self.destroy_page(self.pages.pop(index))
+        for index in keep:
+            self.build_page(index)
+
+    def show_page(self, index):
+        """Affiche la page `index` de l'anneau (les indices bouclent)."""
+        count = self.page_count()
+        index %= count
+        if index == self.page_index and self.bubbles:
+            return
+
+        # Quitter le focus et cacher la page courante
+        self.current_focus_ptr = None
+        self.dimmer.hide()
+        for item in self.bubbles:
+            item['expanded'] = False
+            self.reset_child_page(item)
+            item['btn'].hide()
+            for c_btn in item['children']:
+                c_btn.hide()
+                c_btn.bubble_label.hide()
+
+        self.page_index = index
+        self.bubbles = self.build_page(index)
+        self.update_page_bar()
+        self.reposition_bubbles()
+
+        # Préchargement hors du chemin critique
+        QTimer.singleShot(0, self.prefetch_neighbours)
+
+    def show_child_page(self, index):
+        """Affiche la page `index` des enfants du parent en focus (les indices bouclent)."""
+        item = self.current_focus_ptr
+        if item is None:
+            return
+        index %= self.child_page_count(item)
+        if index == item['child_page']:
+            return
+
+        self.build_children(item, index)
+        self.update_page_bar()
+        self.reposition_bubbles()
+
+    def next_page(self):
+        # En focus, les flèches parcourent les enfants du parent ; sinon l'anneau des parents
+        if self.current_focus_ptr:
+            self.show_child_page(self.current_focus_ptr['child_page'] + 1)
+        else:
+            self.show_page(self.page_index + 1)
+
+    def previous_page(self):
+        if self.current_focus_ptr:
+            self.show_child_page(self.current_focus_ptr['child_page'] - 1)
+        else:
+            self.show_page(self.page_index - 1)
+
+    def update_page_bar(self):
+        if self.current_focus_ptr:
+            count = self.child_page_count(self.current_focus_ptr)
+            index = self.current_focus_ptr['child_page']
+        else:
+            count, index = self.page_count(), self.page_index
+        self.page_bar.setVisible(count > 1)
+        self.lbl_page.setText(f"{index + 1} / {count}")
+
     def create_bubble_btn(self, text, size, style):
         btn = QPushButton(self.bubble_container) 
         btn.setFixedSize(size, size)
@@ -347,10 +711,32 @@ class NewChronoView(QWidget):
         lbl.setStyleSheet("color: white; font-weight: bold; border: none; background: transparent;")
         lbl.setAttribute(Qt.WA_TransparentForMouseEvents)
         layout.addWidget(lbl)
+        btn.bubble_label = lbl
         return btn
 
-    def reposition_bubbles(self, force=True):
-        BubbleLayoutManager.apply_layout(self.bubbles, self.center_widget, self.bubble_container.rect(), self.current_focus_ptr)
+    def reposition_bubbles(self, force=True, animate=False):
+        """
+        Applique la disposition courante.
+        Sans force, rien n'est fait si la clé (taille, nombre de bulles, enfants, focus) est inchangée.
+        """
+        key = BubbleLayoutManager.layout_key(self.bubbles, self.center_widget, self.bubble_container.rect(), self.current_focus_ptr)
+        if not force and key == self.last_layout_key:
+            return
+
+        # Une transition en cours est interrompue : la nouvelle disposition s'applique directement
+        if self.layout_animation is not None:
+            self.layout_animation.stop()
+            self.layout_animation = None
+
+        self.last_layout_key = key
+        self.layout_animation = BubbleLayoutManager.apply_layout(
+            self.bubbles, self.center_widget, self.bubble_container.rect(), self.current_focus_ptr, animate)
+
+        # Barre de pages en bas, centrée
+        rect = self.bubble_container.rect()
+        self.page_bar.move(int(rect.center().x() - self.page_bar.width() / 2), rect.height() - self.page_bar.height() - 10)
+        self.page_bar.raise_()
+        self.timers_panel.raise_()
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
@@ -362,50 +748,52 @@ class NewChronoView(QWidget):
              if self.sidebar.width() > 100:
                  self.set_panel_collapsed(True)
                  
-        self.reposition_bubbles()
+        self.reposition_bubbles(force=False)
+
+    def set_shortcut_table(self, by_combo, prefixes):
+        """
+        Reçoit les tables du registre des raccourcis :
+        {tuple d'accords: ACTION_CODE} et les débuts des séquences à plusieurs accords.
+        """
+        self.shortcut_table = by_combo
+        self.shortcut_prefixes = prefixes
+        self.pending_chords = ()
+
+    def match_shortcut(self, combo):
+        """
+        Ajoute l'accord frappé à la séquence en cours et retourne l'action reconnue (ou None).
+        Une séquence inachevée est gardée CHORD_TIMEOUT_MS en attendant l'accord suivant.
+        """
+        chords = self.pending_chords + (combo,)
+        if chords not in self.shortcut_table and chords not in self.shortcut_prefixes and self.pending_chords:
+            # Séquence interrompue : la frappe peut commencer une autre séquence
+            chords = (combo,)
+        action = self.shortcut_table.get(chords)
+        if action is None and chords in self.shortcut_prefixes:
+            self.pending_chords = chords
+            self.chord_timer.start(self.CHORD_TIMEOUT_MS)
+        else:
+            self.pending_chords = ()
+            self.chord_timer.stop()
+        return action
 
-    def set_shortcuts_config(self, config_dict):
-        """Reçoit {ACTION_CODE: STR_SEQUENCE}"""
-        self.shortcuts_map = {}
-        for code, seq_str in config_dict.items():
-            self.shortcuts_map[code] = QKeySequence(seq_str)
+    def reset_pending_chords(self):
+        self.pending_chords = ()
 
     def keyPressEvent(self, event):
-        key = event.key()
-        modifiers = event.modifiers()
-        
-        # On construit une sequence à partir de l'event pour comparer
-        # Utilisation du cast en int pour compatibilité PySide6 robuste sans QKeyCombination explicite
-        # .value requis pour les ENUMS PySide6, mais safe check si int
-        m_val = modifiers.value if hasattr(modifiers, 'value') else int(modifiers)
-        k_val = key.value if hasattr(key, 'value') else int(key)
-        
-        val = m_val | k_val
-        event_seq = QKeySequence(val)
-        
-        # On compare avec notre map
-        # Note: matches() de QKeySequence est parfois tricky avec les modifiers.
-        # Une comparaison simple d'égalité sur les objets QKeySequence ou sur toString() fonctionne souvent mieux pour des raccourcis simples.
-        
-        matched_action = None
-        
-        if hasattr(self, 'shortcuts_map'):
-            for code, seq in self.shortcuts_map.items():
-                if seq.matches(event_seq) == QKeySequence.ExactMatch:
-                    matched_action = code
-                    break
+        if event.key() in (Qt.Key_Control, Qt.Key_Shift, Qt.Key_Alt, Qt.Key_Meta):
+            super().keyPressEvent(event) # Modificateur seul : ne coupe pas une séquence en cours
+            return
+
+        pending = bool(self.pending_chords)
+        matched_action = self.match_shortcut(combo_from_event(event))
+        if matched_action is None and (pending or self.pending_chords):
+            event.accept() # Accord d'une séquence à plusieurs accords
+            return
         
-        if matched_action:
-            if matched_action == "PAUSE_RESUME":
-                self.space_pressed.emit()
-            elif matched_action == "STOP_TIMER":
-                self.escape_pressed.emit()
-            elif matched_action.startswith("BUBBLE_"):
-                try:
-                    idx = int(matched_action.split("_")[1])
-                    self.trigger_bubble_at_index(idx)
-                except:
-                    pass
+        handler = self.shortcut_handlers.get(matched_action)
+        if handler:
+            handler()
             event.accept()
             return
             
@@ -413,21 +801,42 @@ class NewChronoView(QWidget):
         # Mais ici c'est une vue principale, donc on pass
         super().keyPressEvent(event)
 
+    def wheelEvent(self, event):
+        # La molette fait tourner l'anneau d'une page (celui des enfants en focus)
+        if self.current_focus_ptr:
+            pages = self.child_page_count(self.current_focus_ptr)
+        else:
+            pages = self.page_count()
+        if pages > 1:
+            if event.angleDelta().y() < 0:
+                self.next_page()
+            elif event.angleDelta().y() > 0:
+                self.previous_page()
+            event.accept()
+            return
+        super().wheelEvent(event)
+
     def trigger_bubble_at_index(self, index):
         if self.current_focus_ptr:
-            # Mode Focus : Sélection d'un enfant
+            # Mode Focus : Sélection d'un enfant de la page d'enfants affichée
             children = self.current_focus_ptr['children']
             if 0 <= index < len(children):
                 children[index].animateClick() # animateClick donne un feedback visuel
         else:
-            # Mode Racine : Sélection d'un parent
-            # On ne prend que ceux qui sont affichés (les 10 premiers max)
-            visible_bubbles = self.bubbles[:10]
-            if 0 <= index < len(visible_bubbles):
-                visible_bubbles[index]['btn'].animateClick()
+            # Mode Racine : Sélection d'un parent de la page affichée
+            if 0 <= index < len(self.bubbles):
+                self.bubbles[index]['btn'].animateClick()
 
     def update_time(self, text):
-        self.lbl_time.setText(text)
+        self.updates.apply("time", self.lbl_time.setText, text)
+
+    def set_running_timers(self, timers):
+        self.timers_panel.set_timers(timers)
+        self.timers_panel.raise_()
+
+    def update_running_times(self, times):
+        for slot, text in times.items():
+            self.updates.apply(("running_time", slot), self.timers_panel.update_times, {slot: text})
 
     def set_activity_name(self, text):
         self.lbl_activity_name.setText(text) 
@@ -440,67 +849,22 @@ class NewChronoView(QWidget):
         shadow.setColor(Qt.black) 
         widget.setGraphicsEffect(shadow)
 
-    def get_parent_style(self, active, color):
-        size = 130 if active else 100
-        radius = size // 2
-        return f"""
-            QPushButton {{
-                background-color: {color};
-                border-radius: {radius}px;
-                color: white; font-weight: bold;
-            }}
-            QPushButton:hover {{ border: 2px solid white; }}
-        """
-
-    def get_child_style(self, active, color):
-        size = 90 if active else 40 # 90 pour le mode focus
-        radius = size // 2
-        return f"""
-            QPushButton {{
-                background-color: {color};
-                border-radius: {radius}px;
-                color: white; font-weight: bold;
-            }}
-            QPushButton:hover {{ border: 2px solid white; }}
-        """
-
     def set_focus_parent(self, parent_id):
-        # Gestion de l'état "Focus"
+        # Gestion de l'état "Focus" : tailles et couleurs sont appliquées par le layout
         focus_item = None
         
         for item in self.bubbles:
             is_target = (item['id'] == parent_id)
             item['expanded'] = is_target 
             
-            p_btn = item['btn']
-            color = item['color']
-            children = item['children']
-            c_colors = item['children_colors']
-            
             if is_target:
                 focus_item = item
-                
-                p_btn.setFixedSize(140, 140) 
-                p_btn.setStyleSheet(self.get_parent_style(True, color))
-                
-                
-                for i, c_btn in enumerate(children):
-                    c_btn.setFixedSize(90, 90) # Devenues grosses
-                    c_btn.setStyleSheet(self.get_child_style(True, c_colors[i]))
-                    # Afficher texte
-                    lbl = c_btn.findChild(QLabel)
-                    if lbl: lbl.show()
             else:
-                # Style normal
-                p_btn.setFixedSize(100, 100)
-                p_btn.setStyleSheet(self.get_parent_style(False, color))
+                self.reset_child_page(item)
                 
-                for i, c_btn in enumerate(children):
-                    c_btn.setFixedSize(40, 40)
-                    c_btn.setStyleSheet(self.get_child_style(False, c_colors[i]))
-                    # Cacher texte
-                    lbl = c_btn.findChild(QLabel)
-                    if lbl: lbl.hide()
+            # Texte des enfants visible uniquement en focus
+            for c_btn in item['children']:
+                c_btn.bubble_label.setVisible(is_target)
         
         self.current_focus_ptr = focus_item
         self.dimmer.show() # Activer le fond sombre
@@ -511,7 +875,8 @@ class NewChronoView(QWidget):
             focus_item['btn'].raise_()
             for c in focus_item['children']: c.raise_()
         
-        self.reposition_bubbles()
+        self.update_page_bar()
+        self.reposition_bubbles(animate=True)
 
     def reset_focus(self):
         self.current_focus_ptr = None
@@ -519,21 +884,13 @@ class NewChronoView(QWidget):
         
         for item in self.bubbles:
             item['expanded'] = False
-            item['btn'].show() # Tout remontrer
-            item['btn'].setFixedSize(100, 100)
-            item['btn'].setStyleSheet(self.get_parent_style(False, item['color']))
-            
-            children = item['children']
-            c_colors = item['children_colors']
-            for i, c_btn in enumerate(children):
-                c_btn.show() # Tout remontrer
-                c_btn.setFixedSize(40, 40)
-                c_btn.setStyleSheet(self.get_child_style(False, c_colors[i]))
+            self.reset_child_page(item)
+            for c_btn in item['children']:
                 # Cacher texte
-                lbl = c_btn.findChild(QLabel)
-                if lbl: lbl.hide()
+                c_btn.bubble_label.hide()
                 
-        self.reposition_bubbles()
+        self.update_page_bar()
+        self.reposition_bubbles(animate=True)
 
     def toggle_panel(self):
         width = self.sidebar.width()
@@ -580,8 +937,8 @@ class NewChronoView(QWidget):
             self.dimmer.resize(self.bubble_container.size())
 
         self.anim_max.finished.connect(on_finished)
-        self.anim_min.start()
-        self.anim_max.start()
+        start_animation(self.anim_min)
+        start_animation(self.anim_max)
 
         # Si on collapse, on peut cacher le texte tout de suite pour éviter glitch visuel
         if collapsed:
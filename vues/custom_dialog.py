@@ -134,11 +134,11 @@ class CustomMessageBox(StyledDialog):
         dlg.exec()
 
     @staticmethod
-    def question(parent, title, text):
+    def question(parent, title, text, yes_text="Oui", no_text="Non"):
         dlg = CustomMessageBox(parent, title, text, "question")
-        dlg.btn_ok.setText("Oui")
+        dlg.btn_ok.setText(yes_text)
         
-        btn_no = QPushButton("Non")
+        btn_no = QPushButton(no_text)
         btn_no.setObjectName("btn_stop")
         btn_no.setCursor(Qt.PointingHandCursor)
         btn_no.setMinimumWidth(100)
@@ -4,6 +4,8 @@ from PySide6.QtCore import Qt, Signal, QSize, QPropertyAnimation, QEasingCurve
 from PySide6.QtGui import QIcon
 import os
 
+from vues.visibility import start_animation
+
 # Chemin vers le dossier des icônes
 ICON_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "assets", "icons")
 
@@ -46,6 +48,8 @@ class DashboardView(QWidget):
     Vue principale du tableau de bord.
     Contient la barre latérale de navigation et la zone de contenu principale.
     """
+    sidebar_toggled = Signal(bool) # Barre latérale réduite (True) ou dépliée par l'utilisateur
+
     def __init__(self):
         """Initialise la vue du tableau de bord"""
         super().__init__()
@@ -134,15 +138,21 @@ class DashboardView(QWidget):
         self.btn_accueil.setChecked(True) # Accueil par défaut
         
         self.is_collapsed = False
+        
+        # Pages construites à la demande : index -> fonction de construction
+        self.page_factories = {}
 
     def toggle_sidebar(self):
-        if not self.is_collapsed:
-            self.animate_sidebar(70) # Taille réduite
-        else:
-            self.animate_sidebar(250) # Taille normale
-        self.is_collapsed = not self.is_collapsed
+        self.set_sidebar_collapsed(not self.is_collapsed)
+        self.sidebar_toggled.emit(self.is_collapsed)
+
+    def set_sidebar_collapsed(self, collapsed, animated=True):
+        """Réduit ou déplie la barre latérale (sans animation pour restaurer l'état au démarrage)."""
+        self.is_collapsed = collapsed
+        self.btn_toggle.setChecked(collapsed)
+        self.animate_sidebar(70 if collapsed else 250, animated) # Taille réduite / normale
 
-    def animate_sidebar(self, target_width):
+    def animate_sidebar(self, target_width, animated=True):
         """
         Anime le changement de largeur de la barre latérale.
         Met également à jour la visibilité des textes et l'état des boutons.
@@ -151,22 +161,25 @@ class DashboardView(QWidget):
         
         is_target_collapsed = (target_width < 150)
         
-        # Animation de la largeur minimale (pour forcer le changement)
-        self.anim_min = QPropertyAnimation(self.sidebar, b"minimumWidth")
-        self.anim_min.setDuration(300)
-        self.anim_min.setStartValue(current_width)
-        self.anim_min.setEndValue(target_width)
-        self.anim_min.setEasingCurve(QEasingCurve.InOutQuart)
-        
-        # Animation de la largeur maximale
-        self.anim_max = QPropertyAnimation(self.sidebar, b"maximumWidth")
-        self.anim_max.setDuration(300)
-        self.anim_max.setStartValue(current_width)
-        self.anim_max.setEndValue(target_width)
-        self.anim_max.setEasingCurve(QEasingCurve.InOutQuart)
-        
-        self.anim_min.start()
-        self.anim_max.start()
+        if not animated:
+            self.sidebar.setFixedWidth(target_width)
+        else:
+            # Animation de la largeur minimale (pour forcer le changement)
+            self.anim_min = QPropertyAnimation(self.sidebar, b"minimumWidth")
+            self.anim_min.setDuration(300)
+            self.anim_min.setStartValue(current_width)
+            self.anim_min.setEndValue(target_width)
+            self.anim_min.setEasingCurve(QEasingCurve.InOutQuart)
+            
+            # Animation de la largeur maximale
+            self.anim_max = QPropertyAnimation(self.sidebar, b"maximumWidth")
+            self.anim_max.setDuration(300)
+            self.anim_max.setStartValue(current_width)
+            self.anim_max.setEndValue(target_width)
+            self.anim_max.setEasingCurve(QEasingCurve.InOutQuart)
+            
+            start_animation(self.anim_min)
+            start_animation(self.anim_max)
         
         # Afficher/Masquer le titre "TaskTime" et ajuster le layout
         if is_target_collapsed:
@@ -195,9 +208,46 @@ class DashboardView(QWidget):
         self.stack.addWidget(page_analyses)     # Index 3
         self.stack.addWidget(page_settings)     # Index 4
 
+    def set_lazy_pages(self, pages):
+        """
+        Remplit le QStackedWidget à partir d'une liste ordonnée d'éléments qui sont soit
+        un widget déjà construit, soit une fonction le construisant.
+        Les pages différées sont représentées par un widget vide jusqu'à leur premier affichage.
+        """
+        for index, page in enumerate(pages):
+            if callable(page) and not isinstance(page, QWidget):
+                self.page_factories[index] = page
+                page = QWidget()
+                page.setObjectName("page_placeholder")
+            self.stack.addWidget(page)
+
+    def is_page_built(self, index):
+        return index not in self.page_factories
+
+    def ensure_page(self, index):
+        """Construit la page si elle ne l'est pas encore et la retourne."""
+        factory = self.page_factories.pop(index, None)
+        if factory is None:
+            return self.stack.widget(index)
+        
+        page = factory()
+        placeholder = self.stack.widget(index)
+        self.stack.insertWidget(index, page)
+        self.stack.removeWidget(placeholder)
+        placeholder.deleteLater()
+        return page
+
+    def build_next_pending_page(self):
+        """Construit la première page encore différée. Retourne False s'il n'en reste plus."""
+        if not self.page_factories:
+            return False
+        self.ensure_page(min(self.page_factories))
+        return True
+
     def switch_page(self, index):
         """
         Change la page affichée dans la zone de contenu et met à jour l'état des boutons.
+        La page est construite à ce moment-là si elle ne l'a pas encore été.
         """
         # Met à jour l'état 'checked' des boutons
         self.btn_accueil.setChecked(index == 0)
@@ -208,6 +258,7 @@ class DashboardView(QWidget):
              
         # Change la page dans le QStackedWidget si l'index est valide
         if index < self.stack.count():
+             self.ensure_page(index)
              self.stack.setCurrentIndex(index)
              # Donner le focus à la page actuelle pour que les raccourcis clavier fonctionnent immédiatement
              current_widget = self.stack.currentWidget()
@@ -0,0 +1,300 @@
+"""
+Chronologie des sessions (une ligne par jour, axe des heures) pour la page Analyses.
+Zoom et déplacement ne relisent pas les données : les blocs visibles et le bloc survolé
+sont retrouvés dans un IntervalHitIndex construit une fois par jeu de données.
+"""
+
+import math
+
+from PySide6.QtWidgets import QWidget, QToolTip
+from PySide6.QtGui import QPainter, QPixmap, QColor, QPen
+from PySide6.QtCore import Qt, QPointF, QRect, QRectF, QEvent
+
+from models.timeline import DAY_SECONDS
+from vues.chart_format import JOURS_MAP, JOURS_COMPLETS, format_duration
+from vues.hit_test import IntervalHitIndex
+from vues.palette import qbrush, OTHER_COLOR
+
+
+class DayTimelineWidget(QWidget):
+    """
+    Chronologie : une ligne par jour, chaque session dessinée comme un bloc sur l'axe des heures.
+    Molette : zoom autour du curseur ; glisser : déplacement ; double-clic : journée entière.
+    Seuls les blocs de la fenêtre visible sont dessinés, retrouvés (comme le bloc survolé)
+    dans un IntervalHitIndex construit une fois par jeu de données, en secondes depuis minuit :
+    ni le zoom ni le déplacement ne le reconstruisent.
+    """
+    MARGINS = (70, 10, 20, 4) # gauche, droite, haut (heures), bas
+    MIN_SPAN = 15 * 60 # Zoom maximal : un quart d'heure sur toute la largeur
+    TICK_STEPS = (5 * 60, 15 * 60, 30 * 60, 3600, 2 * 3600, 3 * 3600, 6 * 3600)
+    MIN_TICK_WIDTH = 50
+    HIT_TOLERANCE = 2 # pixels : les blocs très courts restent faciles à survoler
+
+    def __init__(self):
+        super().__init__()
+        self.timeline = None # DayTimeline affichée
+        self.labels = {}
+        self.color_map = {}
+        self.index = IntervalHitIndex() # (jour, ligne) -> blocs de la ligne
+        self.view_start, self.view_end = 0, DAY_SECONDS
+        self.setMinimumHeight(260)
+        self.setMouseTracking(True)
+        self.setCursor(Qt.OpenHandCursor)
+        self.hovered = None # (jour, ligne, rang du bloc)
+        self.drag_origin = None # (x du clic, début de la fenêtre à ce moment)
+        self.render_cache = None
+        self.render_cache_key = None
+
+    def set_data(self, timeline):
+        if timeline is self.timeline:
+            return
+        self.timeline = timeline
+        self.index.clear()
+        for d, lanes in enumerate(timeline.lanes if timeline else ()):
+            for l, lane in enumerate(lanes):
+                self.index.add_lane((d, l), [(b[0], b[1], (d, l, k)) for k, b in enumerate(lane)])
+        self.invalidate_cache()
+
+    def set_activity_info(self, labels, colors):
+        """Libellés et couleurs des activités (id -> libellé, id -> code hexadécimal)."""
+        if labels == self.labels and colors == self.color_map:
+            return
+        self.labels = labels
+        self.color_map = colors
+        self.invalidate_cache()
+
+    def invalidate_cache(self):
+        self.render_cache = None
+        self.hovered = None
+        self.update()
+
+    def changeEvent(self, event):
+        if event.type() in (QEvent.PaletteChange, QEvent.FontChange, QEvent.StyleChange):
+            self.invalidate_cache()
+        super().changeEvent(event)
+
+    # --- Fenêtre visible ---
+
+    def set_view(self, start, end):
+        span = min(max(end - start, self.MIN_SPAN), DAY_SECONDS)
+        start = min(max(start, 0), DAY_SECONDS - span)
+        if (start, start + span) != (self.view_start, self.view_end):
+            self.view_start, self.view_end = start, start + span
+            self.invalidate_cache()
+
+    def plot_width(self):
+        m_left, m_right, _, _ = self.MARGINS
+        return max(1, self.width() - m_left - m_right)
+
+    def x_of(self, t):
+        return self.MARGINS[0] + (t - self.view_start) * self.plot_width() / (self.view_end - self.view_start)
+
+    def t_of(self, x):
+        return self.view_start + (x - self.MARGINS[0]) * (self.view_end - self.view_start) / self.plot_width()
+
+    def wheelEvent(self, event):
+        delta = event.angleDelta()
+        pos = event.position()
+        span = self.view_end - self.view_start
+        if delta.x() or event.modifiers() & Qt.ShiftModifier:
+            # Défilement horizontal : déplacement
+            steps = (delta.x() or delta.y()) / 120
+            self.set_view(self.view_start - steps * span / 10, self.view_end - steps * span / 10)
+        elif delta.y():
+            # Zoom autour de l'heure sous le curseur
+            anchor = min(max(self.t_of(pos.x()), self.view_start), self.view_end)
+            new_span = min(max(span * 0.8 ** (delta.y() / 120), self.MIN_SPAN), DAY_SECONDS)
+            start = anchor - (anchor - self.view_start) * new_span / span
+            self.set_view(start, start + new_span)
+        event.accept()
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self.drag_origin = (event.position().x(), self.view_start)
+            self.setCursor(Qt.ClosedHandCursor)
+        super().mousePressEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self.drag_origin = None
+            self.setCursor(Qt.OpenHandCursor)
+        super().mouseReleaseEvent(event)
+
+    def mouseDoubleClickEvent(self, event):
+        self.set_view(0, DAY_SECONDS)
+        super().mouseDoubleClickEvent(event)
+
+    # --- Géométrie et survol ---
+
+    def rows(self):
+        """(y du premier jour, hauteur d'un jour) ; None si rien à afficher."""
+        if not self.timeline:
+            return None
+        _, _, m_top, m_bot = self.MARGINS
+        row_h = (self.height() - m_top - m_bot) / self.timeline.days
+        return (m_top, row_h) if row_h > 0 else None
+
+    def lane_geometry(self, day):
+        """(y de la première ligne, hauteur d'une ligne) des blocs d'un jour."""
+        y0, row_h = self.rows()
+        pad = min(3, row_h * 0.15)
+        count = max(1, len(self.timeline.lanes[day]))
+        return y0 + day * row_h + pad, (row_h - 2 * pad) / count
+
+    def block_rect(self, day, lane, block):
+        top, lane_h = self.lane_geometry(day)
+        x1 = self.x_of(block[0])
+        x2 = max(self.x_of(block[1]), x1 + 1) # Au moins un pixel, même pour une session très courte
+        return QRectF(x1, top + lane * lane_h, x2 - x1, max(1.0, lane_h - 1))
+
+    def block_at(self, pos):
+        rows = self.rows()
+        if rows is None or pos.x() < self.MARGINS[0] or pos.x() > self.width() - self.MARGINS[1]:
+            return None
+        y0, row_h = rows
+        day = int((pos.y() - y0) // row_h)
+        if not 0 <= day < self.timeline.days:
+            return None
+        top, lane_h = self.lane_geometry(day)
+        lane = int((pos.y() - top) // lane_h) if lane_h > 0 else -1
+        if not 0 <= lane < len(self.timeline.lanes[day]):
+            return None
+        t = self.t_of(pos.x())
+        found = self.index.find((day, lane), t)
+        if found is None:
+            tolerance = self.HIT_TOLERANCE * (self.view_end - self.view_start) / self.plot_width()
+            near = self.index.overlapping((day, lane), t - tolerance, t + tolerance)
+            found = near[-1] if near else None
+        return found
+
+    def block(self, key):
+        day, lane, k = key
+        return self.timeline.lanes[day][lane][k]
+
+    @staticmethod
+    def clock(seconds):
+        seconds = int(seconds)
+        return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}"
+
+    def mouseMoveEvent(self, event):
+        pos = event.position()
+        if self.drag_origin is not None:
+            x, start = self.drag_origin
+            shift = (pos.x() - x) * (self.view_end - self.view_start) / self.plot_width()
+            span = self.view_end - self.view_start
+            self.set_view(start - shift, start - shift + span)
+            QToolTip.hideText()
+        else:
+            key = self.block_at(pos)
+            if key != self.hovered:
+                self.set_hovered(key)
+                if key is None:
+                    QToolTip.hideText()
+                else:
+                    start, end, _, act_id, nom_saisi = self.block(key)
+                    label = self.labels.get(act_id, nom_saisi or "")
+                    if nom_saisi and nom_saisi != label:
+                        label = f"{label} — {nom_saisi}"
+                    day = self.timeline.day(key[0])
+                    QToolTip.showText(event.globalPos(),
+                                      f"{label}\n{JOURS_COMPLETS[day.weekday()]} {day.strftime('%d/%m')} · "
+                                      f"{self.clock(start)} → {self.clock(end)} "
+                                      f"({format_duration(end - start)})", self)
+        super().mouseMoveEvent(event)
+
+    def leaveEvent(self, event):
+        self.set_hovered(None)
+        QToolTip.hideText()
+        super().leaveEvent(event)
+
+    def set_hovered(self, key):
+        """Change le bloc survolé et ne repeint que les blocs concernés."""
+        for old_or_new in (self.hovered, key):
+            if old_or_new is not None and self.rows():
+                rect = self.block_rect(old_or_new[0], old_or_new[1], self.block(old_or_new))
+                self.update(rect.toAlignedRect().adjusted(-2, -2, 2, 2))
+        self.hovered = key
+
+    # --- Rendu ---
+
+    def paintEvent(self, event):
+        dpr = self.devicePixelRatioF()
+        key = (self.width(), self.height(), dpr, self.view_start, self.view_end)
+        if self.render_cache is None or self.render_cache_key != key:
+            self.render_cache = self.render_static(dpr)
+            self.render_cache_key = key
+            self.hovered = None
+
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self.render_cache)
+        if self.hovered is not None and self.rows():
+            painter.setBrush(Qt.NoBrush)
+            painter.setPen(QPen(QColor("#F0EDEE"), 1.5))
+            painter.drawRect(self.block_rect(self.hovered[0], self.hovered[1], self.block(self.hovered)))
+
+    def tick_step(self):
+        """Pas des graduations : le plus fin laissant au moins MIN_TICK_WIDTH pixels entre deux heures."""
+        per_second = self.plot_width() / (self.view_end - self.view_start)
+        for step in self.TICK_STEPS:
+            if step * per_second >= self.MIN_TICK_WIDTH:
+                return step
+        return self.TICK_STEPS[-1]
+
+    def render_static(self, dpr):
+        """Dessine les jours, les graduations et les blocs de la fenêtre visible dans un QPixmap."""
+        w, h = self.width(), self.height()
+        pixmap = QPixmap(max(1, int(w * dpr)), max(1, int(h * dpr)))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.transparent)
+
+        painter = QPainter(pixmap)
+        m_left, m_right, m_top, m_bot = self.MARGINS
+        f = self.font()
+        f.setPointSize(8)
+        painter.setFont(f)
+
+        # Graduations des heures
+        step = self.tick_step()
+        t = (int(self.view_start) // step + 1) * step if self.view_start % step else int(self.view_start)
+        while t <= self.view_end:
+            x = self.x_of(t)
+            painter.setPen(QPen(QColor(240, 237, 238, 40), 1))
+            painter.drawLine(QPointF(x, m_top), QPointF(x, h - m_bot))
+            painter.setPen(QColor("#F0EDEE"))
+            text = f"{t // 3600}h" if t % 3600 == 0 else f"{t // 3600}h{t % 3600 // 60:02d}"
+            painter.drawText(QRectF(x - 25, 0, 50, m_top - 4), Qt.AlignHCenter | Qt.AlignBottom, text)
+            t += step
+
+        rows = self.rows()
+        if rows is None:
+            painter.end()
+            return pixmap
+        y0, row_h = rows
+
+        # Jours (un libellé sur plusieurs si les lignes sont trop serrées)
+        label_every = max(1, math.ceil(12 / row_h))
+        painter.setPen(QColor("#F0EDEE"))
+        for d in range(0, self.timeline.days, label_every):
+            day = self.timeline.day(d)
+            painter.drawText(QRectF(0, y0 + d * row_h, m_left - 6, row_h), Qt.AlignRight | Qt.AlignVCenter,
+                             f"{JOURS_MAP[day.weekday()]} {day.strftime('%d/%m')}")
+
+        # Blocs visibles uniquement
+        painter.setPen(Qt.NoPen)
+        painter.setClipRect(QRectF(m_left, m_top, w - m_left - m_right, h - m_top - m_bot))
+        drawn = 0
+        for d, lanes in enumerate(self.timeline.lanes):
+            for l, lane in enumerate(lanes):
+                for key in self.index.overlapping((d, l), self.view_start, self.view_end):
+                    block = lane[key[2]]
+                    painter.setBrush(qbrush(self.color_map.get(block[3], OTHER_COLOR)))
+                    painter.drawRect(self.block_rect(d, l, block))
+                    drawn += 1
+        painter.setClipping(False)
+
+        if drawn == 0:
+            painter.setPen(Qt.gray)
+            painter.drawText(QRect(m_left, m_top, w - m_left - m_right, h - m_top - m_bot), Qt.AlignCenter,
+                             "Aucune session sur cette plage")
+        painter.end()
+        return pixmap
@@ -0,0 +1,131 @@
+"""
+Index de hit-test partagés par les graphiques de la page Analyses.
+Permettent de retrouver l'élément sous la souris en O(log n),
+quel que soit le nombre de segments ou de parts affichés.
+"""
+
+from bisect import bisect_left, bisect_right
+
+
+class BarHitIndex:
+    """
+    Index des segments d'un histogramme empilé.
+    Recherche dichotomique sur le x des colonnes, puis sur le y cumulé des segments de la colonne.
+    """
+    def __init__(self):
+        self.col_left = [] # x gauche de chaque colonne (croissant)
+        self.col_right = [] # x droit de chaque colonne
+        self.col_tops = [] # par colonne : y haut des segments (croissant)
+        self.col_bottoms = [] # par colonne : y bas des segments (même ordre)
+        self.col_ids = [] # par colonne : identifiant de chaque segment (même ordre)
+
+    def clear(self):
+        self.__init__()
+
+    def add_column(self, left, right, segments):
+        """
+        Ajoute une colonne (à appeler de gauche à droite).
+        segments : liste de (top, bottom, identifiant), dans n'importe quel ordre vertical.
+        """
+        if not segments:
+            return
+        ordered = sorted(segments, key=lambda seg: seg[0])
+        self.col_left.append(left)
+        self.col_right.append(right)
+        self.col_tops.append([seg[0] for seg in ordered])
+        self.col_bottoms.append([seg[1] for seg in ordered])
+        self.col_ids.append([seg[2] for seg in ordered])
+
+    def find(self, x, y):
+        """Retourne l'identifiant du segment contenant (x, y), ou None."""
+        c = bisect_right(self.col_left, x) - 1
+        if c < 0 or x > self.col_right[c]:
+            return None
+        tops = self.col_tops[c]
+        k = bisect_right(tops, y) - 1
+        if k < 0 or y > self.col_bottoms[c][k]:
+            return None
+        return self.col_ids[c][k]
+
+
+class PieHitIndex:
+    """
+    Index des parts d'un camembert.
+    Recherche dichotomique sur les angles cumulés (en degrés, sens trigonométrique depuis 3h).
+    """
+    def __init__(self):
+        self.starts = [] # angle de début de chaque part (croissant)
+        self.ends = [] # angle de fin de chaque part
+        self.ids = []
+
+    def clear(self):
+        self.__init__()
+
+    def add_slice(self, start, span, slice_id):
+        """Ajoute une part (à appeler dans l'ordre des angles croissants)."""
+        self.starts.append(start)
+        self.ends.append(start + span)
+        self.ids.append(slice_id)
+
+    def find(self, angle_deg):
+        """Retourne l'identifiant de la part couvrant angle_deg (dans [0, 360)), ou None."""
+        k = bisect_right(self.starts, angle_deg) - 1
+        if k < 0 or angle_deg > self.ends[k]:
+            return None
+        return self.ids[k]
+
+
+class IntervalHitIndex:
+    """
+    Index d'intervalles répartis en lignes (par exemple un jour de la chronologie).
+    Les intervalles de chaque ligne sont triés par début, avec le maximum cumulé des fins :
+    la recherche dichotomique sur les débuts est suivie d'un parcours arrière arrêté dès
+    qu'aucun intervalle antérieur ne peut plus atteindre le point cherché.
+    Les coordonnées sont libres (secondes, pixels) : l'index survit au zoom et au défilement.
+    """
+    def __init__(self):
+        self.lanes = {} # clé de ligne -> (débuts, fins, maximum cumulé des fins, ids)
+
+    def clear(self):
+        self.__init__()
+
+    def add_lane(self, key, intervals):
+        """intervals : liste de (début, fin, identifiant), dans n'importe quel ordre."""
+        if not intervals:
+            return
+        ordered = sorted(intervals, key=lambda iv: iv[0])
+        reach = []
+        top = None
+        for iv in ordered:
+            top = iv[1] if top is None else max(top, iv[1])
+            reach.append(top)
+        self.lanes[key] = ([iv[0] for iv in ordered], [iv[1] for iv in ordered], reach,
+                           [iv[2] for iv in ordered])
+
+    def overlapping(self, key, start, end):
+        """Identifiants des intervalles de la ligne qui chevauchent [start, end[, par début croissant."""
+        lane = self.lanes.get(key)
+        if lane is None:
+            return []
+        starts, ends, reach, ids = lane
+        found = []
+        k = bisect_left(starts, end) - 1
+        while k >= 0 and reach[k] > start:
+            if ends[k] > start:
+                found.append(ids[k])
+            k -= 1
+        found.reverse()
+        return found
+
+    def find(self, key, x):
+        """Identifiant de l'intervalle contenant x (le plus récent s'ils se chevauchent), ou None."""
+        lane = self.lanes.get(key)
+        if lane is None:
+            return None
+        starts, ends, reach, ids = lane
+        k = bisect_right(starts, x) - 1
+        while k >= 0 and reach[k] > x:
+            if ends[k] > x:
+                return ids[k]
+            k -= 1
+        return None
@@ -0,0 +1,36 @@
+"""
+Conversion entre frappes clavier, séquences texte et accords entiers.
+Un accord est l'entier touche | modificateurs de QKeyCombination ; une séquence est un
+tuple d'accords (jusqu'à quatre, comme QKeySequence).
+"""
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QKeySequence
+
+# Un chiffre du pavé numérique déclenche le même raccourci que celui de la rangée de chiffres
+IGNORED_MODIFIERS = Qt.KeypadModifier.value
+
+
+def normalize_combo(combo):
+    """Entier touche | modificateurs comparable entre une frappe et une séquence enregistrée."""
+    return combo & ~IGNORED_MODIFIERS
+
+
+def combo_from_event(event):
+    return normalize_combo(event.keyCombination().toCombined())
+
+
+def parse_sequence(text):
+    """Séquence texte -> tuple d'accords normalisés (vide si la séquence est vide ou invalide)."""
+    if not text:
+        return ()
+    sequence = QKeySequence.fromString(text, QKeySequence.PortableText)
+    if sequence.isEmpty():
+        # Séquences capturées au format natif de la plateforme
+        sequence = QKeySequence.fromString(text, QKeySequence.NativeText)
+    return tuple(normalize_combo(sequence[i].toCombined()) for i in range(sequence.count()))
+
+
+def format_sequence(combos):
+    """Tuple d'accords -> texte affiché et enregistré."""
+    return QKeySequence(*combos).toString(QKeySequence.NativeText) if combos else ""
@@ -0,0 +1,26 @@
+"""
+Objets QColor / QBrush partagés par les graphiques : un seul objet par code hexadécimal,
+créé à la première demande. Un code donne toujours la même couleur, le cache n'a donc
+jamais besoin d'être vidé.
+"""
+
+from PySide6.QtGui import QColor, QBrush
+
+OTHER_COLOR = "#7f7f7f" # Part "Autres", ou activité sans couleur connue
+
+_qcolors = {} # code hexadécimal -> QColor
+_brushes = {} # code hexadécimal -> QBrush
+
+
+def qcolor(hex_code):
+    col = _qcolors.get(hex_code)
+    if col is None:
+        col = _qcolors[hex_code] = QColor(hex_code)
+    return col
+
+
+def qbrush(hex_code):
+    brush = _brushes.get(hex_code)
+    if brush is None:
+        brush = _brushes[hex_code] = QBrush(qcolor(hex_code))
+    return brush
@@ -0,0 +1,225 @@
+"""
+Tableau croisé activités x intervalles affiché dans un QTableView.
+Le modèle lit directement la matrice (aucun QStandardItem) : la vue ne demande que les
+cellules visibles, même avec des centaines d'activités et d'intervalles.
+"""
+
+from PySide6.QtWidgets import QTableView, QAbstractItemView, QHeaderView, QApplication
+from PySide6.QtGui import QKeySequence
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+from vues.palette import qcolor
+
+
+def format_hours(seconds):
+    """Durée d'une cellule : "12h05", vide si aucun temps."""
+    if not seconds:
+        return ""
+    h, r = divmod(int(seconds), 3600)
+    return f"{h}h{r // 60:02d}"
+
+
+def period_label(key):
+    """Clé d'intervalle (format de bucket_key) lisible : "2026 S41", "10/2026", "2026 T4"..."""
+    if "-W" in key:
+        year, week = key.split("-W")
+        return f"{year} S{week}"
+    if "-T" in key:
+        year, quarter = key.split("-T")
+        return f"{year} T{quarter}"
+    parts = key.split("-")
+    if len(parts) == 2:
+        return f"{parts[1]}/{parts[0]}"
+    if len(parts) == 3:
+        return f"{parts[2]}/{parts[1]}/{parts[0]}"
+    return key
+
+
+class PivotTableModel(QAbstractTableModel):
+    """
+    Colonnes : activité, un intervalle par colonne, total. Dernière ligne : totaux.
+    Le tri ne réordonne que les lignes d'activités (permutation), la ligne des totaux reste en bas.
+    """
+    TOTAL_LABEL = "Total"
+
+    def __init__(self):
+        super().__init__()
+        self.table = None # PivotTable affiché
+        self.labels = {}
+        self.colors = {}
+        self.order = [] # Rang dans table.activities de chaque ligne affichée
+        self.sort_column, self.sort_order = None, Qt.AscendingOrder
+
+    def set_table(self, table):
+        self.beginResetModel()
+        self.table = table
+        self.order = list(range(len(table.activities))) if table else []
+        self.endResetModel()
+        if self.sort_column is not None:
+            self.sort(self.sort_column, self.sort_order)
+
+    def set_activity_info(self, labels, colors):
+        self.labels = labels
+        self.colors = colors
+        if self.table and self.order:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self.order) - 1, 0))
+
+    # --- Structure ---
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid() or self.table is None:
+            return 0
+        return len(self.order) + 1
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid() or self.table is None:
+            return 0
+        return len(self.table.periods) + 2
+
+    def is_total_row(self, row):
+        return row == len(self.order)
+
+    def is_total_column(self, column):
+        return column == len(self.table.periods) + 1
+
+    def label(self, row):
+        if self.is_total_row(row):
+            return self.TOTAL_LABEL
+        act_id = self.table.activities[self.order[row]]
+        return self.labels.get(act_id, str(act_id))
+
+    def value(self, row, column):
+        """Secondes d'une cellule (colonne > 0)."""
+        total_row, total_col = self.is_total_row(row), self.is_total_column(column)
+        if total_row:
+            return self.table.grand_total if total_col else self.table.column_totals[column - 1]
+        i = self.order[row]
+        return self.table.row_totals[i] if total_col else self.table.cells[i][column - 1]
+
+    def header(self, column):
+        if column == 0:
+            return "Activité"
+        if self.is_total_column(column):
+            return self.TOTAL_LABEL
+        return period_label(self.table.periods[column - 1])
+
+    # --- Données ---
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or self.table is None:
+            return None
+        row, column = index.row(), index.column()
+        if role == Qt.DisplayRole:
+            return self.label(row) if column == 0 else format_hours(self.value(row, column))
+        if role == Qt.UserRole: # Valeur brute (tri, copie)
+            return self.label(row) if column == 0 else self.value(row, column)
+        if role == Qt.TextAlignmentRole:
+            return int(Qt.AlignLeft | Qt.AlignVCenter) if column == 0 else int(Qt.AlignRight | Qt.AlignVCenter)
+        if role == Qt.FontRole and (self.is_total_row(row) or self.is_total_column(column)):
+            font = QApplication.font()
+            font.setBold(True)
+            return font
+        if role == Qt.DecorationRole and column == 0 and not self.is_total_row(row):
+            hex_code = self.colors.get(self.table.activities[self.order[row]])
+            return qcolor(hex_code) if hex_code else None
+        if role == Qt.ToolTipRole and column > 0:
+            return f"{self.label(row)} · {self.header(column)} : {format_hours(self.value(row, column)) or '0h00'}"
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if self.table is None or role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.header(section)
+        return None
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """
+        Trie les lignes d'activités selon une colonne (-1 : ordre initial, total décroissant) ;
+        les index persistants (sélection) suivent.
+        """
+        self.sort_column, self.sort_order = (column, order) if column >= 0 else (None, order)
+        if self.table is None or column >= self.columnCount():
+            return
+        self.layoutAboutToBeChanged.emit()
+        old_order = self.order
+        if column < 0:
+            key = lambda i: i
+            order = Qt.AscendingOrder
+        elif column == 0:
+            # Même texte que la cellule affichée (l'id si le libellé est inconnu)
+            key = lambda i: self.labels.get(self.table.activities[i], str(self.table.activities[i])).lower()
+        elif self.is_total_column(column):
+            key = lambda i: self.table.row_totals[i]
+        else:
+            key = lambda i: self.table.cells[i][column - 1]
+        self.order = sorted(old_order, key=key, reverse=order == Qt.DescendingOrder)
+
+        new_row = {i: r for r, i in enumerate(self.order)}
+        old_indexes = self.persistentIndexList()
+        new_indexes = []
+        for index in old_indexes:
+            row = index.row() if self.is_total_row(index.row()) else new_row[old_order[index.row()]]
+            new_indexes.append(self.index(row, index.column()))
+        self.changePersistentIndexList(old_indexes, new_indexes)
+        self.layoutChanged.emit()
+
+    # --- Copie ---
+
+    def to_text(self, rows=None, columns=None):
+        """
+        Lignes et colonnes données (toutes par défaut) en texte tabulé, avec en-têtes et libellés,
+        durées en heures décimales : collé tel quel dans un tableur.
+        """
+        if self.table is None:
+            return ""
+        rows = range(self.rowCount()) if rows is None else rows
+        columns = [c for c in (range(1, self.columnCount()) if columns is None else columns) if c > 0]
+        lines = ["\t".join([self.header(0)] + [self.header(c) for c in columns])]
+        for row in rows:
+            cells = [self.label(row)]
+            for column in columns:
+                cells.append(f"{self.value(row, column) / 3600:.2f}".replace(".", ","))
+            lines.append("\t".join(cells))
+        return "\n".join(lines)
+
+
+class PivotTableView(QTableView):
+    """QTableView du tableau croisé : tri par clic sur l'en-tête, Ctrl+C copie la sélection."""
+    COLUMN_WIDTH = 80
+    LABEL_WIDTH = 180
+
+    def __init__(self, model):
+        super().__init__()
+        self.setObjectName("pivot_table")
+        self.setModel(model)
+        self.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder) # Ordre initial : total décroissant
+        self.setSortingEnabled(True)
+        self.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.setAlternatingRowColors(True)
+        self.setWordWrap(False)
+        self.verticalHeader().hide()
+        # Tailles fixes : aucune mesure du contenu, quel que soit le nombre de lignes et de colonnes
+        self.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.verticalHeader().setDefaultSectionSize(24)
+        self.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        self.horizontalHeader().setDefaultSectionSize(self.COLUMN_WIDTH)
+        self.horizontalHeader().setStretchLastSection(False)
+        model.modelReset.connect(lambda: self.setColumnWidth(0, self.LABEL_WIDTH))
+
+    def keyPressEvent(self, event):
+        if event.matches(QKeySequence.Copy):
+            self.copy_selection()
+            return
+        super().keyPressEvent(event)
+
+    def copy_selection(self):
+        """Copie les lignes et colonnes sélectionnées (tout le tableau si rien n'est sélectionné)."""
+        indexes = self.selectionModel().selectedIndexes()
+        if indexes:
+            rows = sorted({i.row() for i in indexes})
+            columns = sorted({i.column() for i in indexes})
+            text = self.model().to_text(rows, columns if columns != [0] else None)
+        else:
+            text = self.model().to_text()
+        QApplication.clipboard().setText(text)
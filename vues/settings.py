@@ -1,8 +1,10 @@
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                                  QPushButton, QListWidget, QListWidgetItem, 
                                  QLineEdit, QColorDialog, QFrame, QDialog)
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QColor, QKeySequence
+from PySide6.QtCore import Qt, QElapsedTimer
+from PySide6.QtGui import QColor
+
+from vues.key_combos import combo_from_event, format_sequence
 
 class SettingsView(QWidget):
     def __init__(self):
@@ -91,12 +93,16 @@ class SettingsView(QWidget):
 from vues.custom_dialog import StyledDialog
 
 class KeyCaptureDialog(StyledDialog):
+    CHORD_TIMEOUT_MS = 1500 # Délai maximal entre deux accords d'une même séquence
+    MAX_CHORDS = 4 # Limite de QKeySequence
+
     def __init__(self, parent=None, action_name=""):
         super().__init__(parent, f"Modifier raccourci : {action_name}")
         self.resize(400, 200)
         
         # Message instruction
-        lbl = QLabel("Appuyez sur la nouvelle combinaison de touches...")
+        lbl = QLabel("Appuyez sur la nouvelle combinaison de touches...\n"
+                     "(enchaînez-en plusieurs pour une séquence, ex : Ctrl+K, Ctrl+S)")
         lbl.setObjectName("msg_text")
         lbl.setAlignment(Qt.AlignCenter)
         self.content_layout.addWidget(lbl)
@@ -123,23 +129,23 @@ class KeyCaptureDialog(StyledDialog):
         self.content_layout.addLayout(btn_layout)
         
         self.captured_sequence = None
+        self.chords = [] # Accords capturés ; une pause plus longue que CHORD_TIMEOUT_MS recommence la séquence
+        self.last_chord = QElapsedTimer()
         
     def keyPressEvent(self, event):
         key = event.key()
-        modifiers = event.modifiers()
         
         # Ignorer les touches seules de modificateurs
         if key in (Qt.Key_Control, Qt.Key_Shift, Qt.Key_Alt, Qt.Key_Meta):
             return
             
-       
-        m_val = modifiers.value if hasattr(modifiers, 'value') else int(modifiers)
-        k_val = key.value if hasattr(key, 'value') else int(key)
-        
-        val = m_val | k_val
-        sequence = QKeySequence(val)
+        if (not self.last_chord.isValid() or self.last_chord.elapsed() > self.CHORD_TIMEOUT_MS
+                or len(self.chords) >= self.MAX_CHORDS):
+            self.chords = []
+        self.chords.append(combo_from_event(event))
+        self.last_chord.start()
         
-        self.captured_sequence = sequence.toString(QKeySequence.NativeText)
+        self.captured_sequence = format_sequence(tuple(self.chords))
         
         self.lbl_key.setText(self.captured_sequence)
         self.btn_ok.setEnabled(True)
@@ -0,0 +1,302 @@
+"""
+Hiérarchie des activités en anneaux (sunburst) pour la page Analyses.
+Les parts sont retrouvées au survol par un PieHitIndex par anneau ; un clic recentre
+les autres cartes sur l'activité choisie.
+"""
+
+import math
+
+from PySide6.QtWidgets import QWidget, QToolTip
+from PySide6.QtGui import QPainter, QPixmap, QPainterPath, QColor, QPen
+from PySide6.QtCore import Qt, QPointF, QRect, QRectF, Signal, QEvent
+
+from vues.chart_format import format_duration
+from vues.hit_test import PieHitIndex
+from vues.palette import qcolor, OTHER_COLOR
+
+
+class SunburstWidget(QWidget):
+    """
+    Graphique en anneaux de la hiérarchie des activités : les parents sur l'anneau intérieur,
+    leurs sous-activités autour, chaque part proportionnelle à son temps.
+    Le rendu est gardé dans un QPixmap, le survol est dessiné par-dessus.
+    Un clic sur une part recentre les autres cartes sur cette activité ; un clic au centre,
+    ou à nouveau sur la part choisie, remonte d'un niveau.
+    """
+    scope_requested = Signal(object) # Id de l'activité choisie, None pour la vue d'ensemble
+    HOLE_RATIO = 0.32 # Rayon du centre / rayon extérieur
+    INNER_RATIO = 0.66 # Limite entre l'anneau des parents et celui des sous-activités
+
+    def __init__(self):
+        super().__init__()
+        self.rings = [] # (id parent, total, [(id sous-activité, total), ...])
+        self.scope_id = None # Activité choisie : seule sa famille est affichée
+        self.labels = {} # id activité -> libellé
+        self.color_map = {} # id activité -> code hexadécimal
+        self.setMinimumHeight(260)
+
+        # Interaction
+        self.setMouseTracking(True)
+        self.wedges = [] # (anneau, id activité, secondes, QPainterPath) du dernier rendu
+        self.hit_indexes = (PieHitIndex(), PieHitIndex()) # Parts de chaque anneau par angle
+        self.ring_geometry = None # (centre, rayon du centre, rayon intermédiaire, rayon extérieur)
+        self.shown_total = 0
+        self.hovered = None # Index dans wedges, ou "center"
+
+        self.render_cache = None
+        self.render_cache_key = None
+
+    def set_data(self, rings):
+        if rings == self.rings:
+            return
+        self.rings = rings
+        self.invalidate_cache()
+
+    def set_scope(self, scope_id):
+        if scope_id == self.scope_id:
+            return
+        self.scope_id = scope_id
+        self.invalidate_cache()
+
+    def set_activity_info(self, labels, colors):
+        """Libellés et couleurs des activités (id -> libellé, id -> code hexadécimal)."""
+        if labels == self.labels and colors == self.color_map:
+            return
+        self.labels = labels
+        self.color_map = colors
+        self.invalidate_cache()
+
+    def invalidate_cache(self):
+        self.render_cache = None
+        self.hovered = None
+        self.update()
+
+    def changeEvent(self, event):
+        if event.type() in (QEvent.PaletteChange, QEvent.FontChange, QEvent.StyleChange):
+            self.invalidate_cache()
+        super().changeEvent(event)
+
+    def activity_label(self, act_id):
+        return self.labels.get(act_id, "Activité inconnue")
+
+    def family_of_scope(self):
+        """(parent, sous-activités) de la famille contenant l'activité choisie, None si elle n'a pas de temps."""
+        for ring in self.rings:
+            root_id, _, children = ring
+            if root_id == self.scope_id or any(child_id == self.scope_id for child_id, _ in children):
+                return ring
+        return None
+
+    def parent_of(self, act_id):
+        for root_id, _, children in self.rings:
+            if any(child_id == act_id for child_id, _ in children):
+                return root_id
+        return None
+
+    def visible_rings(self):
+        if self.scope_id is None:
+            return self.rings
+        family = self.family_of_scope()
+        return [family] if family else []
+
+    @staticmethod
+    def sector_path(center, r_in, r_out, start, span):
+        """Secteur d'anneau entre r_in et r_out, de start à start + span degrés (sens trigonométrique)."""
+        outer = QRectF(center.x() - r_out, center.y() - r_out, 2 * r_out, 2 * r_out)
+        inner = QRectF(center.x() - r_in, center.y() - r_in, 2 * r_in, 2 * r_in)
+        path = QPainterPath()
+        path.arcMoveTo(outer, start)
+        path.arcTo(outer, start, span)
+        path.arcTo(inner, start + span, -span)
+        path.closeSubpath()
+        return path
+
+    def wedge_at(self, pos):
+        """Part sous la souris (index dans wedges), "center" pour le centre, sinon None."""
+        if not self.ring_geometry:
+            return None
+        center, r_hole, r_mid, radius = self.ring_geometry
+        dx, dy = pos.x() - center.x(), pos.y() - center.y()
+        dist = math.hypot(dx, dy)
+        if dist < r_hole:
+            return "center"
+        if dist > radius:
+            return None
+        angle = math.degrees(math.atan2(-dy, dx))
+        if angle < 0:
+            angle += 360
+        return self.hit_indexes[0 if dist < r_mid else 1].find(angle)
+
+    def mouseMoveEvent(self, event):
+        pos = event.position() if hasattr(event, 'position') else event.pos()
+        index = self.wedge_at(pos)
+        if index == "center" and self.scope_id is None:
+            index = None
+
+        # L'infobulle n'est mise à jour que si la part survolée change
+        if index != self.hovered:
+            self.set_hovered(index)
+            if index is None:
+                QToolTip.hideText()
+                self.unsetCursor()
+            else:
+                if index == "center":
+                    text = "Revenir à la vue d'ensemble"
+                else:
+                    _, act_id, sec, _ = self.wedges[index]
+                    pct = sec * 100 / self.shown_total if self.shown_total else 0
+                    text = (f"{self.activity_label(act_id)}\n{format_duration(sec)}"
+                            f" ({pct:.1f}%)")
+                    text += "\nCliquer pour remonter" if act_id == self.scope_id else "\nCliquer pour filtrer les analyses"
+                QToolTip.showText(event.globalPos(), text, self)
+                self.setCursor(Qt.PointingHandCursor)
+        super().mouseMoveEvent(event)
+
+    def mousePressEvent(self, event):
+        if event.button() != Qt.LeftButton or self.hovered is None:
+            super().mousePressEvent(event)
+            return
+        if self.hovered == "center":
+            self.scope_requested.emit(self.parent_of(self.scope_id))
+            return
+        act_id = self.wedges[self.hovered][1]
+        if act_id == self.scope_id:
+            # Deuxième clic sur la part choisie : on remonte d'un niveau
+            self.scope_requested.emit(self.parent_of(act_id))
+        else:
+            self.scope_requested.emit(act_id)
+
+    def leaveEvent(self, event):
+        self.set_hovered(None)
+        QToolTip.hideText()
+        self.unsetCursor()
+        super().leaveEvent(event)
+
+    def set_hovered(self, index):
+        """Change la part survolée et ne repeint que les zones concernées."""
+        for old_or_new in (self.hovered, index):
+            if isinstance(old_or_new, int) and old_or_new < len(self.wedges):
+                self.update(self.wedges[old_or_new][3].boundingRect().toAlignedRect().adjusted(-3, -3, 3, 3))
+            elif old_or_new == "center" and self.ring_geometry:
+                center, r_hole, _, _ = self.ring_geometry
+                self.update(QRectF(center.x() - r_hole, center.y() - r_hole, 2 * r_hole, 2 * r_hole)
+                            .toAlignedRect().adjusted(-3, -3, 3, 3))
+        self.hovered = index
+
+    def paintEvent(self, event):
+        dpr = self.devicePixelRatioF()
+        key = (self.width(), self.height(), dpr)
+        if self.render_cache is None or self.render_cache_key != key:
+            self.render_cache = self.render_static(dpr)
+            self.render_cache_key = key
+            self.hovered = None
+
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self.render_cache)
+
+        # Surbrillance de la part survolée (overlay)
+        if self.hovered is not None:
+            painter.setRenderHint(QPainter.Antialiasing)
+            painter.setBrush(QColor(255, 255, 255, 60))
+            painter.setPen(QPen(QColor("#F0EDEE"), 1.5))
+            if self.hovered == "center":
+                center, r_hole, _, _ = self.ring_geometry
+                painter.drawEllipse(center, r_hole - 2, r_hole - 2)
+            elif self.hovered < len(self.wedges):
+                painter.drawPath(self.wedges[self.hovered][3])
+
+    def render_static(self, dpr):
+        """Dessine les deux anneaux et le centre dans un QPixmap et reconstruit les index de survol."""
+        w, h = self.width(), self.height()
+        pixmap = QPixmap(max(1, int(w * dpr)), max(1, int(h * dpr)))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.transparent)
+
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        self.wedges = []
+        for index in self.hit_indexes:
+            index.clear()
+        self.ring_geometry = None
+
+        rings = self.visible_rings()
+        total = sum(root_total for _, root_total, _ in rings)
+        self.shown_total = total
+        if total == 0:
+            f = self.font()
+            f.setPointSize(12)
+            painter.setFont(f)
+            painter.setPen(Qt.gray)
+            text = "Aucune donnée sur la période" if self.scope_id is None else "Aucune donnée pour cette activité"
+            painter.drawText(QRect(0, 0, w, h), Qt.AlignCenter, text)
+            painter.end()
+            # Le centre reste cliquable pour revenir à la vue d'ensemble
+            if self.scope_id is not None:
+                r = min(w, h) / 2 - 10
+                self.ring_geometry = (QPointF(w / 2, h / 2), r * self.HOLE_RATIO, r * self.INNER_RATIO, r)
+            return pixmap
+
+        radius = max(10, min(w, h) / 2 - 10)
+        center = QPointF(w / 2, h / 2)
+        r_hole, r_mid = radius * self.HOLE_RATIO, radius * self.INNER_RATIO
+        self.ring_geometry = (center, r_hole, r_mid, radius)
+        border = QPen(QColor("#1A1423"), 1.5) # Fond des cartes : sépare les parts
+
+        label_font = self.font()
+        label_font.setPointSize(9)
+        label_font.setBold(True)
+        painter.setFont(label_font)
+        fm = painter.fontMetrics()
+
+        start = 0.0
+        for root_id, root_total, children in rings:
+            span = root_total / total * 360
+            root_hex = self.color_map.get(root_id, OTHER_COLOR)
+            self.add_wedge(painter, 0, root_id, root_total, center, r_hole, r_mid, start, span,
+                           qcolor(root_hex), border)
+
+            # Libellé du parent, si la part est assez large
+            if span >= 18:
+                mid = math.radians(start + span / 2)
+                r_txt = (r_hole + r_mid) / 2
+                tx, ty = center.x() + r_txt * math.cos(mid), center.y() - r_txt * math.sin(mid)
+                text = fm.elidedText(self.activity_label(root_id), Qt.ElideRight, int(r_mid - r_hole))
+                painter.setPen(Qt.white)
+                painter.drawText(QRectF(tx - r_mid, ty - fm.height(), 2 * r_mid, 2 * fm.height()),
+                                 Qt.AlignCenter, text)
+
+            child_start = start
+            for k, (child_id, child_total) in enumerate(children):
+                child_span = child_total / total * 360
+                child_hex = self.color_map.get(child_id, root_hex)
+                col = qcolor(child_hex)
+                if child_hex == root_hex:
+                    # Couleur héritée du parent : nuances alternées pour distinguer les sous-activités
+                    col = col.lighter(115 + 12 * (k % 3))
+                if self.scope_id is not None and self.scope_id != root_id and child_id != self.scope_id:
+                    col = QColor(col)
+                    col.setAlpha(90) # Sous-activité choisie mise en avant
+                self.add_wedge(painter, 1, child_id, child_total, center, r_mid, radius, child_start, child_span,
+                               col, border)
+                child_start += child_span
+            start += span
+
+        # Centre : temps total affiché, précédé du libellé de l'activité choisie
+        text = format_duration(total)
+        if self.scope_id is not None:
+            text = f"{fm.elidedText(self.activity_label(self.scope_id), Qt.ElideRight, int(2 * r_hole - 8))}\n{text}"
+        painter.setPen(QColor("#F0EDEE"))
+        painter.drawText(QRectF(center.x() - r_hole, center.y() - r_hole, 2 * r_hole, 2 * r_hole),
+                         Qt.AlignCenter, text)
+        painter.end()
+        return pixmap
+
+    def add_wedge(self, painter, ring, act_id, sec, center, r_in, r_out, start, span, color, border):
+        if span <= 0:
+            return
+        path = self.sector_path(center, r_in, r_out, start, span)
+        painter.setBrush(color)
+        painter.setPen(border)
+        painter.drawPath(path)
+        self.hit_indexes[ring].add_slice(start, span, len(self.wedges))
+        self.wedges.append((ring, act_id, sec, path))
@@ -0,0 +1,90 @@
+"""
+Mises à jour de l'interface conditionnées à la visibilité.
+Une page masquée (autre page du tableau de bord affichée) ou une fenêtre réduite n'a pas
+besoin d'être repeinte : seule la dernière valeur de chaque mise à jour est conservée, puis
+appliquée en une fois quand la page redevient visible. Les animations en cours sont
+terminées immédiatement quand la fenêtre est réduite.
+"""
+
+from PySide6.QtCore import QObject, QEvent, Signal, QAbstractAnimation
+
+_running_animations = set()
+
+
+def start_animation(animation):
+    """Démarre une animation en la référençant, pour pouvoir la terminer si la fenêtre est réduite."""
+    _running_animations.difference_update(
+        [a for a in _running_animations if a.state() != QAbstractAnimation.Running])
+    _running_animations.add(animation)
+    animation.start()
+
+
+def finish_animations():
+    """Amène les animations en cours à leur état final : plus aucune image intermédiaire à calculer."""
+    for animation in list(_running_animations):
+        if animation.state() == QAbstractAnimation.Running:
+            animation.setCurrentTime(animation.totalDuration())
+    _running_animations.clear()
+
+
+def is_on_screen(widget):
+    """Vrai si le widget est affiché et que sa fenêtre n'est pas réduite."""
+    return widget.isVisible() and not widget.window().isMinimized()
+
+
+class DeferredUpdates(QObject):
+    """
+    Applique les mises à jour d'un widget tout de suite s'il est à l'écran, sinon garde la
+    dernière de chaque clé jusqu'à son prochain affichage.
+    """
+    shown = Signal() # Le widget redevient visible (page affichée ou fenêtre restaurée)
+
+    def __init__(self, widget):
+        super().__init__(widget)
+        self.widget = widget
+        self.pending = {} # clé -> (fonction, arguments), dans l'ordre de la dernière demande
+        self.watched_window = None
+        self.window_minimized = False
+        widget.installEventFilter(self)
+
+    def is_on_screen(self):
+        return is_on_screen(self.widget)
+
+    def apply(self, key, fn, *args):
+        """Exécute fn(*args) si le widget est visible, sinon la remplace par la plus récente de même clé."""
+        self.pending.pop(key, None)
+        if self.is_on_screen():
+            fn(*args)
+        else:
+            self.pending[key] = (fn, args)
+            self._watch_window()
+
+    def flush(self):
+        pending, self.pending = self.pending, {}
+        for fn, args in pending.values():
+            fn(*args)
+
+    def _watch_window(self):
+        """Suit la fenêtre du widget (connue seulement une fois la page insérée dans le tableau de bord)."""
+        window = self.widget.window()
+        if window is self.watched_window or window is self.widget:
+            return
+        if self.watched_window is not None:
+            self.watched_window.removeEventFilter(self)
+        window.installEventFilter(self)
+        self.watched_window = window
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Show:
+            restored = obj is self.widget
+            if restored:
+                self._watch_window()
+        elif event.type() == QEvent.WindowStateChange:
+            was_minimized, self.window_minimized = self.window_minimized, obj.isMinimized()
+            restored = was_minimized and not self.window_minimized
+        else:
+            return False
+        if restored and self.is_on_screen():
+            self.flush()
+            self.shown.emit()
+        return False
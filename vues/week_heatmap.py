@@ -0,0 +1,189 @@
+"""
+Semaine type (jour de la semaine x heure) pour la page Analyses.
+Une case par jour et par créneau, d'autant plus intense que le temps suivi y est élevé.
+"""
+
+import math
+
+from PySide6.QtWidgets import QWidget, QToolTip
+from PySide6.QtGui import QPainter, QPixmap, QColor, QPen
+from PySide6.QtCore import Qt, QRect, QRectF, QEvent
+
+from vues.chart_format import JOURS_MAP, JOURS_COMPLETS, format_duration
+from vues.palette import qcolor
+
+
+class WeekHeatmapWidget(QWidget):
+    """
+    Semaine type : une case par jour et par heure (ou demi-heure si la largeur le permet),
+    d'autant plus intense que le temps suivi y est élevé.
+    La grille est rendue une fois dans un QPixmap ; la case survolée est trouvée par calcul
+    direct (ligne, colonne) et seul son contour est repeint.
+    """
+    MARGINS = (40, 10, 10, 22) # gauche, droite, haut, bas
+    MIN_HALF_HOUR_WIDTH = 12 # Largeur minimale d'une case pour afficher les demi-heures
+    EMPTY_COLOR = "#2a2233"
+    FULL_COLOR = "#FF6699"
+
+    def __init__(self):
+        super().__init__()
+        self.matrix = [] # 7 listes (lundi -> dimanche) de secondes par demi-heure
+        self.cells = [] # Grille affichée : 7 listes de secondes par case
+        self.max_value = 0
+        self.setMinimumHeight(220)
+        self.setMouseTracking(True)
+        self.hovered = None # (jour, case)
+        self.grid = None # (x0, y0, largeur d'une case, hauteur d'une case, nb cases par jour)
+        self.render_cache = None
+        self.render_cache_key = None
+
+    def set_data(self, matrix):
+        if matrix == self.matrix:
+            return
+        self.matrix = matrix
+        self.invalidate_cache()
+
+    def invalidate_cache(self):
+        self.render_cache = None
+        self.hovered = None
+        self.update()
+
+    def changeEvent(self, event):
+        if event.type() in (QEvent.PaletteChange, QEvent.FontChange, QEvent.StyleChange):
+            self.invalidate_cache()
+        super().changeEvent(event)
+
+    def columns(self):
+        """48 demi-heures si les cases restent lisibles, sinon 24 heures."""
+        m_left, m_right, _, _ = self.MARGINS
+        half_hours = len(self.matrix[0]) if self.matrix else 48
+        if (self.width() - m_left - m_right) / half_hours >= self.MIN_HALF_HOUR_WIDTH:
+            return half_hours
+        return half_hours // 2
+
+    def build_cells(self, columns):
+        """Regroupe les demi-heures par paires quand la grille est réduite à 24 colonnes."""
+        if not self.matrix:
+            return [[0] * columns for _ in range(7)]
+        step = len(self.matrix[0]) // columns
+        return [[sum(row[c * step:(c + 1) * step]) for c in range(columns)] for row in self.matrix]
+
+    def cell_color(self, value):
+        """Teinte interpolée entre la case vide et la couleur pleine (racine carrée : les petites valeurs restent visibles)."""
+        if value <= 0 or self.max_value <= 0:
+            return qcolor(self.EMPTY_COLOR)
+        ratio = math.sqrt(value / self.max_value)
+        empty, full = qcolor(self.EMPTY_COLOR), qcolor(self.FULL_COLOR)
+        return QColor(int(empty.red() + (full.red() - empty.red()) * ratio),
+                      int(empty.green() + (full.green() - empty.green()) * ratio),
+                      int(empty.blue() + (full.blue() - empty.blue()) * ratio))
+
+    def cell_rect(self, day, col):
+        x0, y0, cell_w, cell_h, _ = self.grid
+        return QRectF(x0 + col * cell_w, y0 + day * cell_h, cell_w, cell_h)
+
+    def cell_at(self, pos):
+        if not self.grid:
+            return None
+        x0, y0, cell_w, cell_h, columns = self.grid
+        col = int((pos.x() - x0) // cell_w)
+        day = int((pos.y() - y0) // cell_h)
+        if 0 <= col < columns and 0 <= day < 7:
+            return day, col
+        return None
+
+    def slot_text(self, col, columns):
+        minutes = 24 * 60 // columns
+        start = col * minutes
+        end = start + minutes
+        return f"{start // 60}h{start % 60:02d} – {end // 60}h{end % 60:02d}"
+
+    def mouseMoveEvent(self, event):
+        pos = event.position() if hasattr(event, 'position') else event.pos()
+        cell = self.cell_at(pos)
+        if cell != self.hovered:
+            self.set_hovered(cell)
+            if cell is None:
+                QToolTip.hideText()
+            else:
+                day, col = cell
+                value = self.cells[day][col]
+                QToolTip.showText(event.globalPos(),
+                                  f"{JOURS_COMPLETS[day]} {self.slot_text(col, self.grid[4])}\n"
+                                  f"{format_duration(value)}", self)
+        super().mouseMoveEvent(event)
+
+    def leaveEvent(self, event):
+        self.set_hovered(None)
+        QToolTip.hideText()
+        super().leaveEvent(event)
+
+    def set_hovered(self, cell):
+        """Change la case survolée et ne repeint que les cases concernées."""
+        for old_or_new in (self.hovered, cell):
+            if old_or_new is not None and self.grid:
+                self.update(self.cell_rect(*old_or_new).toAlignedRect().adjusted(-2, -2, 2, 2))
+        self.hovered = cell
+
+    def paintEvent(self, event):
+        dpr = self.devicePixelRatioF()
+        key = (self.width(), self.height(), dpr)
+        if self.render_cache is None or self.render_cache_key != key:
+            self.render_cache = self.render_static(dpr)
+            self.render_cache_key = key
+            self.hovered = None
+
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self.render_cache)
+        if self.hovered is not None and self.grid:
+            painter.setBrush(Qt.NoBrush)
+            painter.setPen(QPen(QColor("#F0EDEE"), 1.5))
+            painter.drawRect(self.cell_rect(*self.hovered).adjusted(0.5, 0.5, -0.5, -0.5))
+
+    def render_static(self, dpr):
+        """Dessine la grille, les jours et les heures dans un QPixmap."""
+        w, h = self.width(), self.height()
+        pixmap = QPixmap(max(1, int(w * dpr)), max(1, int(h * dpr)))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.transparent)
+
+        painter = QPainter(pixmap)
+        columns = self.columns()
+        self.cells = self.build_cells(columns)
+        self.max_value = max((max(row) for row in self.cells), default=0)
+
+        m_left, m_right, m_top, m_bot = self.MARGINS
+        cell_w = (w - m_left - m_right) / columns
+        cell_h = (h - m_top - m_bot) / 7
+        if cell_w <= 0 or cell_h <= 0:
+            self.grid = None
+            painter.end()
+            return pixmap
+        self.grid = (m_left, m_top, cell_w, cell_h, columns)
+
+        painter.setPen(Qt.NoPen)
+        gap = 1 if cell_w > 4 else 0
+        for day, row in enumerate(self.cells):
+            for col, value in enumerate(row):
+                painter.setBrush(self.cell_color(value))
+                painter.drawRect(self.cell_rect(day, col).adjusted(0, 0, -gap, -gap))
+
+        # Jours à gauche, heures toutes les 3 heures en bas
+        f = self.font()
+        f.setPointSize(8)
+        painter.setFont(f)
+        painter.setPen(QColor("#F0EDEE"))
+        for day in range(7):
+            painter.drawText(QRectF(0, m_top + day * cell_h, m_left - 6, cell_h),
+                             Qt.AlignRight | Qt.AlignVCenter, JOURS_MAP[day])
+        per_hour = columns // 24
+        for hour in range(0, 24, 3):
+            x = m_left + hour * per_hour * cell_w
+            painter.drawText(QRectF(x - 20, h - m_bot + 4, 40, m_bot - 4), Qt.AlignHCenter | Qt.AlignTop, f"{hour}h")
+
+        if self.max_value == 0:
+            painter.setPen(Qt.gray)
+            painter.drawText(QRect(m_left, m_top, w - m_left - m_right, h - m_top - m_bot), Qt.AlignCenter,
+                             "Aucune donnée sur la période")
+        painter.end()
+        return pixmap